@@ -7,11 +7,15 @@
 # See https://github.com/kyamagu/skia-python/issues/323
 
 # python imports
-import math
+import sys
 import ctypes
 # pip imports
 import wx
 import skia
+import numpy as np
+# local imports
+from path_geometry import circles, spiral_points
+from series_decimation import open_series, SeriesView
 
 
 """Enable high-res displays."""
@@ -25,7 +29,7 @@ except Exception:
 class SkiaCPUCanvas(wx.Panel):
     """A cpu based skia canvas"""
 
-    def __init__(self, parent, size):
+    def __init__(self, parent, size, series=None):
         super().__init__(parent, size=size)
         # or else we'll have a flicker
         self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
@@ -35,6 +39,10 @@ class SkiaCPUCanvas(wx.Panel):
         self.offset_x = 0.0
         self.offset_y = 0.0
         self.zoom = 1.0
+        self.spiral = circles(spiral_points(150), 4 + np.arange(150) % 4)
+        # An optional time series, decimated to min/max per pixel column
+        self.series_view = SeriesView(series) if series is not None else None
+        self.series_range = series.range() if series is not None else None
 
         self.Bind(wx.EVT_LEFT_DOWN, self.on_mouse_left_down)
         self.Bind(wx.EVT_LEFT_UP, self.on_mouse_left_up)
@@ -125,16 +133,32 @@ class SkiaCPUCanvas(wx.Panel):
         # Create a solid paint (Blue color, but explicitly defining RGBA)
         paint = skia.Paint(AntiAlias=True, Color=skia.Color(255, 0, 0),)
 
-        # Draw a series of circles in a spiral pattern
-        for i in range(150):
-            angle = i * math.pi * 0.1
-            x = math.cos(angle) * i * 3
-            y = math.sin(angle) * i * 3
-            # Draw solid circles
-            self.canvas.drawCircle(x, y, 4 + (i % 4), paint)
+        # Draw a series of circles in a spiral pattern, all in one path
+        self.canvas.drawPath(self.spiral, paint)
 
         self.canvas.restore()
 
+        if self.series_view is not None:
+            self.draw_series(w, h)
+
+    def draw_series(self, w, h):
+        """Draw the series over world x -400..400, in screen space, one column per pixel"""
+        per_unit = len(self.series_view.series) / 800
+        # Samples per pixel, and the sample at the left edge; a pan by whole
+        # pixels shifts the columns by whole columns, so only new ones are computed
+        spp = per_unit / self.zoom
+        start = (-w / 2 / self.zoom - self.offset_x + 400) * per_unit
+        low, high = self.series_range
+        scale = 300 / (high - low) if high > low else 1.0
+        mid = (low + high) / 2
+
+        def y_of(values):
+            return h / 2 + (self.offset_y - (values - mid) * scale) * self.zoom
+
+        paint = skia.Paint(AntiAlias=True, Color=skia.Color(0, 0, 255),
+                           Style=skia.Paint.kStroke_Style, StrokeWidth=1)
+        self.canvas.drawPath(self.series_view.path(start, spp, w, y_of), paint)
+
     def on_size(self, event):
         wx.CallAfter(self.set_size)
         event.Skip()
@@ -156,18 +180,20 @@ class SkiaCPUCanvas(wx.Panel):
 
 
 class MainFrame(wx.Frame):
-    def __init__(self):
+    def __init__(self, series=None):
         super().__init__(None, title="Skia Wx CPU Canvas", size=(800, 600))
         panel = wx.Panel(self)
         sizer = wx.BoxSizer(wx.VERTICAL)
-        self.canvas = SkiaCPUCanvas(panel, (800, 600))
+        self.canvas = SkiaCPUCanvas(panel, (800, 600), series)
         sizer.Add(self.canvas, 1, wx.EXPAND)
         panel.SetSizer(sizer)
         self.Show()
 
 
 if __name__ == "__main__":
+    # Optionally, a file of raw float32 samples to plot (any size; it is memory-mapped)
+    series = open_series(sys.argv[1]) if len(sys.argv) > 1 else None
     app = wx.App(False)
-    frame = MainFrame()
+    frame = MainFrame(series)
     frame.Show()
     app.MainLoop()
@@ -11,11 +11,22 @@
 # python imports
 import math
 import ctypes
+from concurrent.futures import ProcessPoolExecutor
 # pip imports
 import wx
 from wx import glcanvas
 import skia
-from OpenGL.GL import glViewport, GL_RGBA8
+from OpenGL.GL import glViewport
+# local imports
+from gl_surface_manager import GLSurfaceManager
+from svg_tile_cache import SVGTileCache
+from svg_recorder import RecordedSVG
+from async_loader import AsyncLoader, record_svg_file, picture_from_bytes
+from progressive_render import ProgressiveRenderer
+from thumbnail_cache import ThumbnailCache, picture_thumbnail_worker, fit_transform
+from svg_hot_reload import FileWatcher, reload_svg_file
+
+THUMBNAIL_SIZE = 256
 
 
 """Enable high-res displays."""
@@ -33,7 +44,10 @@ class SkiaWxGPUCanvas(glcanvas.GLCanvas):
         glcanvas.GLCanvas.__init__(self, parent, -1, size=size)
         self.glctx = glcanvas.GLContext(self)  # ✅ Correct GLContext
         self.size = wx.Size(size[0], size[1])
-        self.glinit = False
+        # One GrDirectContext for the lifetime of self.glctx; resizes only
+        # re-wrap the render target, once a burst of resizes has settled.
+        self.surfaces = GLSurfaceManager(color_space=skia.ColorSpace.MakeSRGB())
+        self.settle_timer = None
         self.canvas = None
         self.surface = None
         self.is_dragging = False
@@ -43,6 +57,11 @@ class SkiaWxGPUCanvas(glcanvas.GLCanvas):
         self.zoom = 1.0
 
         self.svg_picture = None
+        self.preview_image = None # cached thumbnail, shown while the document loads
+        self.svg_id = 0 # tile cache key, bumped for every document loaded
+        self.tiles = None
+        self.lod = None
+        self.idle_timer = None
         self.img_size = None
         self.img_scale_enum = 0
         self.img_zoom = 1.0
@@ -53,31 +72,21 @@ class SkiaWxGPUCanvas(glcanvas.GLCanvas):
         self.Bind(wx.EVT_MOUSEWHEEL, self.on_mouse_wheel)
         self.Bind(wx.EVT_PAINT, self.on_paint)
         self.Bind(wx.EVT_SIZE, self.on_size)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
         self.Bind(wx.EVT_KEY_DOWN, self.on_key_down)
         # Do nothing, to avoid flashing on MSW.
         self.Bind(wx.EVT_ERASE_BACKGROUND, lambda x: None)
 
     def init_gl(self):
-        """Initialize Skia GPU context and surface."""
-        context = skia.GrDirectContext.MakeGL()
-        backend_render_target = skia.GrBackendRenderTarget(
-            self.size.width, self.size.height, 0, 0, skia.GrGLFramebufferInfo(
-                0, GL_RGBA8)
-        )
-        self.surface = skia.Surface.MakeFromBackendRenderTarget(
-            context, backend_render_target, skia.kBottomLeft_GrSurfaceOrigin,
-            skia.kRGBA_8888_ColorType, skia.ColorSpace.MakeSRGB()
-        )
+        """Get the Skia GPU surface for the current size."""
+        self.surface = self.surfaces.surface(self.size.width, self.size.height)
         self.canvas = self.surface.getCanvas()
-        self.glinit = True
 
     def on_paint(self, event):
         """Handle drawing."""
 
-        if not self.glinit:
-            self.SetCurrent(self.glctx)
-            glViewport(0, 0, self.size.width, self.size.height)
-            self.init_gl()
+        self.SetCurrent(self.glctx)
+        self.init_gl()
 
         # This is your actual skia based drawing function
         self.on_draw()
@@ -90,6 +99,7 @@ class SkiaWxGPUCanvas(glcanvas.GLCanvas):
             (keycode == 45)):  # '-'
             self.img_scale_enum += (44 - keycode)
             self.img_zoom = 1.2 ** self.img_scale_enum
+            self.on_interaction()
             self.Refresh()
         event.Skip()
 
@@ -110,6 +120,7 @@ class SkiaWxGPUCanvas(glcanvas.GLCanvas):
             self.offset_x += dx / self.zoom
             self.offset_y += dy / self.zoom
             self.last_mouse_pos = (xpos, ypos)
+            self.on_interaction()
             self.Refresh()
         event.Skip()
 
@@ -144,8 +155,94 @@ class SkiaWxGPUCanvas(glcanvas.GLCanvas):
         self.offset_x = (dx / self.zoom) - world_x
         self.offset_y = (dy / self.zoom) - world_y
 
+        self.on_interaction()
+        self.Refresh()
+
+    def set_preview(self, image):
+        self.preview_image = image
         self.Refresh()
 
+    def set_document(self, svg_picture):
+        self.svg_picture = svg_picture
+        self.preview_image = None
+        self.img_size = svg_picture.container_size()
+        if self.tiles is not None:
+            self.tiles.invalidate(self.svg_id)
+        else:
+            self.tiles = SVGTileCache(context=self.surfaces.context)
+            self.lod = ProgressiveRenderer(context=self.surfaces.context)
+        self.svg_id += 1
+        self.lod.invalidate()
+        # Build the preview after the first full-quality frame
+        self.on_interaction()
+
+    def reload_document(self, svg_picture, dirty):
+        """A new version of the same document: keep the tiles outside the dirty rectangles,
+        and the (slightly stale) preview, to draw while the rest is re-rendered."""
+        if self.tiles is None:
+            self.set_document(svg_picture)
+            return 0, 0
+        self.svg_picture = svg_picture
+        self.img_size = svg_picture.container_size()
+        self.svg_id += 1
+        kept, dropped = self.tiles.carry_over(self.svg_id - 1, self.svg_id,
+                                              [skia.Rect.MakeLTRB(*rect) for rect in dirty])
+        self.on_interaction()
+        return kept, dropped
+
+    def view(self):
+        """Document to screen: screen = scale * doc + (dx, dy).
+
+        The same as translate(w/2, h/2) scale(zoom) translate(offset)
+        scale(img_zoom) translate(-img_size/2)."""
+        w, h = self.GetSize()
+        scale = self.zoom * self.img_zoom
+        img_w, img_h = self.img_size.width(), self.img_size.height()
+        dx = w / 2 + self.zoom * self.offset_x - scale * img_w / 2
+        dy = h / 2 + self.zoom * self.offset_y - scale * img_h / 2
+        return scale, dx, dy
+
+    def on_interaction(self):
+        """Pan/zoom input: preview mode, and refine once input has been idle a while."""
+        if self.lod is None:
+            return
+        self.lod.on_input()
+        delay = int(self.lod.idle_delay * 1000) + 1
+        if self.idle_timer is None:
+            self.idle_timer = wx.CallLater(delay, self.on_idle)
+        else:
+            self.idle_timer.Start(delay)
+
+    def on_idle(self):
+        if self.lod is None:
+            return
+        if self.lod.interacting():
+            self.idle_timer.Start(int(self.lod.idle_remaining() * 1000) + 1)
+            return
+        self.lod.start(self.refinement_steps())
+        self.refine()
+
+    def refinement_steps(self):
+        """Full quality for the current view: the missing tiles, one per step, then a new preview."""
+        w, h = self.GetSize()
+        scale, dx, dy = self.view()
+        img_w, img_h = self.img_size.width(), self.img_size.height()
+        render = self.svg_picture.render
+        for key in self.tiles.missing(self.svg_id, img_w, img_h, scale, dx, dy, w, h):
+            self.tiles.render_tile(key, render)
+            yield
+        yield from self.lod.preview_steps(render, scale, dx, dy, w, h)
+
+    def refine(self):
+        if self.lod is None or not self.lod.refining():
+            return # cancelled by new input (or torn down)
+        self.SetCurrent(self.glctx)
+        if self.lod.step():
+            # Let the event loop in between chunks, so input can cancel
+            wx.CallLater(1, self.refine)
+        else:
+            self.Refresh()
+
     def on_draw(self):
         """Draw on Skia canvas."""
         w, h = self.GetSize()
@@ -154,29 +251,51 @@ class SkiaWxGPUCanvas(glcanvas.GLCanvas):
         glViewport(0, 0, self.size.width, self.size.height)
 
         self.canvas.clear(skia.ColorWHITE)
-        self.canvas.save()
 
-        # Set up the translation and zoom (pan/zoom)
-        self.canvas.translate(w / 2, h / 2)
-        self.canvas.scale(self.zoom, self.zoom)
-        self.canvas.translate(self.offset_x, self.offset_y)
+        if self.preview_image is not None:
+            # Fitted and centred, upscaled: blurry, but immediate
+            scale, dx, dy = fit_transform(self.preview_image.width(), self.preview_image.height(), w, h)
+            self.canvas.drawImageRect(self.preview_image,
+                                      skia.Rect.MakeXYWH(dx, dy, scale * self.preview_image.width(),
+                                                         scale * self.preview_image.height()),
+                                      skia.SamplingOptions(skia.FilterMode.kLinear))
+        elif self.svg_picture:
+            # Composite cached tiles, instead of rendering the SVGDOM on
+            # every pan and zoom event. When some of the tiles for this
+            # view are missing, show the low-resolution preview instead,
+            # until the refinement after input goes idle has rendered them.
+            scale, dx, dy = self.view()
+            img_w, img_h = self.img_size.width(), self.img_size.height()
+            if (self.lod.has_preview() and
+                self.tiles.missing(self.svg_id, img_w, img_h, scale, dx, dy, w, h)):
+                self.lod.draw_preview(self.canvas, scale, dx, dy)
+            else:
+                self.tiles.draw(self.canvas, self.svg_id, self.svg_picture.render,
+                                img_w, img_h, scale, dx, dy, w, h)
 
-        if self.svg_picture:
-            self.canvas.scale(self.img_zoom, self.img_zoom)
-            self.canvas.translate(-self.img_size.width()/2, -self.img_size.height()/2)
-            self.svg_picture.render(self.canvas)
-            self.canvas.translate(self.img_size.width()/2, self.img_size.height()/2)
-            self.canvas.scale(1/self.img_zoom, 1/self.img_zoom)
-
-        self.canvas.restore()
         self.surface.flushAndSubmit()
 
     def on_size(self, event):
         """Handle resizing of the canvas."""
-        self.glinit = False
         wx.CallAfter(self.set_viewport)
         event.Skip()
 
+    def on_destroy(self, event):
+        """Real teardown: only now is the GrDirectContext abandoned."""
+        if event.GetEventObject() is self:
+            if self.settle_timer is not None:
+                self.settle_timer.Stop()
+            if self.idle_timer is not None:
+                self.idle_timer.Stop()
+            if self.tiles is not None:
+                print(self.tiles.stats())
+                print(self.lod.stats())
+                self.tiles = None
+                self.lod = None
+            self.SetCurrent(self.glctx)
+            self.surfaces.abandon()
+        event.Skip()
+
     def set_viewport(self):
         # Actual drawing area (without borders) is GetClientSize
         size = self.GetClientSize()
@@ -185,21 +304,51 @@ class SkiaWxGPUCanvas(glcanvas.GLCanvas):
         width = int(size.width * scale)
         height = int(size.height * scale)
         self.size = wx.Size(width, height)
+        self.surfaces.resize(width, height)
+        # Paint again once the burst of resize events has settled
+        delay = int(self.surfaces.debounce * 1000) + 1
+        if self.settle_timer is None:
+            self.settle_timer = wx.CallLater(delay, self.Refresh)
+        else:
+            self.settle_timer.Start(delay)
 
 
 class MainFrame(wx.Frame):
     def __init__(self):
         super().__init__(None, title="Skia WxPython GPU Canvas", size=(800, 600))
-        panel = wx.Panel(self)
+        self.panel = panel = wx.Panel(self)
         sizer = wx.BoxSizer(wx.VERTICAL)
 
+        top_sizer = wx.BoxSizer(wx.HORIZONTAL)
         open_button = wx.Button(panel, label='Open File')
         open_button.Bind(wx.EVT_BUTTON, self.on_open_file)
-        sizer.Add(open_button, flag=wx.ALIGN_CENTER | wx.BOTTOM, border=10)
+        top_sizer.Add(open_button, flag=wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, border=10)
+        self.progress = wx.Gauge(panel, range=100, size=(200, -1))
+        self.progress.Hide()
+        top_sizer.Add(self.progress, flag=wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, border=10)
+        self.watch_box = wx.CheckBox(panel, label='Watch file')
+        top_sizer.Add(self.watch_box, flag=wx.ALIGN_CENTER_VERTICAL)
+        sizer.Add(top_sizer, flag=wx.ALIGN_CENTER | wx.BOTTOM, border=10)
 
         self.canvas = SkiaWxGPUCanvas(panel, (800, 600))
         sizer.Add(self.canvas, 1, wx.EXPAND)
         panel.SetSizer(sizer)
+        self.CreateStatusBar()
+
+        # SVG files are parsed and recorded in a worker process; the canvas
+        # keeps drawing the previous document until the new one is ready.
+        self.loader = AsyncLoader(wx.CallAfter, ProcessPoolExecutor(max_workers=1))
+        # Thumbnails from earlier sessions show instantly while a file loads
+        self.thumbnails = ThumbnailCache()
+        self.has_thumbnail = False
+        # Watch mode: reload the file in the background when it changes
+        self.watcher = None
+        self.picture_data = None
+        self.watch_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_watch_timer, self.watch_timer)
+        self.pulse_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, lambda event: self.progress.Pulse(), self.pulse_timer)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
         self.Show()
 
     def on_open_file(self, event):
@@ -211,14 +360,90 @@ class MainFrame(wx.Frame):
 
             # Proceed loading the file chosen by the user
             path = fileDialog.GetPath()
-            try:
-                svgstream = skia.Stream.MakeFromFile(path)
-                self.canvas.svg_picture = skia.SVGDOM.MakeFromStream(svgstream)
-                self.canvas.img_size = self.canvas.svg_picture.containerSize()
-                self.canvas.Refresh()
-                self.canvas.SetFocus()
-            except Exception as e:
-                wx.LogError(f"Cannot open file '{path}'.\n{str(e)}")
+            self.SetStatusText(f"Loading '{path}'...")
+            self.show_progress(True)
+            self.show_thumbnail(path)
+            # Recorded once into a skia.Picture, which the tiles replay
+            self.loader.load(record_svg_file, path,
+                             on_done=lambda result: self.on_loaded(path, result),
+                             on_error=lambda e: self.on_load_error(path, e))
+
+    def show_progress(self, show):
+        if show:
+            self.pulse_timer.Start(50)
+        else:
+            self.pulse_timer.Stop()
+        self.progress.Show(show)
+        self.panel.Layout()
+
+    def show_thumbnail(self, path):
+        # Only a lookup: hashing a large file here would be the very freeze avoided by loading asynchronously
+        try:
+            data = self.thumbnails.lookup(path, THUMBNAIL_SIZE, THUMBNAIL_SIZE, compute=False)
+        except OSError:
+            data = None
+        self.has_thumbnail = data is not None
+        if data is not None:
+            self.canvas.set_preview(skia.Image.MakeFromEncoded(skia.Data.MakeWithCopy(data)))
+
+    def on_loaded(self, path, result):
+        data, (width, height), (parse_time, record_time) = result
+        self.show_progress(False)
+        self.canvas.set_document(RecordedSVG.from_picture(picture_from_bytes(data), width, height))
+        self.watch(path, data, (width, height))
+        if not self.has_thumbnail:
+            # Rendered from the recording, in the worker, for next time
+            self.loader.executor.submit(picture_thumbnail_worker,
+                                        self.thumbnails.cache_dir, self.thumbnails.max_bytes,
+                                        path, data, width, height, THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        self.SetStatusText(f"'{path}': parsed in {parse_time * 1000:.0f} ms, recorded in {record_time * 1000:.0f} ms")
+        self.canvas.Refresh()
+        self.canvas.SetFocus()
+
+    def watch(self, path, data, size):
+        self.picture_data = data
+        self.picture_size = size
+        if self.watcher is None or self.watcher.path != path:
+            self.watcher = FileWatcher(path)
+            self.watch_timer.Start(int(self.watcher.interval * 1000))
+
+    def on_watch_timer(self, event):
+        if not self.watch_box.GetValue() or self.loader.busy():
+            return
+        if self.watcher.poll():
+            path = self.watcher.path
+            self.SetStatusText(f"Reloading '{path}'...")
+            self.loader.load(reload_svg_file, path, self.picture_data, self.picture_size,
+                             on_done=lambda result: self.on_reloaded(path, result),
+                             on_error=lambda e: self.SetStatusText(f"Reloading '{path}' failed: {e}"))
+
+    def on_reloaded(self, path, result):
+        data, (width, height), (parse_time, record_time), dirty = result
+        self.picture_data = data
+        self.picture_size = (width, height)
+        picture = RecordedSVG.from_picture(picture_from_bytes(data), width, height)
+        if dirty is None:
+            self.canvas.set_document(picture)
+            self.SetStatusText(f"'{path}' reloaded in {(parse_time + record_time) * 1000:.0f} ms")
+        else:
+            kept, dropped = self.canvas.reload_document(picture, dirty)
+            self.SetStatusText(f"'{path}' reloaded in {(parse_time + record_time) * 1000:.0f} ms: "
+                               f"{len(dirty)} changed areas, {kept} tiles kept, {dropped} re-rendered")
+        self.canvas.Refresh()
+
+    def on_load_error(self, path, e):
+        self.show_progress(False)
+        self.canvas.set_preview(None)
+        self.SetStatusText("")
+        wx.LogError(f"Cannot open file '{path}'.\n{str(e)}")
+
+    def on_close(self, event):
+        self.pulse_timer.Stop()
+        self.watch_timer.Stop()
+        print(self.loader.stats())
+        print(self.thumbnails.stats())
+        self.loader.shutdown()
+        event.Skip()
 
 if __name__ == "__main__":
     app = wx.App(False)
@@ -19,7 +19,9 @@ import ctypes
 import wx
 from wx import glcanvas
 import skia
-from OpenGL.GL import glViewport, GL_RGBA8
+from OpenGL.GL import glViewport
+# local imports
+from gl_surface_manager import GLSurfaceManager
 
 
 """Enable high-res displays."""
@@ -37,7 +39,10 @@ class SkiaWxGPUCanvas(glcanvas.GLCanvas):
         glcanvas.GLCanvas.__init__(self, parent, -1, size=size)
         self.glctx = glcanvas.GLContext(self)  # ✅ Correct GLContext
         self.size = wx.Size(size[0], size[1])
-        self.glinit = False
+        # One GrDirectContext for the lifetime of self.glctx; resizes only
+        # re-wrap the render target, once a burst of resizes has settled.
+        self.surfaces = GLSurfaceManager(color_space=skia.ColorSpace.MakeSRGB())
+        self.settle_timer = None
         self.canvas = None
         self.surface = None
         self.is_dragging = False
@@ -52,30 +57,20 @@ class SkiaWxGPUCanvas(glcanvas.GLCanvas):
         self.Bind(wx.EVT_MOUSEWHEEL, self.on_mouse_wheel)
         self.Bind(wx.EVT_PAINT, self.on_paint)
         self.Bind(wx.EVT_SIZE, self.on_size)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
         # Do nothing, to avoid flashing on MSW.
         self.Bind(wx.EVT_ERASE_BACKGROUND, lambda x: None)
 
     def init_gl(self):
-        """Initialize Skia GPU context and surface."""
-        context = skia.GrDirectContext.MakeGL()
-        backend_render_target = skia.GrBackendRenderTarget(
-            self.size.width, self.size.height, 0, 0, skia.GrGLFramebufferInfo(
-                0, GL_RGBA8)
-        )
-        self.surface = skia.Surface.MakeFromBackendRenderTarget(
-            context, backend_render_target, skia.kBottomLeft_GrSurfaceOrigin,
-            skia.kRGBA_8888_ColorType, skia.ColorSpace.MakeSRGB()
-        )
+        """Get the Skia GPU surface for the current size."""
+        self.surface = self.surfaces.surface(self.size.width, self.size.height)
         self.canvas = self.surface.getCanvas()
-        self.glinit = True
 
     def on_paint(self, event):
         """Handle drawing."""
 
-        if not self.glinit:
-            self.SetCurrent(self.glctx)
-            glViewport(0, 0, self.size.width, self.size.height)
-            self.init_gl()
+        self.SetCurrent(self.glctx)
+        self.init_gl()
 
         # This is your actual skia based drawing function
         self.on_draw()
@@ -166,10 +161,18 @@ class SkiaWxGPUCanvas(glcanvas.GLCanvas):
 
     def on_size(self, event):
         """Handle resizing of the canvas."""
-        self.glinit = False
         wx.CallAfter(self.set_viewport)
         event.Skip()
 
+    def on_destroy(self, event):
+        """Real teardown: only now is the GrDirectContext abandoned."""
+        if event.GetEventObject() is self:
+            if self.settle_timer is not None:
+                self.settle_timer.Stop()
+            self.SetCurrent(self.glctx)
+            self.surfaces.abandon()
+        event.Skip()
+
     def set_viewport(self):
         # Actual drawing area (without borders) is GetClientSize
         size = self.GetClientSize()
@@ -178,6 +181,13 @@ class SkiaWxGPUCanvas(glcanvas.GLCanvas):
         width = int(size.width * scale)
         height = int(size.height * scale)
         self.size = wx.Size(width, height)
+        self.surfaces.resize(width, height)
+        # Paint again once the burst of resize events has settled
+        delay = int(self.surfaces.debounce * 1000) + 1
+        if self.settle_timer is None:
+            self.settle_timer = wx.CallLater(delay, self.Refresh)
+        else:
+            self.settle_timer.Start(delay)
 
 
 class MainFrame(wx.Frame):
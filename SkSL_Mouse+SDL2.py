@@ -10,9 +10,10 @@
 
 from sdl2 import *
 import skia
-from skia import Paint, Rect, Font, Typeface, ColorWHITE
+from skia import Paint, Rect, ColorWHITE
 from OpenGL import GL
 import ctypes
+from font_registry import get_registry
 
 width, height = 512, 512
 title = b"Skia + PySDL2 + SkSL Example"
@@ -105,7 +106,7 @@ def main(builder):
     step = 0
     x = 0
     y = 0
-    font = Font(Typeface("Roman"))
+    font = get_registry().font("Roman")
     paint = Paint()
     paint.setColor(ColorWHITE)
     helpMessage = "Click to change hightlights"
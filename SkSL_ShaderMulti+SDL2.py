@@ -10,9 +10,10 @@
 
 from sdl2 import *
 import skia
-from skia import Paint, Rect, Font, Typeface, ColorWHITE
+from skia import Paint, Rect, ColorWHITE
 from OpenGL import GL
 import ctypes
+from font_registry import get_registry
 import time
 
 width, height = 512, 512
@@ -360,7 +361,7 @@ def main():
     running = True
     event = SDL_Event() # Create event structure once
     step = 0
-    font = Font(Typeface("Roman"))
+    font = get_registry().font("Roman")
     paintWHITE = Paint()
     paintWHITE.setColor(ColorWHITE)
     initial_time = time.time()
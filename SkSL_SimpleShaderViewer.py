@@ -23,6 +23,8 @@ from skia import Paint, Rect, Font, Typeface, ColorWHITE
 from OpenGL import GL
 import ctypes
 import time
+from input_coalescer import MouseCoalescer, PRESS, RELEASE
+from mapped_input import lazy_image, report_rss
 
 width, height = 512, 512
 title = b"Python SkiaSimpleShaderViewer"
@@ -122,6 +124,8 @@ def main():
     initial_time = time.time()
     mouse = Rect.MakeLTRB(0,0,0,0)
     builder.setUniform("iMouse", [mouse.fRight, mouse.fBottom, mouse.fLeft, mouse.fTop])
+    # Mouse events are coalesced, and iMouse written at most once per frame
+    mouse_events = MouseCoalescer()
 
     while running:
         while SDL_PollEvent(event):
@@ -132,24 +136,28 @@ def main():
 
             if event.type == SDL_MOUSEMOTION:
                 if event.motion.state == SDL_PRESSED:
-                    mouse.fRight = event.motion.x
-                    mouse.fBottom = event.motion.y
-                    # HTL: I don't want to do shadowboy-style: z > 0 && w < 0
-                    builder.setUniform("iMouse", [mouse.fRight, mouse.fBottom, mouse.fLeft, mouse.fTop])
+                    mouse_events.motion(event.motion.x, event.motion.y)
             if event.type == SDL_MOUSEBUTTONDOWN:
-                if event.button.state == SDL_PRESSED: # -z,-w
-                    (mouse.fRight, mouse.fBottom) = event.button.x, event.button.y
-                    mouse.fLeft = -event.button.x
-                    mouse.fTop = -event.button.y
-                    builder.setUniform("iMouse", [mouse.fRight, mouse.fBottom, mouse.fLeft, mouse.fTop])
+                if event.button.state == SDL_PRESSED:
+                    mouse_events.press(event.button.x, event.button.y, event.button.button)
             if event.type == SDL_MOUSEBUTTONUP:
-                if event.button.state == SDL_RELEASED: # z,w flipped
-                    (mouse.fRight, mouse.fBottom) = event.button.x, event.button.y
-                    mouse.fLeft = -mouse.fLeft
-                    mouse.fTop = -mouse.fTop
-                    builder.setUniform("iMouse", [mouse.fRight, mouse.fBottom, mouse.fLeft, mouse.fTop])
+                if event.button.state == SDL_RELEASED:
+                    mouse_events.release(event.button.x, event.button.y, event.button.button)
         if not running:
             break
+
+        coalesced = mouse_events.take()
+        for kind, button, x, y in coalesced:
+            (mouse.fRight, mouse.fBottom) = x, y
+            # HTL: I don't want to do shadowboy-style: z > 0 && w < 0
+            if kind == PRESS: # -z,-w
+                mouse.fLeft = -x
+                mouse.fTop = -y
+            elif kind == RELEASE: # z,w flipped
+                mouse.fLeft = -mouse.fLeft
+                mouse.fTop = -mouse.fTop
+        if coalesced:
+            builder.setUniform("iMouse", [mouse.fRight, mouse.fBottom, mouse.fLeft, mouse.fTop])
         
         GL.glClearColor(0.0, 0.0, 0.0, 1.0) # Black background
         GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_STENCIL_BUFFER_BIT)
@@ -160,6 +168,7 @@ def main():
         
         SDL_GL_SwapWindow(window)
 
+    print(mouse_events.stats())
     context.abandonContext()
 
     if gl_context:
@@ -214,7 +223,10 @@ if __name__ == '__main__':
         assert False
 
     if (builder.child("iImage1").type == skia.RuntimeEffect.ChildType.kShader):
-        image = skia.Image.open("8de3a3924cb95bd0e95a443fff0326c869f9d4979cd1d5b6e94e2a01f5be53e9.jpg")
+        # Mapped, and only decoded when first drawn
+        rss = report_rss("before loading image")
+        image = lazy_image("8de3a3924cb95bd0e95a443fff0326c869f9d4979cd1d5b6e94e2a01f5be53e9.jpg")
+        report_rss("after loading image", rss)
         builder.setChild("iImage1", image.makeShader(skia.SamplingOptions(skia.FilterMode.kLinear)))
     if (len(bdchildren) > 0):
         print("builder dchilden: (Type setted)")
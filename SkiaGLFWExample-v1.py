@@ -5,6 +5,7 @@ from OpenGL.GL import *
 import skia
 import sys
 import random
+from path_geometry import star
 
 class ApplicationState:
     def __init__(self, width, height):
@@ -16,20 +17,7 @@ class ApplicationState:
         self.canvas = None
 
 def create_star():
-    kNumPoints = 5
-    concavePath = skia.Path()
-    points = [skia.Point(0, -50)]
-    rot = skia.Matrix()
-    rot.setRotate(360.0 / kNumPoints)
-    for i in range(kNumPoints - 1):
-        points.append(rot.mapPoints(points[i:i+1])[0])
-    concavePath.moveTo(points[0])
-    for i in range(kNumPoints):
-        concavePath.lineTo(points[(2 * i) % kNumPoints])
-    concavePath.setFillType(skia.PathFillType.kEvenOdd)
-    assert not concavePath.isConvex()
-    concavePath.close()
-    return concavePath
+    return star()
 
 def main():
     if not glfw.init():
@@ -12,6 +12,7 @@ import glfw
 import sys
 from OpenGL.GL import *
 from skia import *
+from path_geometry import star
 
 class ApplicationState:
     def __init__(self, width, height):
@@ -59,20 +60,7 @@ def window_size_callback(window, width, height):
     glViewport(0, 0, width, height)
 
 def create_star():
-    kNumPoints = 5
-    concavePath = Path()
-    points = [Point(0, -50)]
-    rot = Matrix()
-    rot.setRotate(360.0 / kNumPoints)
-    for i in range(kNumPoints - 1): # skip 0
-        points.append(rot.mapPoints(points[i:i+1])[0])
-    concavePath.moveTo(points[0])
-    for i in range(kNumPoints):
-        concavePath.lineTo(points[(2 * i) % kNumPoints])
-    concavePath.setFillType(PathFillType.kEvenOdd)
-    assert not concavePath.isConvex()
-    concavePath.close()
-    return concavePath
+    return star()
 
 def main(argv):
     if not glfw.init():
@@ -11,6 +11,7 @@ from OpenGL.GL import *
 from skia import *
 import sys
 import random
+from path_geometry import star
 
 class ApplicationState:
     def __init__(self, width, height):
@@ -21,19 +22,7 @@ class ApplicationState:
         self.drawing = False
 
 def create_star():
-    kNumPoints = 5
-    concavePath = Path()
-    points = [Point(0, -50)]
-    rot = Matrix()
-    rot.setRotate(360.0 / kNumPoints)
-    for i in range(kNumPoints - 1):
-        points.append(rot.mapPoints(points[i:i+1])[0])
-    concavePath.moveTo(points[0])
-    for i in range(kNumPoints):
-        concavePath.lineTo(points[(2 * i) % kNumPoints])
-    concavePath.setFillType(PathFillType.kEvenOdd)
-    concavePath.close()
-    return concavePath
+    return star()
 
 def main():
     if not glfw.init():
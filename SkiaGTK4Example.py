@@ -14,9 +14,12 @@ from gi.repository import Gtk, Gdk, GdkPixbuf, GLib, GdkRGBA
 
 import cairo
 import skia
+from font_registry import get_registry
 import sys
 import math
 import random
+from path_geometry import star
+from frame_scheduler import FrameScheduler
 
 HELP_MESSAGE = "Click and drag to create rects. Press esc to quit."
 
@@ -31,19 +34,7 @@ class ApplicationState:
         self.rotation = 0
 
 def create_star():
-    kNumPoints = 5
-    concavePath = skia.Path()
-    points = [skia.Point(0, -50)]
-    rot = skia.Matrix()
-    rot.setRotate(360.0 / kNumPoints)
-    for i in range(kNumPoints - 1):
-        points.append(rot.mapPoints(points[i:i+1])[0])
-    concavePath.moveTo(points[0])
-    for i in range(kNumPoints):
-        concavePath.lineTo(points[(2 * i) % kNumPoints])
-    concavePath.setFillType(skia.PathFillType.kEvenOdd)
-    concavePath.close()
-    return concavePath
+    return star()
 
 class SkiaArea(Gtk.DrawingArea):
     def __init__(self, state):
@@ -68,8 +59,12 @@ class SkiaArea(Gtk.DrawingArea):
         self.star_height = 100
         self.create_offscreen_star()
 
-        # Animation timer
-        GLib.timeout_add(16, self.on_tick)
+        # Frames when the scheduler says one is due, rather than on a fixed
+        # 16ms timer; a low rate when the window is unfocused or hidden
+        self.scheduler = FrameScheduler()
+        self.scheduler.set_animating(True)
+        self.timeout_id = None
+        self.schedule()
 
     def create_offscreen_star(self):
         # Create a raster skia surface for the star
@@ -84,10 +79,28 @@ class SkiaArea(Gtk.DrawingArea):
         canvas.restore()
         self.star_image = self.star_surface.makeImageSnapshot()
     
-    def on_tick(self):
+    def schedule(self):
+        # (Re-)arm the single pending timeout; with nothing due there is none,
+        # and the GLib main loop sleeps until the next event
+        if self.timeout_id is not None:
+            GLib.source_remove(self.timeout_id)
+            self.timeout_id = None
+        if self.state.fQuit:
+            return
+        timeout = self.scheduler.timeout_ms()
+        if timeout is not None:
+            self.timeout_id = GLib.timeout_add(timeout, self.animate)
+
+    def animate(self):
+        self.timeout_id = None
         self.state.rotation = (self.state.rotation + 1) % 360
         self.queue_draw()
-        return not self.state.fQuit
+        return False
+
+    def on_window_state(self, focused, visible):
+        self.scheduler.set_focused(focused)
+        self.scheduler.set_visible(visible)
+        self.schedule()
 
     def on_resize(self, widget, width, height):
         self.state.window_width = width
@@ -123,6 +136,7 @@ class SkiaArea(Gtk.DrawingArea):
         return False
 
     def on_draw(self, area, context, width, height):
+        self.scheduler.frame_begin()
         # Create Skia surface backed by Cairo context
         surface = skia.Surface.MakeRenderTarget(
             skia.GrDirectContext.MakeGL() if hasattr(skia, 'GrDirectContext') else None,
@@ -138,7 +152,7 @@ class SkiaArea(Gtk.DrawingArea):
 
         canvas = surface.getCanvas()
         canvas.clear(skia.ColorWHITE)
-        font = skia.Font()
+        font = get_registry().font()
         paint = skia.Paint()
         # Draw help text at top-left
         paint.setColor(skia.ColorBLACK)
@@ -170,11 +184,14 @@ class SkiaArea(Gtk.DrawingArea):
         )
         Gdk.cairo_set_source_pixbuf(context, pixbuf, 0, 0)
         context.paint()
+        self.scheduler.frame_end()
+        self.schedule()
 
 class SkiaGTKApp(Gtk.Application):
     def __init__(self):
         super().__init__(application_id="org.example.SkiaGTK4Example")
         self.state = None
+        self.area = None
 
     def do_activate(self):
         # Get display size for initial window
@@ -189,11 +206,22 @@ class SkiaGTKApp(Gtk.Application):
         window.set_default_size(width//2, height//2)
         area = SkiaArea(self.state)
         window.set_child(area)
+
+        def on_window_state(window, pspec):
+            suspended = window.find_property("suspended") and window.get_property("suspended")
+            area.on_window_state(window.is_active(), window.get_visible() and not suspended)
+        window.connect("notify::is-active", on_window_state)
+        window.connect("notify::visible", on_window_state)
+        if window.find_property("suspended"): # GTK 4.12+
+            window.connect("notify::suspended", on_window_state)
+        self.area = area
         window.present()
 
 def main():
     app = SkiaGTKApp()
     app.run(sys.argv)
+    if app.area:
+        print(app.area.scheduler.report_string())
 
 if __name__ == '__main__':
     main()
@@ -11,6 +11,9 @@ import sys
 import math
 import random
 import time
+from font_registry import get_registry
+from path_geometry import star
+from frame_scheduler import FrameScheduler
 
 HELP_MESSAGE = "Click and drag to create rects. Press esc to quit."
 
@@ -26,19 +29,7 @@ class ApplicationState:
         self.start_time = time.time()
 
 def create_star():
-    kNumPoints = 5
-    concavePath = skia.Path()
-    points = [skia.Point(0, -50)]
-    rot = skia.Matrix()
-    rot.setRotate(360.0 / kNumPoints)
-    for i in range(kNumPoints - 1):
-        points.append(rot.mapPoints(points[i:i+1])[0])
-    concavePath.moveTo(points[0])
-    for i in range(kNumPoints):
-        concavePath.lineTo(points[(2 * i) % kNumPoints])
-    concavePath.setFillType(skia.PathFillType.kEvenOdd)
-    concavePath.close()
-    return concavePath
+    return star()
 
 class SkiaGLArea(Gtk.GLArea):
     def __init__(self, state):
@@ -80,7 +71,12 @@ class SkiaGLArea(Gtk.GLArea):
         self.create_offscreen_star()
         self.create_runtime_shader()
 
-        GLib.timeout_add(16, self.on_tick)
+        # Frames when the scheduler says one is due, rather than on a fixed
+        # 16ms timer; a low rate when the window is unfocused or hidden
+        self.scheduler = FrameScheduler()
+        self.scheduler.set_animating(True)
+        self.timeout_id = None
+        self.schedule()
 
     def create_offscreen_star(self):
         info = skia.ImageInfo.Make(self.star_width, self.star_height, skia.ColorType.kRGBA_8888_ColorType, skia.AlphaType.kPremul_AlphaType)
@@ -133,10 +129,28 @@ class SkiaGLArea(Gtk.GLArea):
                 props
             )
 
-    def on_tick(self):
+    def schedule(self):
+        # (Re-)arm the single pending timeout; with nothing due there is none,
+        # and the GLib main loop sleeps until the next event
+        if self.timeout_id is not None:
+            GLib.source_remove(self.timeout_id)
+            self.timeout_id = None
+        if self.state.fQuit:
+            return
+        timeout = self.scheduler.timeout_ms()
+        if timeout is not None:
+            self.timeout_id = GLib.timeout_add(timeout, self.animate)
+
+    def animate(self):
+        self.timeout_id = None
         self.state.rotation = (self.state.rotation + 1) % 360
         self.queue_render()
-        return not self.state.fQuit
+        return False
+
+    def on_window_state(self, focused, visible):
+        self.scheduler.set_focused(focused)
+        self.scheduler.set_visible(visible)
+        self.schedule()
 
     def on_resize(self, area, width, height):
         self.state.window_width = width
@@ -174,6 +188,7 @@ class SkiaGLArea(Gtk.GLArea):
         return False
 
     def on_render(self, area, gl_context):
+        self.scheduler.frame_begin()
         width = self.get_allocated_width()
         height = self.get_allocated_height()
         self.ensure_surface(width, height)
@@ -181,7 +196,7 @@ class SkiaGLArea(Gtk.GLArea):
         surface = self.surface
         canvas = surface.getCanvas()
         canvas.clear(skia.ColorWHITE)
-        font = skia.Font()
+        font = get_registry().font()
         paint = skia.Paint()
         # Draw animated runtime shader background if available
         if self.shader_effect:
@@ -214,12 +229,15 @@ class SkiaGLArea(Gtk.GLArea):
         canvas.restore()
         canvas.flush()
         self.gr_context.flush()
+        self.scheduler.frame_end()
+        self.schedule()
         return True  # drawing handled
 
 class SkiaGTKApp(Gtk.Application):
     def __init__(self):
         super().__init__(application_id="org.example.SkiaGTK4GLAdvancedExample")
         self.state = None
+        self.area = None
 
     def do_activate(self):
         display = Gdk.Display.get_default()
@@ -233,11 +251,22 @@ class SkiaGTKApp(Gtk.Application):
         window.set_default_size(width//2, height//2)
         area = SkiaGLArea(self.state)
         window.set_child(area)
+
+        def on_window_state(window, pspec):
+            suspended = window.find_property("suspended") and window.get_property("suspended")
+            area.on_window_state(window.is_active(), window.get_visible() and not suspended)
+        window.connect("notify::is-active", on_window_state)
+        window.connect("notify::visible", on_window_state)
+        if window.find_property("suspended"): # GTK 4.12+
+            window.connect("notify::suspended", on_window_state)
+        self.area = area
         window.present()
 
 def main():
     app = SkiaGTKApp()
     app.run(sys.argv)
+    if app.area:
+        print(app.area.scheduler.report_string())
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -13,6 +13,11 @@ import sys
 import math
 import random
 import time
+from frame_scheduler import FrameScheduler, MODE_ANIMATING
+from gl_surface_manager import GLSurfaceManager
+from sprite_cache import SpriteCache
+from font_registry import get_registry
+from path_geometry import star
 
 HELP_MESSAGE = "Click and drag, press esc. Animation: shaders, path effects, filters, SVG!"
 
@@ -28,19 +33,7 @@ class ApplicationState:
         self.start_time = time.time()
 
 def create_star():
-    kNumPoints = 5
-    concavePath = skia.Path()
-    points = [skia.Point(0, -50)]
-    rot = skia.Matrix()
-    rot.setRotate(360.0 / kNumPoints)
-    for i in range(kNumPoints - 1):
-        points.append(rot.mapPoints(points[i:i+1])[0])
-    concavePath.moveTo(points[0])
-    for i in range(kNumPoints):
-        concavePath.lineTo(points[(2 * i) % kNumPoints])
-    concavePath.setFillType(skia.PathFillType.kEvenOdd)
-    concavePath.close()
-    return concavePath
+    return star()
 
 class SkiaGLArea(Gtk.GLArea):
     def __init__(self, state):
@@ -50,6 +43,7 @@ class SkiaGLArea(Gtk.GLArea):
         self.set_required_version(3, 0)
         self.connect("render", self.on_render)
         self.connect("resize", self.on_resize)
+        self.connect("unrealize", self.on_unrealize)
         self.set_focusable(True)
 
         # --- Begin GTK4 event controller setup ---
@@ -71,6 +65,11 @@ class SkiaGLArea(Gtk.GLArea):
         # --- End GTK4 event controller setup ---
 
         self.state = state
+        # One GrDirectContext per GL context; resizes only re-wrap the
+        # render target, once a burst of resizes has settled.
+        self.surfaces = GLSurfaceManager(sample_count=4, # Use MSAA for smoother edges
+                                         stencil_bits=8,
+                                         make_context=lambda: skia.GrDirectContext.MakeGL(skia.GrGLInterface.MakeEGL()))
         self.gr_context = None
         self.surface = None
         self.star_image = None
@@ -82,18 +81,33 @@ class SkiaGLArea(Gtk.GLArea):
         self.create_path_effects()
         self.create_filters()
 
-        GLib.timeout_add(16, self.on_tick)
+        # Animate on GTK's frame clock, which is paced by the display (vsync),
+        # and fall back to a slow timeout when the window is unfocused or hidden.
+        self.scheduler = FrameScheduler(vsync=True)
+        self.scheduler.report_sources.append(get_registry().stats)
+        get_registry().warm_up([("", skia.FontStyle())])
+        self.scheduler.set_animating(True)
+        self.tick_id = None
+        self.timeout_id = None
+        self.schedule()
 
     def create_offscreen_star(self):
-        info = skia.ImageInfo.Make(self.star_width, self.star_height, skia.ColorType.kRGBA_8888_ColorType, skia.AlphaType.kPremul_AlphaType)
+        # Rasterized once, then uploaded once per GrDirectContext as a texture
+        self.sprites = SpriteCache()
+        self.sprites.register("star", self.rasterize_star)
+        self.star_image = self.sprites.get("star")
+
+    def rasterize_star(self, scale):
+        info = skia.ImageInfo.Make(int(self.star_width * scale), int(self.star_height * scale), skia.ColorType.kRGBA_8888_ColorType, skia.AlphaType.kPremul_AlphaType)
         star_surface = skia.Surface.MakeRaster(info)
         canvas = star_surface.getCanvas()
         paint = skia.Paint()
         canvas.save()
-        canvas.translate(self.star_width/2, self.star_height/2)
+        canvas.translate(self.star_width * scale/2, self.star_height * scale/2)
+        canvas.scale(scale, scale)
         canvas.drawPath(create_star(), paint)
         canvas.restore()
-        self.star_image = star_surface.makeImageSnapshot()
+        return star_surface.makeImageSnapshot()
 
     def create_runtime_shader(self):
         # Skia runtime shader (SkSL) - animated checkerboard
@@ -141,35 +155,57 @@ class SkiaGLArea(Gtk.GLArea):
         self.complex_filter = skia.ImageFilters.Compose(color, skia.ImageFilters.Compose(blur, shadow))
 
     def ensure_surface(self, width, height):
-        if not self.gr_context:
-            self.gr_context = skia.GrDirectContext.MakeGL(skia.GrGLInterface.MakeEGL())
-        if not self.surface or self.surface.width() != width or self.surface.height() != height:
-            fb_id = GL.glGetIntegerv(GL.GL_FRAMEBUFFER_BINDING)
-            stencil = 8
-            msaa = 4  # Use MSAA for smoother edges
-            fb_info = skia.GrGLFramebufferInfo(fb_id, GL.GL_RGBA8)
-            backend_render_target = skia.GrBackendRenderTarget(
-                width, height, msaa, stencil, fb_info
-            )
-            props = skia.SurfaceProps()
-            self.surface = skia.Surface.MakeFromBackendRenderTarget(
-                self.gr_context,
-                backend_render_target,
-                skia.kBottomLeft_GrSurfaceOrigin,
-                skia.ColorType.kRGBA_8888_ColorType,
-                None,
-                props
-            )
-
-    def on_tick(self):
+        fb_id = GL.glGetIntegerv(GL.GL_FRAMEBUFFER_BINDING)
+        self.surface = self.surfaces.surface(width, height, fb_id)
+        self.gr_context = self.surfaces.context
+
+    def schedule(self):
+        if self.state.fQuit:
+            return
+        if self.scheduler.mode() == MODE_ANIMATING:
+            if self.timeout_id is not None:
+                GLib.source_remove(self.timeout_id)
+                self.timeout_id = None
+            if self.tick_id is None:
+                self.tick_id = self.add_tick_callback(self.on_tick)
+            return
+        if self.tick_id is not None:
+            self.remove_tick_callback(self.tick_id)
+            self.tick_id = None
+        if self.timeout_id is None:
+            timeout = self.scheduler.timeout_ms()
+            if timeout is not None:
+                self.timeout_id = GLib.timeout_add(max(1, timeout), self.on_timeout)
+
+    def on_window_state(self, focused, visible):
+        self.scheduler.set_focused(focused)
+        self.scheduler.set_visible(visible)
+        self.schedule()
+
+    def on_tick(self, widget, frame_clock):
         self.state.rotation = (self.state.rotation + 1) % 360
         self.queue_render()
         return not self.state.fQuit
 
+    def on_timeout(self):
+        self.timeout_id = None
+        self.state.rotation = (self.state.rotation + 1) % 360
+        self.queue_render()
+        return False
+
     def on_resize(self, area, width, height):
         self.state.window_width = width
         self.state.window_height = height
-        self.surface = None  # force recreate
+        self.surfaces.resize(width, height)
+
+    def on_unrealize(self, area):
+        # The GL context is going away: the only time to abandon the GrDirectContext
+        self.make_current()
+        if self.surfaces.context is not None:
+            self.sprites.drop_context(self.surfaces.context)
+        self.surfaces.abandon()
+        self.surface = None
+        self.gr_context = None
 
     # --- Updated event handler signatures for GTK4 event controllers ---
     def on_button_press(self, gesture, n_press, x, y):
@@ -202,6 +238,7 @@ class SkiaGLArea(Gtk.GLArea):
         return False
 
     def on_render(self, area, gl_context):
+        self.scheduler.frame_begin()
         width = self.get_allocated_width()
         height = self.get_allocated_height()
         self.ensure_surface(width, height)
@@ -209,7 +246,7 @@ class SkiaGLArea(Gtk.GLArea):
         surface = self.surface
         canvas = surface.getCanvas()
         canvas.clear(skia.ColorWHITE)
-        font = skia.Font()
+        font = get_registry().font()
         paint = skia.Paint()
 
         # Animated runtime shader background
@@ -244,7 +281,8 @@ class SkiaGLArea(Gtk.GLArea):
         if self.star_image:
             filter_paint = skia.Paint()
             filter_paint.setImageFilter(self.complex_filter)
-            canvas.drawImage(self.star_image, -self.star_width/2, -self.star_height/2, skia.SamplingOptions(), filter_paint)
+            star_texture = self.sprites.get("star", 1.0, self.gr_context)
+            canvas.drawImage(star_texture, -self.star_width/2, -self.star_height/2, skia.SamplingOptions(), filter_paint)
         canvas.restore()
 
         # Draw SVG if available
@@ -260,17 +298,20 @@ class SkiaGLArea(Gtk.GLArea):
         circle.addCircle(width/2, height*0.5, 100)
         paint = skia.Paint()
         paint.setColor(skia.ColorRED)
-        font = skia.Font(skia.Typeface(""), 32)
+        font = get_registry().font("", 32)
         canvas.drawTextOnPath("Skia on GPU + GTK4!", circle, None, font, paint)
 
         canvas.flush()
         self.gr_context.flush()
+        self.scheduler.frame_end()
+        self.schedule()
         return True
 
 class SkiaGTKApp(Gtk.Application):
     def __init__(self):
         super().__init__(application_id="org.example.SkiaGTK4SuperAdvancedGL")
         self.state = None
+        self.area = None
 
     def do_activate(self):
         display = Gdk.Display.get_default()
@@ -284,11 +325,22 @@ class SkiaGTKApp(Gtk.Application):
         window.set_default_size(width//2, height//2)
         area = SkiaGLArea(self.state)
         window.set_child(area)
+
+        def on_window_state(window, pspec):
+            suspended = window.find_property("suspended") and window.get_property("suspended")
+            area.on_window_state(window.is_active(), window.get_visible() and not suspended)
+        window.connect("notify::is-active", on_window_state)
+        window.connect("notify::visible", on_window_state)
+        if window.find_property("suspended"): # GTK 4.12+
+            window.connect("notify::suspended", on_window_state)
+        self.area = area
         window.present()
 
 def main():
     app = SkiaGTKApp()
     app.run(sys.argv)
+    if app.area:
+        print(app.area.scheduler.report_string())
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
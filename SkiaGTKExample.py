@@ -5,8 +5,10 @@ from gi.repository import Gtk, Gdk, GLib
 
 from skia import *
 import random
-import math
 import io
+from sprite_cache import SpriteCache, rasterize_path
+from font_registry import get_registry
+from path_geometry import star
 
 HELP_MESSAGE = "Click and drag to create rects. Press esc to quit."
 
@@ -18,22 +20,7 @@ class ApplicationState:
         self.drag_rect = None
 
 def create_star():
-    kNumPoints = 5
-    path = Path()
-    angle = 2 * math.pi / kNumPoints
-    points = []
-    for i in range(kNumPoints):
-        theta = i * angle - math.pi / 2
-        x = math.cos(theta) * 50
-        y = math.sin(theta) * 50
-        points.append((x, y))
-    path.moveTo(*points[0])
-    for i in range(kNumPoints):
-        idx = (2 * i) % kNumPoints
-        path.lineTo(*points[idx])
-    path.setFillType(PathFillType.kEvenOdd)
-    path.close()
-    return path
+    return star()
 
 class SkiaGTKExample(Gtk.Window):
     def __init__(self):
@@ -41,6 +28,10 @@ class SkiaGTKExample(Gtk.Window):
         self.set_default_size(800, 600)
         self.state = ApplicationState(800, 600)
         self.drawing = False
+        # Built once, not as a Path on every frame; raster only, as this example
+        # has no GrDirectContext to promote it to.
+        self.sprites = SpriteCache()
+        self.sprites.register("star", lambda scale: rasterize_path(create_star(), 100, scale))
 
         self.darea = Gtk.DrawingArea()
         self.darea.set_size_request(self.state.window_width, self.state.window_height)
@@ -70,7 +61,7 @@ class SkiaGTKExample(Gtk.Window):
         # Draw help text
         paint = Paint(AntiAlias=True)
         paint.setColor(ColorBLACK)
-        font = Font()
+        font = get_registry().font()
         canvas.drawString(HELP_MESSAGE, 10, font.getSize() + 10, font, paint)
 
         # Draw rectangles
@@ -88,7 +79,7 @@ class SkiaGTKExample(Gtk.Window):
         canvas.save()
         cx, cy = width // 2, height // 2
         canvas.translate(cx, cy)
-        canvas.drawPath(create_star(), paint)
+        canvas.drawImage(self.sprites.get("star"), -50, -50)
         canvas.restore()
 
         # Export Skia surface as PNG bytes and load into GdkPixbuf for GTK
@@ -5,7 +5,8 @@ from gi.repository import Gtk, Gdk
 
 from skia import *
 import random
-import math
+from font_registry import get_registry
+from path_geometry import star
 
 HELP_MESSAGE = "Click and drag to create rects. Press esc to quit."
 
@@ -17,22 +18,7 @@ class ApplicationState:
         self.drag_rect = None
 
 def create_star():
-    kNumPoints = 5
-    path = Path()
-    angle = 2 * math.pi / kNumPoints
-    points = []
-    for i in range(kNumPoints):
-        theta = i * angle - math.pi / 2
-        x = math.cos(theta) * 50
-        y = math.sin(theta) * 50
-        points.append((x, y))
-    path.moveTo(*points[0])
-    for i in range(kNumPoints):
-        idx = (2 * i) % kNumPoints
-        path.lineTo(*points[idx])
-    path.setFillType(PathFillType.kEvenOdd)
-    path.close()
-    return path
+    return star()
 
 class SkiaGTKExample(Gtk.ApplicationWindow):
     def __init__(self, app):
@@ -74,7 +60,7 @@ class SkiaGTKExample(Gtk.ApplicationWindow):
         # Draw help text
         paint = Paint(AntiAlias=True)
         paint.setColor(ColorBLACK)
-        font = Font()
+        font = get_registry().font()
         canvas.drawString(HELP_MESSAGE, 10, font.getSize() + 10, font, paint)
 
         # Draw rectangles
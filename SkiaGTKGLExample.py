@@ -8,6 +8,8 @@ from OpenGL.GL import *
 import sys
 
 from skia import *
+from font_registry import get_registry
+from path_geometry import star
 
 class ApplicationState:
     def __init__(self, width, height):
@@ -17,20 +19,7 @@ class ApplicationState:
         self.fRects = []
 
 def create_star():
-    kNumPoints = 5
-    concavePath = Path()
-    points = [Point(0, -50)]
-    rot = Matrix()
-    rot.setRotate(360.0 / kNumPoints)
-    for i in range(kNumPoints - 1): # skip 0
-        points.append(rot.mapPoints(points[i:i+1])[0])
-    concavePath.moveTo(points[0])
-    for i in range(kNumPoints):
-        concavePath.lineTo(points[(2 * i) % kNumPoints])
-    concavePath.setFillType(PathFillType.kEvenOdd)
-    assert not concavePath.isConvex()
-    concavePath.close()
-    return concavePath
+    return star()
 
 class SkiaGLArea(Gtk.GLArea):
     def __init__(self):
@@ -129,7 +118,7 @@ class SkiaGLArea(Gtk.GLArea):
         )
         canvas = surface.getCanvas()
         canvas.clear(ColorWHITE)
-        font = Font()
+        font = get_registry().font()
         paint = Paint()
 
         # Draw help message in the top left
@@ -18,6 +18,8 @@ from PyQt5.QtWidgets import QApplication, QMainWindow, QOpenGLWidget
 from PyQt5.QtGui import QOpenGLContext
 from OpenGL.GL import *
 from skia import *
+from path_geometry import star
+from frame_scheduler import FrameScheduler
 
 class ApplicationState:
     def __init__(self, width, height):
@@ -27,20 +29,7 @@ class ApplicationState:
         self.fRects = []
 
 def create_star():
-    kNumPoints = 5
-    concavePath = Path()
-    points = [Point(0, -50)]
-    rot = Matrix()
-    rot.setRotate(360.0 / kNumPoints)
-    for i in range(kNumPoints - 1): # skip 0
-        points.append(rot.mapPoints(points[i:i+1])[0])
-    concavePath.moveTo(points[0])
-    for i in range(kNumPoints):
-        concavePath.lineTo(points[(2 * i) % kNumPoints])
-    concavePath.setFillType(PathFillType.kEvenOdd)
-    assert not concavePath.isConvex()
-    concavePath.close()
-    return concavePath
+    return star()
 
 class SkiaQOpenGLWidget(QOpenGLWidget):
     def __init__(self, parent=None):
@@ -56,9 +45,15 @@ class SkiaQOpenGLWidget(QOpenGLWidget):
         self.grContext = None
         self.surface = None
         self.paint = Paint()
+        # Single-shot timer, re-armed by the scheduler after every frame
+        # instead of a fixed 16ms one
+        self.scheduler = FrameScheduler()
+        self.scheduler.set_animating(True)
         self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
         self.timer.timeout.connect(self.update)
-        self.timer.start(16) # ~60 FPS
+        QApplication.instance().applicationStateChanged.connect(self.on_application_state)
 
     def initializeGL(self):
         glClearColor(1, 1, 1, 1)
@@ -78,6 +73,7 @@ class SkiaQOpenGLWidget(QOpenGLWidget):
         offscreen.flush()
         cpuSurface.flushAndSubmit()
         self.star_image = cpuSurface.makeImageSnapshot()
+        self.scheduler.set_refresh_rate(self.screen().refreshRate())
 
     def resizeGL(self, w, h):
         if (self.grContext is None):
@@ -101,9 +97,28 @@ class SkiaQOpenGLWidget(QOpenGLWidget):
         )
         assert self.surface is not None
 
+    def schedule(self):
+        timeout = self.scheduler.timeout_ms()
+        if timeout is None:
+            self.timer.stop()
+        else:
+            self.timer.start(timeout)
+
+    def request_frame(self):
+        self.scheduler.invalidate()
+        self.schedule()
+
+    def on_application_state(self, state):
+        # Unfocused or hidden: drop to the scheduler's low background rate
+        self.scheduler.set_focused(state == QtCore.Qt.ApplicationState.ApplicationActive)
+        self.scheduler.set_visible(state in (QtCore.Qt.ApplicationState.ApplicationActive,
+                                             QtCore.Qt.ApplicationState.ApplicationInactive))
+        self.schedule()
+
     def paintGL(self):
         if (self.surface is None):
             return
+        self.scheduler.frame_begin()
         canvas = self.surface.getCanvas()
         w, h = self.state.window_width, self.state.window_height
         canvas.clear(ColorWHITE)
@@ -126,12 +141,15 @@ class SkiaQOpenGLWidget(QOpenGLWidget):
         canvas.restore()
         canvas.flush()
         self.surface.flushAndSubmit()
+        self.scheduler.frame_end()
+        self.schedule()
 
     def mousePressEvent(self, event):
         if event.button() == QtCore.Qt.MouseButton.LeftButton:
             rect = Rect.MakeLTRB(event.x(), event.y(), event.x(), event.y())
             self.state.fRects.append(rect)
             self.last_mouse_rect = len(self.state.fRects) - 1
+            self.request_frame()
 
     def mouseMoveEvent(self, event):
         if event.buttons() & QtCore.Qt.MouseButton.LeftButton and self.last_mouse_rect is not None:
@@ -139,6 +157,7 @@ class SkiaQOpenGLWidget(QOpenGLWidget):
             rect.fRight = event.x()
             rect.fBottom = event.y()
             self.state.fRects[self.last_mouse_rect] = rect
+            self.request_frame()
 
     def mouseReleaseEvent(self, event):
         self.last_mouse_rect = None
@@ -165,7 +184,9 @@ def main():
     app = QApplication(sys.argv)
     win = MainWindow()
     win.show()
-    sys.exit(app.exec())
+    ret = app.exec()
+    print(win.widget.scheduler.report_string())
+    sys.exit(ret)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -19,6 +19,9 @@ from PyQt6.QtOpenGLWidgets import QOpenGLWidget
 from PyQt6.QtGui import QOpenGLContext
 from OpenGL.GL import *
 from skia import *
+from frame_scheduler import FrameScheduler
+from sprite_cache import SpriteCache, rasterize_path
+from path_geometry import star
 
 class ApplicationState:
     def __init__(self, width, height):
@@ -28,20 +31,7 @@ class ApplicationState:
         self.fRects = []
 
 def create_star():
-    kNumPoints = 5
-    concavePath = Path()
-    points = [Point(0, -50)]
-    rot = Matrix()
-    rot.setRotate(360.0 / kNumPoints)
-    for i in range(kNumPoints - 1): # skip 0
-        points.append(rot.mapPoints(points[i:i+1])[0])
-    concavePath.moveTo(points[0])
-    for i in range(kNumPoints):
-        concavePath.lineTo(points[(2 * i) % kNumPoints])
-    concavePath.setFillType(PathFillType.kEvenOdd)
-    assert not concavePath.isConvex()
-    concavePath.close()
-    return concavePath
+    return star()
 
 class SkiaQOpenGLWidget(QOpenGLWidget):
     def __init__(self, parent=None):
@@ -51,34 +41,34 @@ class SkiaQOpenGLWidget(QOpenGLWidget):
         self.setFocusPolicy(QtCore.Qt.FocusPolicy.StrongFocus)
         self.helpMessage = "Click and drag to create rects.  Press esc to quit."
         self.rotation = 0
-        self.star_image = None
+        self.sprites = SpriteCache()
+        self.sprites.register("star", lambda scale: rasterize_path(create_star(), 100, scale, Paint()))
         self.last_mouse_rect = None
         self.font = Font()
         self.grContext = None
         self.surface = None
         self.paint = Paint()
+        # Single-shot timer, re-armed by the scheduler after every frame
+        # instead of a fixed 16ms one
+        self.scheduler = FrameScheduler()
+        self.scheduler.set_animating(True)
         self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
         self.timer.timeout.connect(self.update)
-        self.timer.start(16) # ~60 FPS
+        QApplication.instance().applicationStateChanged.connect(self.on_application_state)
 
     def initializeGL(self):
         glClearColor(1, 1, 1, 1)
         glClearStencil(0)
         glClear(GL_COLOR_BUFFER_BIT | GL_STENCIL_BUFFER_BIT)
         # Create Skia GrDirectContext from current OpenGL context
+        if self.grContext is not None:
+            # QOpenGLWidget re-initializes with a new GL context, e.g. when reparented
+            self.sprites.drop_context(self.grContext)
         self.grContext = GrDirectContext.MakeGL()
         assert self.grContext is not None
-
-        # Prepare the star image as an Skia image (offscreen raster surface)
-        cpuSurface = Surface.MakeRaster(ImageInfo.MakeN32Premul(100, 100))
-        offscreen = cpuSurface.getCanvas()
-        offscreen.save()
-        offscreen.translate(50.0, 50.0)
-        offscreen.drawPath(create_star(), Paint())
-        offscreen.restore()
-        offscreen.flush()
-        cpuSurface.flushAndSubmit()
-        self.star_image = cpuSurface.makeImageSnapshot()
+        self.scheduler.set_refresh_rate(self.screen().refreshRate())
 
     def resizeGL(self, w, h):
         if (self.grContext is None):
@@ -102,9 +92,28 @@ class SkiaQOpenGLWidget(QOpenGLWidget):
         )
         assert self.surface is not None
 
+    def schedule(self):
+        timeout = self.scheduler.timeout_ms()
+        if timeout is None:
+            self.timer.stop()
+        else:
+            self.timer.start(timeout)
+
+    def request_frame(self):
+        self.scheduler.invalidate()
+        self.schedule()
+
+    def on_application_state(self, state):
+        # Unfocused or hidden: drop to the scheduler's low background rate
+        self.scheduler.set_focused(state == QtCore.Qt.ApplicationState.ApplicationActive)
+        self.scheduler.set_visible(state in (QtCore.Qt.ApplicationState.ApplicationActive,
+                                             QtCore.Qt.ApplicationState.ApplicationInactive))
+        self.schedule()
+
     def paintGL(self):
         if (self.surface is None):
             return
+        self.scheduler.frame_begin()
         canvas = self.surface.getCanvas()
         w, h = self.state.window_width, self.state.window_height
         canvas.clear(ColorWHITE)
@@ -121,12 +130,13 @@ class SkiaQOpenGLWidget(QOpenGLWidget):
         canvas.translate(w / 2.0, h / 2.0)
         canvas.rotate(self.rotation)
         self.rotation += 1
-        self.paint.setColor(ColorBLACK)
-        canvas.drawPath(create_star(), self.paint)
-        #canvas.drawImage(self.star_image, -50.0, -50.0)
+        # Built once, and uploaded once to this GrDirectContext
+        canvas.drawImage(self.sprites.get("star", 1.0, self.grContext), -50.0, -50.0)
         canvas.restore()
         canvas.flush()
         self.surface.flushAndSubmit()
+        self.scheduler.frame_end()
+        self.schedule()
 
     def mousePressEvent(self, event):
         if event.button() == QtCore.Qt.MouseButton.LeftButton:
@@ -134,6 +144,7 @@ class SkiaQOpenGLWidget(QOpenGLWidget):
             rect = Rect.MakeLTRB(pos.x(), pos.y(), pos.x(), pos.y())
             self.state.fRects.append(rect)
             self.last_mouse_rect = len(self.state.fRects) - 1
+            self.request_frame()
 
     def mouseMoveEvent(self, event):
         if event.buttons() & QtCore.Qt.MouseButton.LeftButton and self.last_mouse_rect is not None:
@@ -142,6 +153,7 @@ class SkiaQOpenGLWidget(QOpenGLWidget):
             rect.fRight = pos.x()
             rect.fBottom = pos.y()
             self.state.fRects[self.last_mouse_rect] = rect
+            self.request_frame()
 
     def mouseReleaseEvent(self, event):
         self.last_mouse_rect = None
@@ -153,6 +165,8 @@ class SkiaQOpenGLWidget(QOpenGLWidget):
     def closeEvent(self, event):
         # Clean up Skia/OpenGL resources if needed
         self.surface = None
+        if self.grContext is not None:
+            self.sprites.drop_context(self.grContext)
         self.grContext = None
         super().closeEvent(event)
 
@@ -168,7 +182,10 @@ def main():
     app = QApplication(sys.argv)
     win = MainWindow()
     win.show()
-    sys.exit(app.exec())
+    ret = app.exec()
+    print(win.widget.scheduler.report_string())
+    print(win.widget.sprites.stats())
+    sys.exit(ret)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
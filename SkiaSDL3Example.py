@@ -24,6 +24,7 @@ import sys
 if not sys.platform.startswith("win"):
     from OpenGL.GLES2.EXT.texture_storage import GL_BGRA8_EXT
 from skia import *
+from path_geometry import star
 
 class ApplicationState:
     def __init__(self, width, height):
@@ -72,21 +73,7 @@ def handle_events(state, canvas):
                 state.fQuit = True
 
 def create_star():
-    kNumPoints = 5
-    concavePath = Path()
-    points = [Point(0, -50)]
-    rot = Matrix()
-    rot.setRotate(360.0 / kNumPoints)
-    for i in range(kNumPoints - 1): # skip 0
-        points.append(rot.mapPoints(points[i:i+1])[0])
-    concavePath.moveTo(points[0])
-    for i in range(kNumPoints):
-        concavePath.lineTo(points[(2 * i) % kNumPoints])
-
-    concavePath.setFillType(PathFillType.kEvenOdd)
-    assert not concavePath.isConvex()
-    concavePath.close()
-    return concavePath
+    return star()
 
 def main(argv):
     SDL_GL_SetAttribute(SDL_GL_CONTEXT_MAJOR_VERSION, 3)
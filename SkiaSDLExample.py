@@ -28,6 +28,9 @@ if not sys.platform.startswith("win"):
 from skia import *
 
 from sdl2.ext import get_events
+from frame_scheduler import FrameScheduler
+from sprite_cache import SpriteCache, rasterize_path
+from path_geometry import star
 
 class ApplicationState:
     def __init__(self, width, height):
@@ -42,16 +45,18 @@ def handle_error():
     SDL_ClearError()
 
 
-def handle_events(state, canvas):
+def handle_events(state, canvas, scheduler):
     for event in get_events():
         if event.type == SDL_MOUSEMOTION:
             if event.motion.state == SDL_PRESSED:
+                scheduler.invalidate()
                 rect = state.fRects.pop()
                 rect.fRight = event.motion.x
                 rect.fBottom = event.motion.y
                 state.fRects.append(rect)
         if event.type == SDL_MOUSEBUTTONDOWN:
             if event.button.state == SDL_PRESSED:
+                scheduler.invalidate()
                 state.fRects.append(Rect.MakeLTRB(event.button.x,
                                                     event.button.y,
                                                     event.button.x,
@@ -68,6 +73,20 @@ def handle_events(state, canvas):
                 event.window.event == SDL_WINDOWEVENT_RESIZED):
                 state.window_width = event.window.data1
                 state.window_height = event.window.data2
+                scheduler.invalidate()
+            # Unfocused or hidden: drop to the scheduler's low background rate
+            if event.window.event == SDL_WINDOWEVENT_FOCUS_GAINED:
+                scheduler.set_focused(True)
+            if event.window.event == SDL_WINDOWEVENT_FOCUS_LOST:
+                scheduler.set_focused(False)
+            if (event.window.event == SDL_WINDOWEVENT_SHOWN or
+                event.window.event == SDL_WINDOWEVENT_RESTORED):
+                scheduler.set_visible(True)
+            if (event.window.event == SDL_WINDOWEVENT_HIDDEN or
+                event.window.event == SDL_WINDOWEVENT_MINIMIZED):
+                scheduler.set_visible(False)
+            if event.window.event == SDL_WINDOWEVENT_EXPOSED:
+                scheduler.invalidate()
         if event.type ==  SDL_KEYDOWN:
             if event.key.keysym.sym == SDLK_ESCAPE:
                 state.fQuit = True
@@ -75,21 +94,7 @@ def handle_events(state, canvas):
                 state.fQuit = True
 
 def create_star():
-    kNumPoints = 5
-    concavePath = Path()
-    points = [Point(0, -50)]
-    rot = Matrix()
-    rot.setRotate(360.0 / kNumPoints)
-    for i in range(kNumPoints - 1): # skip 0
-        points.append(rot.mapPoints(points[i:i+1])[0])
-    concavePath.moveTo(points[0])
-    for i in range(kNumPoints):
-        concavePath.lineTo(points[(2 * i) % kNumPoints])
-
-    concavePath.setFillType(PathFillType.kEvenOdd)
-    assert not concavePath.isConvex()
-    concavePath.close()
-    return concavePath
+    return star()
 
 def main(argv):
     SDL_GL_SetAttribute(SDL_GL_CONTEXT_MAJOR_VERSION, 3)
@@ -191,23 +196,35 @@ def main(argv):
 
     paint = Paint()
 
-    cpuSurface = Surface.MakeRaster(canvas.imageInfo())
+    # The star is rasterized once, and uploaded once as a texture to grContext,
+    # instead of drawing a (window-sized) raster image to the GPU surface every frame.
+    sprites = SpriteCache()
+    sprites.register("star", lambda scale: rasterize_path(create_star(), 100, scale, Paint()))
 
-    offscreen = cpuSurface.getCanvas()
-    offscreen.save()
-    offscreen.translate(50.0, 50.0)
-    offscreen.drawPath(create_star(), paint)
-    offscreen.restore()
-
-    image = cpuSurface.makeImageSnapshot()
+    # With a blocking swap (vsync) the loop is paced by the display;
+    # otherwise the scheduler aligns frames to the display mode refresh rate.
+    vsync = (SDL_GL_SetSwapInterval(1) == 0)
+    scheduler = FrameScheduler(refresh_rate=dm.refresh_rate, vsync=vsync)
+    scheduler.set_animating(True)
 
     rotation = 0
     font = Font()
     import random
     while not state.fQuit:
+        # Sleep until the next frame is due - or, when nothing animates,
+        # until the next input event - instead of polling without pause.
+        timeout = scheduler.timeout_ms()
+        if timeout is None:
+            SDL_WaitEvent(None)
+        elif timeout > 0:
+            SDL_WaitEventTimeout(None, timeout)
+        handle_events(state, canvas, scheduler)
+        if state.fQuit or not scheduler.frame_due():
+            continue
+        scheduler.frame_begin()
+
         random.seed(0)
         canvas.clear(ColorWHITE)
-        handle_events(state, canvas)
 
         paint.setColor(ColorBLACK)
         canvas.translate(0, dh.value - state.window_height)
@@ -221,12 +238,16 @@ def main(argv):
         canvas.translate(state.window_width / 2.0, dh.value - state.window_height / 2.0)
         canvas.rotate(rotation)
         rotation+=1
-        canvas.drawImage(image, -50.0, -50.0)
+        canvas.drawImage(sprites.get("star", 1.0, grContext), -50.0, -50.0)
         canvas.restore()
 
         canvas.flush()
 
         SDL_GL_SwapWindow(window)
+        scheduler.frame_end()
+
+    print(scheduler.report_string())
+    print(sprites.stats())
 
     if glContext:
         SDL_GL_DeleteContext(glContext)
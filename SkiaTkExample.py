@@ -1,9 +1,11 @@
 import tkinter as tk
 from skia import *
-import math
 import random
+from frame_scheduler import FrameScheduler
+from input_coalescer import MouseCoalescer, PRESS, RELEASE
+from path_geometry import star
 
-HELP_MESSAGE = "Click and drag to create rects.  Press esc to quit."
+HELP_MESSAGE = "Click and drag to create rects.  Space pauses.  Press esc to quit."
 
 class ApplicationState:
     def __init__(self, width, height):
@@ -16,22 +18,7 @@ class ApplicationState:
         self.animating = False
 
 def create_star():
-    kNumPoints = 5
-    path = Path()
-    angle = 2 * math.pi / kNumPoints
-    points = []
-    for i in range(kNumPoints):
-        theta = i * angle - math.pi / 2
-        x = math.cos(theta) * 50
-        y = math.sin(theta) * 50
-        points.append((x, y))
-    path.moveTo(*points[0])
-    for i in range(kNumPoints):
-        idx = (2 * i) % kNumPoints
-        path.lineTo(*points[idx])
-    path.setFillType(PathFillType.kEvenOdd)
-    path.close()
-    return path
+    return star()
 
 class SkiaTkApp:
     def __init__(self, root):
@@ -50,12 +37,17 @@ class SkiaTkApp:
         self.canvas.bind("<B1-Motion>", self.on_mouse_drag)
         self.canvas.bind("<ButtonRelease-1>", self.on_mouse_up)
         self.root.bind("<Escape>", self.quit)
+        self.root.bind("<space>", self.toggle_animation)
         self.root.bind("<Configure>", self.on_resize)
         self.root.bind('<FocusIn>', self.on_focus_in)
         self.root.bind('<FocusOut>', self.on_focus_out)
+        self.root.bind('<Map>', self.on_map)
+        self.root.bind('<Unmap>', self.on_unmap)
         self.tk_image = None
         self.animation_id = None
         self.is_focused = True
+        self.scheduler = FrameScheduler()
+        self.mouse = MouseCoalescer()
         self.draw()
 
     def make_star_image(self):
@@ -69,24 +61,40 @@ class SkiaTkApp:
         c.restore()
         return img_surface.makeImageSnapshot()
 
+    # The mouse handlers only record the event; apply_mouse_events() applies
+    # them, coalesced, once per frame.
     def on_mouse_down(self, event):
-        self.state.drag_rect = Rect.MakeLTRB(event.x, event.y, event.x, event.y)
-        self.state.fRects.append(self.state.drag_rect)
-        self.draw()
+        self.mouse.press(event.x, event.y)
+        self.request_frame()
 
     def on_mouse_drag(self, event):
-        if self.state.drag_rect:
-            self.state.drag_rect.fRight = event.x
-            self.state.drag_rect.fBottom = event.y
-            self.draw()
+        self.mouse.motion(event.x, event.y)
+        self.request_frame()
 
     def on_mouse_up(self, event):
-        self.state.drag_rect = None
-        self.draw()
+        self.mouse.release(event.x, event.y)
+        self.request_frame()
+
+    def apply_mouse_events(self):
+        for kind, button, x, y in self.mouse.take():
+            if kind == PRESS:
+                self.state.drag_rect = Rect.MakeLTRB(x, y, x, y)
+                self.state.fRects.append(self.state.drag_rect)
+            elif self.state.drag_rect:
+                self.state.drag_rect.fRight = x
+                self.state.drag_rect.fBottom = y
+                if kind == RELEASE:
+                    self.state.drag_rect = None
+
+    def request_frame(self):
+        self.scheduler.invalidate()
+        self.schedule()
 
     def quit(self, event=None):
         self.state.fQuit = True
         self.stop_animation()
+        print(self.scheduler.report_string())
+        print(self.mouse.stats())
         self.root.destroy()
 
     def on_resize(self, event):
@@ -100,30 +108,64 @@ class SkiaTkApp:
 
     def on_focus_in(self, event):
         self.is_focused = True
-        self.start_animation()
+        self.scheduler.set_focused(True)
+        self.schedule()
 
     def on_focus_out(self, event):
+        # Keep animating, but at the scheduler's low background rate
         self.is_focused = False
-        self.stop_animation()
+        self.scheduler.set_focused(False)
+        self.schedule()
+
+    def on_map(self, event):
+        self.scheduler.set_visible(True)
+        self.schedule()
+
+    def on_unmap(self, event):
+        self.scheduler.set_visible(False)
+        self.schedule()
+
+    def toggle_animation(self, event=None):
+        if self.state.animating:
+            self.stop_animation()
+        else:
+            self.start_animation()
 
     def start_animation(self):
-        if self.animation_id is None and self.is_focused:
-            self.animation_id = self.root.after(16, self.animate)
-            self.state.animating = True
+        self.state.animating = True
+        self.scheduler.set_animating(True)
+        self.schedule()
 
     def stop_animation(self):
         if self.animation_id is not None:
             self.root.after_cancel(self.animation_id)
             self.animation_id = None
         self.state.animating = False
+        self.scheduler.set_animating(False)
+
+    def schedule(self):
+        # (Re-)arm the single pending timer; with nothing animating there is
+        # none, and tkinter's mainloop sleeps until the next input event.
+        if self.animation_id is not None:
+            self.root.after_cancel(self.animation_id)
+            self.animation_id = None
+        if self.state.fQuit:
+            return
+        timeout = self.scheduler.timeout_ms()
+        if timeout is not None:
+            self.animation_id = self.root.after(timeout, self.animate)
 
     def animate(self):
-        if not self.state.fQuit and self.is_focused:
+        self.animation_id = None
+        if self.state.fQuit:
+            return
+        self.scheduler.frame_begin()
+        self.apply_mouse_events()
+        if self.state.animating:
             self.state.rotation = (self.state.rotation + 1) % 360
-            self.draw()
-            self.animation_id = self.root.after(16, self.animate)
-        else:
-            self.stop_animation()
+        self.draw()
+        self.scheduler.frame_end()
+        self.schedule()
 
     def draw(self):
         # Clear
@@ -9,6 +9,7 @@
 import wx
 import random
 from skia import *
+from path_geometry import star
 
 class ApplicationState:
     def __init__(self, width, height):
@@ -18,19 +19,7 @@ class ApplicationState:
         self.fRects = []
 
 def create_star():
-    kNumPoints = 5
-    concavePath = Path()
-    points = [Point(0, -50)]
-    rot = Matrix()
-    rot.setRotate(360.0 / kNumPoints)
-    for i in range(kNumPoints - 1): # skip 0
-        points.append(rot.mapPoints(points[i:i+1])[0])
-    concavePath.moveTo(points[0])
-    for i in range(kNumPoints):
-        concavePath.lineTo(points[(2 * i) % kNumPoints])
-    concavePath.setFillType(PathFillType.kEvenOdd)
-    concavePath.close()
-    return concavePath
+    return star()
 
 class SkiaPanel(wx.Panel):
     def __init__(self, parent):
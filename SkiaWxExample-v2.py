@@ -10,6 +10,8 @@ import wx
 import sys
 from skia import *
 import numpy as np
+from frame_scheduler import FrameScheduler
+from path_geometry import star
 
 class ApplicationState:
     def __init__(self, width, height):
@@ -19,20 +21,7 @@ class ApplicationState:
         self.fRects = []
 
 def create_star():
-    kNumPoints = 5
-    concavePath = Path()
-    points = [Point(0, -50)]
-    rot = Matrix()
-    rot.setRotate(360.0 / kNumPoints)
-    for i in range(kNumPoints - 1):  # skip 0
-        points.append(rot.mapPoints(points[i:i+1])[0])
-    concavePath.moveTo(points[0])
-    for i in range(kNumPoints):
-        concavePath.lineTo(points[(2 * i) % kNumPoints])
-    concavePath.setFillType(PathFillType.kEvenOdd)
-    assert not concavePath.isConvex()
-    concavePath.close()
-    return concavePath
+    return star()
 
 class SkiaPanel(wx.Panel):
     def __init__(self, parent):
@@ -51,6 +40,10 @@ class SkiaPanel(wx.Panel):
         self.Bind(wx.EVT_MOTION, self.OnMouseMove)
         self.Bind(wx.EVT_SIZE, self.OnResize)
         self.Bind(wx.EVT_CHAR_HOOK, self.OnKeyDown)
+        self.Bind(wx.EVT_TIMER, self.OnTimer)
+        self.timer = wx.Timer(self)
+        self.scheduler = FrameScheduler(refresh_rate=wx.Display().GetCurrentMode().refresh)
+        self.scheduler.set_animating(True)
         self.dragging = False
         self.last_rect = None
         self.generate_star_image()
@@ -74,7 +67,24 @@ class SkiaPanel(wx.Panel):
         self.Refresh()
         event.Skip()
 
+    def Schedule(self):
+        # One pending single-shot timer at most; none at all when idle,
+        # so the event loop sleeps until the next input event.
+        timeout = self.scheduler.timeout_ms()
+        if timeout is None:
+            self.timer.Stop()
+        else:
+            self.timer.StartOnce(max(1, timeout))
+
+    def RequestFrame(self):
+        self.scheduler.invalidate()
+        self.Schedule()
+
+    def OnTimer(self, event):
+        self.Refresh(False)
+
     def OnPaint(self, event):
+        self.scheduler.frame_begin()
         w, h = self.GetClientSize()
         info = ImageInfo.MakeN32Premul(w, h)
         surface = Surface.MakeRaster(info)
@@ -118,7 +128,8 @@ class SkiaPanel(wx.Panel):
             dc.Clear()
 
         # Schedule next frame for animation
-        self.Refresh(False)
+        self.scheduler.frame_end()
+        self.Schedule()
 
     def OnMouseDown(self, event):
         if event.LeftDown():
@@ -127,6 +138,7 @@ class SkiaPanel(wx.Panel):
             self.state.fRects.append(rect)
             self.last_rect = rect
             self.dragging = True
+            self.RequestFrame()
 
     def OnMouseUp(self, event):
         if self.dragging:
@@ -137,6 +149,7 @@ class SkiaPanel(wx.Panel):
                 self.state.fRects.append(rect)
             self.dragging = False
             self.last_rect = None
+            self.RequestFrame()
 
     def OnMouseMove(self, event):
         if self.dragging and event.Dragging() and event.LeftIsDown():
@@ -145,6 +158,7 @@ class SkiaPanel(wx.Panel):
                 self.state.fRects.pop()
                 rect = Rect.MakeLTRB(self.last_rect.left(), self.last_rect.top(), x, y)
                 self.state.fRects.append(rect)
+                self.RequestFrame()
 
     def OnKeyDown(self, event):
         keycode = event.GetKeyCode()
@@ -157,8 +171,27 @@ class SkiaFrame(wx.Frame):
     def __init__(self):
         wx.Frame.__init__(self, None, title="Skia + wxPython Example", size=(800, 600))
         self.panel = SkiaPanel(self)
+        self.Bind(wx.EVT_ACTIVATE, self.OnActivate)
+        self.Bind(wx.EVT_ICONIZE, self.OnIconize)
+        self.Bind(wx.EVT_CLOSE, self.OnClose)
         self.Show()
 
+    def OnActivate(self, event):
+        # Unfocused: drop to the scheduler's low background rate
+        self.panel.scheduler.set_focused(event.GetActive())
+        self.panel.Schedule()
+        event.Skip()
+
+    def OnIconize(self, event):
+        self.panel.scheduler.set_visible(not event.IsIconized())
+        self.panel.Schedule()
+        event.Skip()
+
+    def OnClose(self, event):
+        self.panel.timer.Stop()
+        print(self.panel.scheduler.report_string())
+        event.Skip()
+
 class SkiaApp(wx.App):
     def OnInit(self):
         self.frame = SkiaFrame()
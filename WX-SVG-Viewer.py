@@ -9,11 +9,18 @@
 #     to https://github.com/kyamagu/skia-python/issues/323
 
 # python imports
+import io
 import math
 import ctypes
 # pip imports
 import wx
 import wx.svg
+# local imports
+from async_loader import AsyncLoader
+from thumbnail_cache import ThumbnailCache, fit_transform, hash_file
+from svg_hot_reload import FileWatcher
+
+THUMBNAIL_SIZE = 256
 
 
 """Enable high-res displays."""
@@ -39,6 +46,7 @@ class CPUCanvas(wx.Panel):
         self.zoom = 1.0
 
         self.svg_picture = None
+        self.preview_bitmap = None # cached thumbnail, shown while the document loads
         self.img_scale_enum = 0
         self.img_zoom = 1.0
 
@@ -122,7 +130,12 @@ class CPUCanvas(wx.Panel):
         dc.Clear()
 
         dcdim = min(self.Size.width, self.Size.height)
-        if (self.svg_picture):
+        if self.preview_bitmap is not None:
+            bw, bh = self.preview_bitmap.GetWidth(), self.preview_bitmap.GetHeight()
+            scale, dx, dy = fit_transform(bw, bh, w, h)
+            ctx = wx.GraphicsContext.Create(dc)
+            ctx.DrawBitmap(self.preview_bitmap, dx, dy, scale * bw, scale * bh)
+        elif (self.svg_picture):
             assert dc.CanUseTransformMatrix() == True
             m = wx.AffineMatrix2D()
             m.Translate(w / 2, h / 2)
@@ -157,16 +170,42 @@ class CPUCanvas(wx.Panel):
 class MainFrame(wx.Frame):
     def __init__(self):
         super().__init__(None, title="Wx CPU Canvas", size=(800, 600))
-        panel = wx.Panel(self)
+        self.panel = panel = wx.Panel(self)
         sizer = wx.BoxSizer(wx.VERTICAL)
 
+        top_sizer = wx.BoxSizer(wx.HORIZONTAL)
         open_button = wx.Button(panel, label='Open File')
         open_button.Bind(wx.EVT_BUTTON, self.on_open_file)
-        sizer.Add(open_button, flag=wx.ALIGN_CENTER | wx.BOTTOM, border=10)
+        top_sizer.Add(open_button, flag=wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, border=10)
+        self.progress = wx.Gauge(panel, range=100, size=(200, -1))
+        self.progress.Hide()
+        top_sizer.Add(self.progress, flag=wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, border=10)
+        self.watch_box = wx.CheckBox(panel, label='Watch file')
+        top_sizer.Add(self.watch_box, flag=wx.ALIGN_CENTER_VERTICAL)
+        sizer.Add(top_sizer, flag=wx.ALIGN_CENTER | wx.BOTTOM, border=10)
 
         self.canvas = CPUCanvas(panel, (800, 600))
         sizer.Add(self.canvas, 1, wx.EXPAND)
         panel.SetSizer(sizer)
+        self.CreateStatusBar()
+
+        # SVG files are parsed on a worker thread (nanosvg images cannot be
+        # passed between processes); the canvas keeps drawing the previous
+        # document until the new one is ready.
+        self.loader = AsyncLoader(wx.CallAfter)
+        # Thumbnails from earlier sessions show instantly while a file loads;
+        # these are rasterized by nanosvg, so kept apart from the skia viewers'
+        self.thumbnails = ThumbnailCache(engine="nanosvg")
+        self.has_thumbnail = False
+        # Watch mode: reparse the file in the background when it changes, and
+        # swap it in when ready (nanosvg renders the whole document on every
+        # paint, so there are no tiles to keep)
+        self.watcher = None
+        self.watch_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_watch_timer, self.watch_timer)
+        self.pulse_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, lambda event: self.progress.Pulse(), self.pulse_timer)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
         self.Show()
 
     def on_open_file(self, event):
@@ -178,12 +217,91 @@ class MainFrame(wx.Frame):
 
             # Proceed loading the file chosen by the user
             path = fileDialog.GetPath()
-            try:
-                self.canvas.svg_picture = wx.svg.SVGimage.CreateFromFile(path)
-                self.canvas.Refresh()
-                self.canvas.SetFocus()
-            except Exception as e:
-                wx.LogError(f"Cannot open file '{path}'.\n{str(e)}")
+            self.SetStatusText(f"Loading '{path}'...")
+            self.show_progress(True)
+            self.show_thumbnail(path)
+            self.loader.load(self.load_svg, path,
+                             on_done=lambda result: self.on_loaded(path, *result),
+                             on_error=lambda e: self.on_load_error(path, e))
+
+    def show_progress(self, show):
+        if show:
+            self.pulse_timer.Start(50)
+        else:
+            self.pulse_timer.Stop()
+        self.progress.Show(show)
+        self.panel.Layout()
+
+    def load_svg(self, path):
+        """Worker thread: parse, and hash the file for the thumbnail cache while at it.
+
+        Only the hash is made here; the cache index belongs to the UI thread (on_loaded)."""
+        svg = wx.svg.SVGimage.CreateFromFile(path)
+        return svg, hash_file(path)
+
+    def show_thumbnail(self, path):
+        # Only a lookup: hashing a large file here would be the very freeze avoided by loading asynchronously
+        try:
+            data = self.thumbnails.lookup(path, THUMBNAIL_SIZE, THUMBNAIL_SIZE, compute=False)
+        except OSError:
+            data = None
+        self.has_thumbnail = data is not None
+        if data is not None:
+            self.canvas.preview_bitmap = wx.Bitmap(wx.Image(io.BytesIO(data)))
+            self.canvas.Refresh()
+
+    def store_thumbnail(self, path, svg):
+        # nanosvg rasterizes a small bitmap quickly; the file digest is already known
+        bitmap = svg.ConvertToScaledBitmap(wx.Size(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        stream = io.BytesIO()
+        bitmap.ConvertToImage().SaveFile(stream, wx.BITMAP_TYPE_PNG)
+        self.thumbnails.store(path, THUMBNAIL_SIZE, THUMBNAIL_SIZE, stream.getvalue())
+
+    def on_loaded(self, path, svg, stamp):
+        self.show_progress(False)
+        self.thumbnails.remember_digest(path, stamp)
+        self.SetStatusText(f"'{path}'")
+        self.canvas.preview_bitmap = None
+        self.canvas.svg_picture = svg
+        if not self.has_thumbnail:
+            self.store_thumbnail(path, svg)
+        self.canvas.Refresh()
+        self.canvas.SetFocus()
+        if self.watcher is None or self.watcher.path != path:
+            self.watcher = FileWatcher(path)
+            self.watch_timer.Start(int(self.watcher.interval * 1000))
+
+    def on_watch_timer(self, event):
+        if not self.watch_box.GetValue() or self.loader.busy():
+            return
+        if self.watcher.poll():
+            path = self.watcher.path
+            self.SetStatusText(f"Reloading '{path}'...")
+            self.loader.load(wx.svg.SVGimage.CreateFromFile, path,
+                             on_done=lambda svg: self.on_reloaded(path, svg),
+                             on_error=lambda e: self.SetStatusText(f"Reloading '{path}' failed: {e}"))
+
+    def on_reloaded(self, path, svg):
+        self.SetStatusText(f"'{path}' reloaded")
+        self.canvas.svg_picture = svg
+        self.canvas.Refresh()
+        self.canvas.SetFocus()
+
+    def on_load_error(self, path, e):
+        self.show_progress(False)
+        self.canvas.preview_bitmap = None
+        self.canvas.Refresh()
+        self.SetStatusText("")
+        wx.LogError(f"Cannot open file '{path}'.\n{str(e)}")
+
+    def on_close(self, event):
+        self.pulse_timer.Stop()
+        self.watch_timer.Stop()
+        print(self.loader.stats())
+        print(self.thumbnails.stats())
+        self.thumbnails.flush()
+        self.loader.shutdown()
+        event.Skip()
 
 if __name__ == "__main__":
     app = wx.App(False)
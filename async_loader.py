@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Asynchronous document loading, off the UI thread.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  Parsing a large SVG in a button handler freezes the window. AsyncLoader
+#  runs the loading function on a worker thread or process instead, and
+#  hands the result back on the UI thread (through e.g. wx.CallAfter), so
+#  the viewer keeps drawing the previous document until the new one is
+#  ready. Only the latest request matters: opening another file cancels an
+#  older load that has not started yet, and discards the result of one
+#  that has.
+#
+#  skia.SVGDOM objects cannot cross a process boundary, but a recorded
+#  skia.Picture can, serialized: record_svg_file() parses and records in
+#  a worker process, and picture_from_bytes() turns the result back into
+#  a Picture in the UI process.
+#
+#  Usage:
+#
+#      loader = AsyncLoader(wx.CallAfter, ProcessPoolExecutor(max_workers=1))
+#      loader.load(record_svg_file, path, on_done=..., on_error=...)
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class AsyncLoader:
+    def __init__(self, call_in_ui, executor=None):
+        self.call_in_ui = call_in_ui
+        self.executor = executor if executor is not None else ThreadPoolExecutor(max_workers=1)
+        self.generation = 0
+        self.pending = None
+        self.cancelled = 0
+        self.discarded = 0
+
+    def load(self, fn, *args, on_done, on_error):
+        """Run fn(*args) on the worker; on_done(result) or on_error(exception) on the UI thread."""
+        self.generation += 1
+        generation = self.generation
+        if self.pending is not None and self.pending.cancel():
+            self.cancelled += 1
+        future = self.executor.submit(fn, *args)
+        self.pending = future
+        future.add_done_callback(
+            lambda f: self.call_in_ui(self._finished, generation, f, on_done, on_error))
+
+    def _finished(self, generation, future, on_done, on_error):
+        if future.cancelled():
+            return
+        if generation != self.generation:
+            # Superseded by a later load
+            self.discarded += 1
+            return
+        self.pending = None
+        error = future.exception()
+        if error is not None:
+            on_error(error)
+        else:
+            on_done(future.result())
+
+    def busy(self):
+        return self.pending is not None
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        return ("loads: %d requested, %d cancelled before starting, %d superseded" %
+                (self.generation, self.cancelled, self.discarded))
+
+def record_svg_file(path):
+    """Worker side: parse an SVG file and record it; returns picture bytes, size and timings."""
+    import skia
+    from mapped_input import load_svg
+    start = time.perf_counter()
+    dom = load_svg(path)
+    if dom is None:
+        raise ValueError("not a valid SVG file")
+    parsed = time.perf_counter()
+    size = dom.containerSize()
+    recorder = skia.PictureRecorder()
+    canvas = recorder.beginRecording(skia.Rect.MakeWH(size.width(), size.height()))
+    dom.render(canvas)
+    data = recorder.finishRecordingAsPicture().serialize().bytes()
+    recorded = time.perf_counter()
+    return data, (size.width(), size.height()), (parsed - start, recorded - parsed)
+
+def picture_from_bytes(data):
+    """UI side: the Picture recorded by record_svg_file()."""
+    import skia
+    return skia.Picture.MakeFromData(skia.Data.MakeWithCopy(data))
@@ -1,7 +1,8 @@
 # Requires at least skia-python m138.
 
 from skia import *
-from math import sin
+import numpy as np
+from path_geometry import function_path
 
 W = 800
 H = 400
@@ -9,13 +10,7 @@ surface = Surface(W, H)
 #canvas = surface.getCanvas();
 #canvas.clear(ColorWHITE);
 
-myPath = Path()
-myPath.moveTo(60, 200)
-x = 60
-while (x <= 740):
-    y = 200 + 60 * sin(2 * 3.14159 * (x-60) / 350)
-    myPath.lineTo(x, y)
-    x += 10
+myPath = function_path(lambda x: 200 + 60 * np.sin(2 * 3.14159 * (x-60) / 350), np.arange(60, 741, 10))
 
 pathPaint = Paint()
 pathPaint.setAntiAlias(True)
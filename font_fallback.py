@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Persistent font fallback cache for mixed-script text.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  When a paragraph contains characters its font families do not cover
+#  (Arabic, Devanagari, emoji in a Latin paragraph), skia.textlayout asks the
+#  platform font manager for a fallback, per run - with fontconfig, a costly
+#  font sort, on every cold start. Instead, this remembers which family was
+#  chosen for each (script, style), across runs, in a small JSON file, and
+#  lists those families explicitly in the TextStyle, so textlayout finds
+#  them by name. (Its own fallback stays enabled, as the safety net for a
+#  remembered font since uninstalled, or a script not seen before.)
+#
+#  Known-good fonts can be pinned per script; pinned choices are never
+#  replaced by matching.
+#
+#  Scripts are told apart by Unicode block; characters outside the listed
+#  blocks are keyed by their 128-codepoint block.
+#
+#  Usage:
+#
+#      fallback = get_fallback_cache()
+#      fallback.pin("Arabic", "Noto Naskh Arabic")
+#      style.setFontFamilies(fallback.families_for(text, ["times", "serif"]))
+
+import os
+import json
+import time
+import bisect
+
+import skia
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "skia-python-examples", "font-fallback.json")
+
+# (first, last, script), sorted; the base families are assumed to cover "Latin"
+SCRIPT_BLOCKS = [
+    (0x0000, 0x024F, "Latin"),
+    (0x0300, 0x036F, "Latin"), # combining marks
+    (0x0370, 0x03FF, "Greek"),
+    (0x0400, 0x052F, "Cyrillic"),
+    (0x0590, 0x05FF, "Hebrew"),
+    (0x0600, 0x06FF, "Arabic"),
+    (0x0750, 0x077F, "Arabic"),
+    (0x0900, 0x097F, "Devanagari"),
+    (0x0980, 0x09FF, "Bengali"),
+    (0x0A00, 0x0A7F, "Gurmukhi"),
+    (0x0A80, 0x0AFF, "Gujarati"),
+    (0x0B80, 0x0BFF, "Tamil"),
+    (0x0E00, 0x0E7F, "Thai"),
+    (0x10A0, 0x10FF, "Georgian"),
+    (0x1100, 0x11FF, "Hangul"),
+    (0x1E00, 0x1EFF, "Latin"),
+    (0x2000, 0x206F, "Latin"), # general punctuation
+    (0x3040, 0x30FF, "Kana"),
+    (0x3400, 0x4DBF, "Han"),
+    (0x4E00, 0x9FFF, "Han"),
+    (0xAC00, 0xD7AF, "Hangul"),
+    (0xFB50, 0xFDFF, "Arabic"),
+    (0xFE70, 0xFEFF, "Arabic"),
+    (0x1F300, 0x1FAFF, "Emoji"),
+]
+_BLOCK_STARTS = [first for first, last, script in SCRIPT_BLOCKS]
+
+def script_of(codepoint):
+    i = bisect.bisect_right(_BLOCK_STARTS, codepoint) - 1
+    if i >= 0 and codepoint <= SCRIPT_BLOCKS[i][1]:
+        return SCRIPT_BLOCKS[i][2]
+    return "U+%04X" % (codepoint & ~0x7F)
+
+def style_key(style):
+    return "%d,%d,%d" % (style.weight(), style.width(), int(style.slant()))
+
+class FallbackCache:
+    def __init__(self, font_mgr, path=DEFAULT_PATH):
+        self.font_mgr = font_mgr
+        self.path = path
+        self.entries = self._load()
+        self.dirty = False
+        self.unmatched = set() # keys with no fallback, this run only: a font installed later is found
+        self.hits = 0
+        self.misses = 0
+        self.match_time = 0.0
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Misses written by older versions: matched again, in case a font was installed since
+        return {key: entry for key, entry in entries.items() if entry.get("family") is not None}
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = "%s.%d.tmp" % (self.path, os.getpid())
+        with open(tmp, "w") as f:
+            json.dump(self.entries, f, indent=1, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    def pin(self, script, family, style=None):
+        """Always use family for script (in style, or any style)."""
+        key = script if style is None else "%s|%s" % (script, style_key(style))
+        self.entries[key] = {"family": family, "pinned": True}
+        self.dirty = True
+
+    def family(self, codepoint, style):
+        """The fallback family for codepoint's script in style, or None if there is none."""
+        script = script_of(codepoint)
+        key = "%s|%s" % (script, style_key(style))
+        entry = self.entries.get(key)
+        pinned = self.entries.get(script)
+        if pinned is not None and (entry is None or not entry["pinned"]):
+            # A script-wide pin wins over a style's matched choice
+            entry = pinned
+        if entry is not None:
+            self.hits += 1
+            return entry["family"]
+        if key in self.unmatched:
+            self.hits += 1
+            return None
+        self.misses += 1
+        start = time.perf_counter()
+        typeface = self.font_mgr.matchFamilyStyleCharacter("", style, [], codepoint)
+        self.match_time += time.perf_counter() - start
+        if typeface is None:
+            self.unmatched.add(key)
+            return None
+        family = typeface.getFamilyName()
+        self.entries[key] = {"family": family, "pinned": False}
+        self.dirty = True
+        return family
+
+    def families_for(self, text, base_families, style=None):
+        """base_families, followed by the fallback families for the other scripts in text."""
+        if style is None:
+            style = skia.FontStyle()
+        families = list(base_families)
+        seen = {"Latin"}
+        for ch in text:
+            script = script_of(ord(ch))
+            if script in seen:
+                continue
+            seen.add(script)
+            family = self.family(ord(ch), style)
+            if family is not None and family not in families:
+                families.append(family)
+        if self.dirty:
+            self.save()
+        return families
+
+    def stats(self):
+        return ("font fallback: %d hits, %d matched (%.1f ms), %d remembered" %
+                (self.hits, self.misses, 1000 * self.match_time, len(self.entries)))
+
+_cache = None
+
+def get_fallback_cache():
+    """The process-wide FallbackCache, on text_services' font manager."""
+    global _cache
+    if _cache is None:
+        import text_services
+        _cache = FallbackCache(text_services.font_mgr())
+    return _cache
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Process-wide typeface and font cache for the drawing helpers.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  skia.Typeface('Arial', FontStyle.Bold()) asks the platform font manager
+#  (fontconfig, DirectWrite, CoreText) to match the family and style every
+#  time - which, inside a draw function, is every frame. Here each (family,
+#  style) is matched once through the FontMgr, the Typeface is interned, and
+#  Font objects are cached by typeface and size. warm_up() matches the fonts
+#  an application will need on a background thread at startup.
+#
+#  Fonts handed out are shared: do not call setSize() etc. on them - ask for
+#  another size instead.
+#
+#  family=None means the default typeface (as skia.Font() uses), which needs
+#  no matching at all.
+#
+#  Usage:
+#
+#      from font_registry import get_registry
+#      fonts = get_registry()
+#      fonts.warm_up([("Arial", skia.FontStyle.Bold())])
+#      ... in a draw function:
+#      font = fonts.font("Arial", 14, skia.FontStyle.Bold())
+
+import time
+import threading
+
+import skia
+
+def style_key(style):
+    return (style.weight(), style.width(), int(style.slant()))
+
+class FontRegistry:
+    def __init__(self, font_mgr=None):
+        self.font_mgr = font_mgr if font_mgr is not None else skia.FontMgr()
+        self.lock = threading.Lock()
+        self.typefaces = {}
+        self.fonts = {}
+        self.matches = 0
+        self.match_time = 0.0
+        self.warm_up_time = 0.0
+        self.hits = 0
+
+    def typeface(self, family=None, style=None):
+        """The interned Typeface for family and style, matched on first use."""
+        if family is None:
+            return None
+        if style is None:
+            style = skia.FontStyle()
+        key = (family, style_key(style))
+        # Matching under the lock: a draw wanting a font the warm-up thread
+        # is matching right now waits for it, rather than matching it again
+        with self.lock:
+            typeface = self.typefaces.get(key)
+            if typeface is not None:
+                return typeface
+            start = time.perf_counter()
+            typeface = self.font_mgr.legacyMakeTypeface(family, style)
+            if typeface is None:
+                typeface = skia.Typeface(family, style)
+            elapsed = time.perf_counter() - start
+            if threading.current_thread() is threading.main_thread():
+                self.match_time += elapsed
+            else:
+                self.warm_up_time += elapsed
+            self.matches += 1
+            self.typefaces[key] = typeface
+            return typeface
+
+    def font(self, family=None, size=12, style=None):
+        """A shared Font of the family, style and size."""
+        key = (family, None if style is None else style_key(style), size)
+        font = self.fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            return font
+        font = skia.Font(self.typeface(family, style), size)
+        self.fonts[key] = font
+        return font
+
+    def warm_up(self, specs):
+        """Match (family, style) pairs on a background thread; returns the thread."""
+        thread = threading.Thread(target=lambda: [self.typeface(family, style) for family, style in specs],
+                                  name="font warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        return ("fonts: %d typefaces matched (%.1f ms on the UI thread, %.1f ms warming up), "
+                "%d fonts, %d hits" %
+                (self.matches, 1000 * self.match_time, 1000 * self.warm_up_time,
+                 len(self.fonts), self.hits))
+
+_registry = None
+
+def get_registry():
+    """The process-wide FontRegistry."""
+    global _registry
+    if _registry is None:
+        _registry = FontRegistry()
+    return _registry
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Idle-aware frame scheduler, shared by the toolkit examples.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  The examples used to redraw on a fixed 16ms timer (root.after, QTimer,
+#  GLib.timeout_add), or by calling Refresh() at the end of every paint,
+#  or by polling SDL without pause - all of which keep a core busy even
+#  when nothing on screen changes. This tells the toolkit loop *when* the
+#  next frame is due instead:
+#
+#     - "animating":  something moves; frames at the display rate. With a
+#                     blocking (vsync) swap the loop just renders back to back
+#                     and the display interval is measured from the swaps;
+#                     otherwise deadlines are aligned to the display refresh
+#                     rate, if the toolkit can tell us, or 60Hz.
+#     - "background": animating, but the window is unfocused or hidden;
+#                     frames at a low rate.
+#     - "idle":       nothing animates; no timer at all, the loop sleeps
+#                     until the next input event.
+#
+#  Input always gets a prompt frame (invalidate()), whatever the mode.
+#
+#  Usage, with any toolkit:
+#
+#      scheduler = FrameScheduler(refresh_rate=60)
+#      scheduler.set_animating(True)
+#      ...
+#      timeout = scheduler.timeout_ms()   # None: wait for input
+#      ...
+#      scheduler.frame_begin()
+#      draw()
+#      scheduler.frame_end()
+#      ...
+#      print(scheduler.report_string())
+#
+#  scheduler.report_sources.append(fonts.stats) adds other per-run figures
+#  (e.g. font matching time) to the report.
+
+import time
+
+MODE_ANIMATING = "animating"
+MODE_BACKGROUND = "background"
+MODE_IDLE = "idle"
+
+class FrameScheduler:
+    def __init__(self, refresh_rate=None, vsync=False, background_fps=4):
+        self.animating = False
+        self.focused = True
+        self.visible = True
+        self.dirty = True
+        self.vsync = vsync
+        if refresh_rate:
+            self.frame_interval = 1.0 / refresh_rate
+        else:
+            self.frame_interval = 1.0 / 60
+        self.background_interval = 1.0 / background_fps
+        self.last_frame = None
+        self.frame_start = None
+        # per mode: [wall seconds, cpu seconds, frames]
+        self.stats = {MODE_ANIMATING: [0.0, 0.0, 0],
+                      MODE_BACKGROUND: [0.0, 0.0, 0],
+                      MODE_IDLE: [0.0, 0.0, 0]}
+        # Callables returning extra lines for the report (cache stats, ...)
+        self.report_sources = []
+        self._mode = self.mode()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    def mode(self):
+        if not self.animating:
+            return MODE_IDLE
+        if not self.focused or not self.visible:
+            return MODE_BACKGROUND
+        return MODE_ANIMATING
+
+    def _account(self):
+        """Charge the wall and cpu time since the last call to the current mode."""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        stat = self.stats[self._mode]
+        stat[0] += wall - self._wall
+        stat[1] += cpu - self._cpu
+        self._wall = wall
+        self._cpu = cpu
+        self._mode = self.mode()
+
+    def set_animating(self, animating):
+        self._account()
+        self.animating = animating
+        self._mode = self.mode()
+
+    def set_focused(self, focused):
+        self._account()
+        self.focused = focused
+        self._mode = self.mode()
+
+    def set_visible(self, visible):
+        self._account()
+        self.visible = visible
+        self._mode = self.mode()
+        if visible:
+            self.dirty = True
+
+    def invalidate(self):
+        """Something changed (input, resize); draw one frame as soon as possible."""
+        self.dirty = True
+
+    def set_refresh_rate(self, refresh_rate):
+        if refresh_rate and refresh_rate > 0:
+            self.frame_interval = 1.0 / refresh_rate
+
+    def timeout(self):
+        """Seconds until the next frame is due, or None to sleep until input."""
+        if self.dirty:
+            return 0.0
+        mode = self.mode()
+        if mode == MODE_IDLE:
+            return None
+        if mode == MODE_ANIMATING and self.vsync:
+            # The blocking swap paces us.
+            return 0.0
+        if mode == MODE_ANIMATING:
+            interval = self.frame_interval
+        else:
+            interval = self.background_interval
+        if self.last_frame is None:
+            return 0.0
+        now = time.perf_counter()
+        due = self.last_frame + interval
+        if due <= now:
+            return 0.0
+        return due - now
+
+    def timeout_ms(self):
+        timeout = self.timeout()
+        if timeout is None:
+            return None
+        return int(timeout * 1000)
+
+    def frame_due(self):
+        timeout = self.timeout()
+        return timeout is not None and timeout <= 0.0
+
+    def frame_begin(self):
+        self._account()
+        self.frame_start = time.perf_counter()
+
+    def frame_end(self):
+        """Call after presenting; with vsync, measures the display interval."""
+        now = time.perf_counter()
+        if (self.vsync and self._mode == MODE_ANIMATING and not self.dirty and
+            self.last_frame is not None):
+            interval = now - self.last_frame
+            # Ignore stalls (window drags, breakpoints...) and runaway swaps.
+            if 0.25 * self.frame_interval < interval < 4 * self.frame_interval:
+                self.frame_interval += 0.1 * (interval - self.frame_interval)
+        if not self.vsync and self.last_frame is not None and self._mode != MODE_IDLE:
+            interval = (self.frame_interval if self._mode == MODE_ANIMATING
+                        else self.background_interval)
+            deadline = self.last_frame + interval
+            if deadline <= now < deadline + interval:
+                # Keep the cadence of the deadlines, rather than drifting
+                # by however long it took to wake up and draw.
+                now = deadline
+        self.last_frame = now
+        self.dirty = False
+        self.stats[self._mode][2] += 1
+
+    def report(self):
+        """Per mode: wall time, cpu time, frames, cpu utilisation and fps."""
+        self._account()
+        result = {}
+        for mode, (wall, cpu, frames) in self.stats.items():
+            result[mode] = {"wall": wall,
+                            "cpu": cpu,
+                            "frames": frames,
+                            "utilisation": cpu / wall if wall > 0 else 0.0,
+                            "fps": frames / wall if wall > 0 else 0.0}
+        return result
+
+    def report_string(self):
+        lines = ["mode        wall(s)   cpu(s)   cpu%    frames   fps"]
+        for mode, r in self.report().items():
+            lines.append("%-10s %8.2f %8.2f %6.1f %9d %6.1f" %
+                         (mode, r["wall"], r["cpu"], 100 * r["utilisation"],
+                          r["frames"], r["fps"]))
+        lines.append("display interval: %.2f ms" % (1000 * self.frame_interval))
+        lines.extend(source() for source in self.report_sources)
+        return "\n".join(lines)
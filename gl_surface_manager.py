@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Resize-debounced Skia GPU surface manager.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  Creating a GrDirectContext is expensive, and throws away all of Skia's
+#  GPU caches (glyph atlases, textures, compiled shader programs). It only
+#  needs to be done once per GL context; a window resize only needs the
+#  GrBackendRenderTarget re-wrapped at the new framebuffer size. Resize
+#  events also come in bursts during a window drag, so the re-wrap is
+#  postponed until the size has settled for `debounce` seconds.
+#
+#  Usage, with the GL context current:
+#
+#      surfaces = GLSurfaceManager()
+#      ... on resize:
+#      surfaces.resize(width, height)
+#      ... on paint, when settle_delay() is not None, paint again after it:
+#      surface = surfaces.surface(width, height)
+#      ... only on real teardown:
+#      surfaces.abandon()
+
+import time
+
+import skia
+from OpenGL.GL import GL_RGBA8
+
+class GLSurfaceManager:
+    def __init__(self, sample_count=0, stencil_bits=0, fb_format=GL_RGBA8,
+                 color_type=skia.kRGBA_8888_ColorType,
+                 origin=skia.kBottomLeft_GrSurfaceOrigin,
+                 color_space=None, props=None, debounce=0.1,
+                 make_context=skia.GrDirectContext.MakeGL):
+        self.sample_count = sample_count
+        self.stencil_bits = stencil_bits
+        self.fb_format = fb_format
+        self.color_type = color_type
+        self.origin = origin
+        self.color_space = color_space
+        self.props = props if props is not None else skia.SurfaceProps()
+        self.debounce = debounce
+        self.make_context = make_context
+        self.context = None
+        self._surface = None
+        self._key = None
+        self.pending_size = None
+        self.last_resize = 0.0
+        self.contexts_created = 0
+        self.surfaces_wrapped = 0
+        self.resizes_received = 0
+
+    def resize(self, width, height):
+        """Note a new size; the surface is re-wrapped once it has settled."""
+        self.resizes_received += 1
+        self.pending_size = (width, height)
+        self.last_resize = time.perf_counter()
+
+    def settle_delay(self):
+        """Seconds until a pending resize takes effect, or None."""
+        if self.pending_size is None:
+            return None
+        return max(0.0, self.last_resize + self.debounce - time.perf_counter())
+
+    def surface(self, width, height, fb_id=0):
+        """The surface for the current GL context, (re-)wrapped only when needed."""
+        if self.context is None:
+            self.context = self.make_context()
+            if self.context is None:
+                raise RuntimeError("Failed to create Skia GrDirectContext")
+            self.contexts_created += 1
+        if self.pending_size is not None:
+            if self._surface is not None and self.settle_delay() > 0:
+                # Still in a burst of resizes: keep drawing to the old one.
+                return self._surface
+            self.pending_size = None
+        key = (width, height, fb_id)
+        if self._surface is None or key != self._key:
+            target = skia.GrBackendRenderTarget(
+                width, height, self.sample_count, self.stencil_bits,
+                skia.GrGLFramebufferInfo(fb_id, self.fb_format))
+            self._surface = skia.Surface.MakeFromBackendRenderTarget(
+                self.context, target, self.origin, self.color_type,
+                self.color_space, self.props)
+            if self._surface is None:
+                raise RuntimeError("Failed to create Skia Surface from BackendRenderTarget")
+            self._key = key
+            self.surfaces_wrapped += 1
+        return self._surface
+
+    def abandon(self):
+        """Real teardown, i.e. the GL context is going away."""
+        self._surface = None
+        self._key = None
+        if self.context is not None:
+            self.context.abandonContext()
+            self.context = None
+
+    def stats(self):
+        return ("%d resize events, %d surfaces wrapped, %d GrDirectContext created" %
+                (self.resizes_received, self.surfaces_wrapped, self.contexts_created))
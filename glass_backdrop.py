@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Glass card drawn with a backdrop-filtered saveLayer.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  The glass demos (glassmorphic_skia.py, glassmorphic_live_skia.py) make
+#  the card with GLASSMORPHIC_SKSL: every frame, the content is drawn to its
+#  own surface and snapshot, a blurred copy of the whole snapshot is made,
+#  and a runtime shader with content, blur and noise as children is drawn
+#  over the whole of a second surface.
+#
+#  GlassPanel draws the same card straight onto the canvas, over whatever
+#  content is already there:
+#
+#     - inside the rounded rect, clipped to it, a saveLayer with a blur
+#       backdrop filter: Skia blurs just the part of the canvas under the
+#       card into the layer, and the shader's lightening, which is white at
+#       alpha 0.35 - 0.25 * lightenFactor over the blur, is drawn into it
+#       by a small runtime shader with the noise as its one child;
+#     - outside it, the drop shadow band, where the SkSL scales the content
+#       by a factor f and it is then drawn over the background, which is
+#       the background color at alpha 1 - f drawn over the content, by
+#       another small runtime shader.
+#
+#  No surface, snapshot or shader is made per frame. The one difference in
+#  the result is along the edge of the card, which the clip antialiases.
+#
+#  Usage:
+#
+#      panel = GlassPanel(skia.Rect.MakeLTRB(85, 110, 405, 290))
+#      ...draw the content...
+#      panel.draw(canvas)
+#
+#  Run as a script to benchmark against the GLASSMORPHIC_SKSL path and
+#  compare the pixels:
+#
+#      python glass_backdrop.py [--backend raster|gl|both] [--frames 200]
+
+import sys
+import math
+import time
+import argparse
+
+import numpy as np
+import skia
+
+from style_cache import get_styles
+
+BACKGROUND = skia.ColorSetRGB(3, 8, 13)
+
+SHADOW_SKSL = """
+uniform float4 rectangle;
+uniform float radius;
+uniform float dropShadowSize;
+uniform half4 background;
+
+float roundedRectangleSDF(float2 position, float2 box, float radius) {
+    float2 q = abs(position) - box + float2(radius);
+    return min(max(q.x, q.y), 0.0) + length(max(q, 0.0)) - radius;
+}
+half4 main(float2 coord) {
+    float2 shiftRect = (rectangle.zw - rectangle.xy) / 2.0;
+    float distanceToClosestEdge = roundedRectangleSDF(coord - rectangle.xy - shiftRect, shiftRect, radius);
+    if (distanceToClosestEdge <= 0.0 || distanceToClosestEdge >= dropShadowSize) {
+        return half4(0);
+    }
+    float darkenFactor = pow((dropShadowSize - distanceToClosestEdge) / dropShadowSize, 1.6);
+    return background * half(0.1 - (1.0 - darkenFactor) / 10.0);
+}
+"""
+
+LIGHTEN_SKSL = """
+uniform shader noise;
+uniform float4 rectangle;
+
+half4 main(float2 coord) {
+    float lightenFactor = min(1.0, length(coord - rectangle.xy) / (0.85 * length(rectangle.zw - rectangle.xy)));
+    float noiseLuminance = dot(noise.eval(coord).rgb, half3(0.2126, 0.7152, 0.0722));
+    lightenFactor = min(1.0, lightenFactor + noiseLuminance);
+    return half4(0.35 - 0.25 * lightenFactor);
+}
+"""
+
+_effects = {}
+
+def _effect(sksl):
+    effect = _effects.get(sksl)
+    if effect is None:
+        effect = _effects[sksl] = skia.RuntimeEffect.MakeForShader(sksl)
+        if effect is None:
+            raise RuntimeError("cannot compile glass shader")
+    return effect
+
+def noise_shader(size, seed=0):
+    """Repeating RGBA noise, as the demos make with PIL."""
+    pixels = np.random.default_rng(seed).integers(0, 256, (size, size, 4), dtype=np.uint8)
+    return skia.Image.fromarray(pixels).makeShader(skia.TileMode.kRepeat, skia.TileMode.kRepeat)
+
+class GlassPanel:
+    def __init__(self, rect, radius=20.0, shadow_size=15.0, blur_sigma=20.0, noise=None, background=BACKGROUND):
+        self.rect = rect
+        self.rrect = skia.RRect.MakeRectXY(rect, radius, radius)
+        self.shadow_bounds = rect.makeOutset(shadow_size, shadow_size)
+        ltrb = [rect.left(), rect.top(), rect.right(), rect.bottom()]
+
+        builder = skia.RuntimeShaderBuilder(_effect(SHADOW_SKSL))
+        builder.setUniform("rectangle", ltrb)
+        builder.setUniform("radius", radius)
+        builder.setUniform("dropShadowSize", shadow_size)
+        color = skia.Color4f(background)
+        builder.setUniform("background", [color.fR, color.fG, color.fB, 1.0])
+        self.shadow_paint = skia.Paint(Shader=builder.makeShader())
+
+        builder = skia.RuntimeShaderBuilder(_effect(LIGHTEN_SKSL))
+        builder.setUniform("rectangle", ltrb)
+        builder.setChild("noise", noise if noise is not None else noise_shader(int(max(rect.right(), rect.bottom()))))
+        self.lighten_paint = skia.Paint(Shader=builder.makeShader())
+
+        # SaveLayerRec only points at its bounds and backdrop: both are kept here
+        self.backdrop = get_styles().blur(blur_sigma, blur_sigma, skia.TileMode.kDecal)
+        self.layer = skia.Canvas.SaveLayerRec(self.rect, None, self.backdrop, 0)
+
+    def draw(self, canvas):
+        """Draw the card over what is on canvas now."""
+        canvas.save()
+        canvas.clipRRect(self.rrect, skia.ClipOp.kDifference, True)
+        canvas.drawRect(self.shadow_bounds, self.shadow_paint)
+        canvas.restore()
+
+        canvas.save()
+        canvas.clipRRect(self.rrect, True)
+        canvas.saveLayer(self.layer)
+        canvas.drawRect(self.rect, self.lighten_paint)
+        canvas.restore()
+        canvas.restore()
+
+def draw_content(canvas, t):
+    """The demo's background circles, the big one moved as at frame t."""
+    styles = get_styles()
+    x = 375 + math.sin(t / 30.0) * 30
+    y = 125 + math.cos(t / 90.0) * 10
+    canvas.clear(BACKGROUND)
+    canvas.drawCircle(x, y, 100, styles.paint(Shader=styles.linear_gradient(
+        [(450, 60), (290, 190)], [skia.ColorSetRGB(0x7A, 0x26, 0xD9), skia.ColorSetRGB(0xE4, 0x44, 0xE1)])))
+    canvas.drawCircle(100, 265, 55, styles.paint(Color=skia.ColorSetRGB(0xEA, 0x35, 0x7C)))
+    canvas.drawCircle(205, 125, 25, styles.paint(Shader=styles.linear_gradient(
+        [(180, 125), (230, 125)], [skia.ColorSetRGB(0xEA, 0x33, 0x4C), skia.ColorSetRGB(0xEC, 0x60, 0x51)])))
+
+class SkSLGlass:
+    """The GLASSMORPHIC_SKSL path of the demos, for comparison."""
+    def __init__(self, make_surface, rect, noise, radius=20.0, shadow_size=15.0, blur_sigma=20.0):
+        from glassmorphic_skia import GLASSMORPHIC_SKSL
+        self.make_surface = make_surface
+        self.rect = rect
+        self.noise = noise
+        self.blur_paint = skia.Paint(ImageFilter=skia.ImageFilters.Blur(blur_sigma, blur_sigma, skia.TileMode.kDecal))
+        self.effect = _effect(GLASSMORPHIC_SKSL)
+        self.uniforms = {
+            "rectangle": [rect.left(), rect.top(), rect.right(), rect.bottom()],
+            "radius": radius,
+            "dropShadowSize": shadow_size,
+        }
+
+    def draw(self, canvas, t):
+        # As in the demos: content to its own surface, a blurred copy on another
+        content = self.make_surface()
+        draw_content(content.getCanvas(), t)
+        content_image = content.makeImageSnapshot()
+        blurred = self.make_surface()
+        blurred.getCanvas().clear(skia.ColorTRANSPARENT)
+        blurred.getCanvas().drawImage(content_image, 0, 0, skia.SamplingOptions(), self.blur_paint)
+        builder = skia.RuntimeShaderBuilder(self.effect)
+        for name, value in self.uniforms.items():
+            builder.setUniform(name, value)
+        builder.setChild("content", content_image.makeShader(skia.TileMode.kClamp, skia.TileMode.kClamp))
+        builder.setChild("blur", blurred.makeImageSnapshot().makeShader(skia.TileMode.kClamp, skia.TileMode.kClamp))
+        builder.setChild("noise", self.noise)
+        canvas.clear(BACKGROUND)
+        canvas.drawPaint(skia.Paint(Shader=builder.makeShader()))
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Glass card: saveLayer backdrop vs GLASSMORPHIC_SKSL")
+    parser.add_argument("--backend", choices=["raster", "gl", "both"], default="raster")
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args(argv[1:])
+
+    W, H = 510, 370
+    rect = skia.Rect.MakeLTRB(85, 110, 405, 290)
+    noise = noise_shader(max(W, H))
+    info = skia.ImageInfo.MakeN32Premul(W, H)
+    backends = ["raster", "gl"] if args.backend == "both" else [args.backend]
+    for backend in backends:
+        if backend == "raster":
+            make_surface = lambda: skia.Surface.MakeRaster(info)
+        else:
+            from particle_atlas import make_gl_context
+            window, context = make_gl_context()
+            make_surface = lambda: skia.Surface.MakeRenderTarget(context, skia.Budgeted.kNo, info)
+        surface = make_surface()
+        canvas = surface.getCanvas()
+        panel = GlassPanel(rect, noise=noise)
+        sksl = SkSLGlass(make_surface, rect, noise)
+
+        def frame_backdrop(t):
+            draw_content(canvas, t)
+            panel.draw(canvas)
+
+        results = {}
+        pixels = {}
+        for name, frame in (("GLASSMORPHIC_SKSL", lambda t: sksl.draw(canvas, t)), ("saveLayer backdrop", frame_backdrop)):
+            frame(0) # warm-up: compile shaders
+            surface.flushAndSubmit()
+            start = time.perf_counter()
+            for t in range(args.frames):
+                frame(t)
+                surface.flushAndSubmit(skia.GrSyncCpu.kYes)
+            results[name] = (time.perf_counter() - start) / args.frames
+            frame(0)
+            pixels[name] = surface.makeImageSnapshot().toarray().astype(np.int16)
+            print("%-6s %-20s %8.3f ms/frame" % (backend, name, 1000 * results[name]))
+        print("%-6s speed-up %.1fx" % (backend, results["GLASSMORPHIC_SKSL"] / results["saveLayer backdrop"]))
+        diff = np.abs(pixels["GLASSMORPHIC_SKSL"] - pixels["saveLayer backdrop"])
+        print("%-6s pixels: max difference %d, mean %.3f, %.2f%% differ by more than 2" %
+              (backend, diff.max(), diff.mean(), 100 * (diff.max(axis=2) > 2).mean()))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -5,6 +5,7 @@ import skia
 from PyQt5.QtWidgets import QApplication, QWidget
 from PyQt5.QtCore import Qt, QRect
 from PyQt5.QtGui import QImage, QPainter
+from style_cache import get_styles
 
 WIDTH, HEIGHT = 600, 400
 
@@ -29,24 +30,21 @@ class GlassMorphismWidget(QWidget):
         }
 
     def paintEvent(self, event):
+        styles = get_styles()
         surface = skia.Surface(WIDTH, HEIGHT)
         canvas = surface.getCanvas()
 
         # Draw background
-        paint = skia.Paint()
-        grad = skia.GradientShader.MakeLinear(
+        grad = styles.linear_gradient(
             points=[(0,0), (WIDTH,HEIGHT)],
             colors=[skia.ColorBLUE, skia.ColorWHITE, skia.ColorGREEN],
             positions=[0.0, 0.5, 1.0],
         )
-        paint.setShader(grad)
-        canvas.drawRect(skia.Rect.MakeWH(WIDTH, HEIGHT), paint)
+        canvas.drawRect(skia.Rect.MakeWH(WIDTH, HEIGHT), styles.paint(Shader=grad))
 
         # Draw some shapes
-        paint = skia.Paint(Color=skia.ColorRED)
-        canvas.drawCircle(200, 130, 60, paint)
-        paint.setColor(skia.ColorYELLOW)
-        canvas.drawRect(skia.Rect.MakeXYWH(320, 100, 120, 120), paint)
+        canvas.drawCircle(200, 130, 60, styles.paint(Color=skia.ColorRED))
+        canvas.drawRect(skia.Rect.MakeXYWH(320, 100, 120, 120), styles.paint(Color=skia.ColorYELLOW))
 
         # Glass Morphism area (rounded rectangle)
         glass_rect = skia.Rect.MakeXYWH(140, 80, 320, 180)
@@ -55,26 +53,22 @@ class GlassMorphismWidget(QWidget):
         # 2. Crop area under glass_rect
         sub_img = img.makeSubset(glass_rect.round())
         # 3. Blur with runtime effect
-        blur_shader = skia.ImageFilters.Blur(
-            sigmaX=self.blur_radius,
-            sigmaY=self.blur_radius,
-            tileMode=skia.TileMode.kClamp,
-        )
-        blur_paint = skia.Paint(ImageFilter=blur_shader)
+        blur_shader = styles.blur(self.blur_radius, self.blur_radius, skia.TileMode.kClamp)
+        blur_paint = styles.paint(ImageFilter=blur_shader)
         # 4. Compose: draw blurred area to a new surface
         glass_surface = skia.Surface(int(glass_rect.width()), int(glass_rect.height()))
         glass_canvas = glass_surface.getCanvas()
         glass_canvas.drawImage(sub_img, 0, 0, skia.SamplingOptions(), blur_paint)
 
         # 5. Overlay white with adjustable opacity
-        overlay = skia.Paint(
+        overlay = styles.paint(
             Color=skia.ColorWHITE,
             Alphaf=self.opacity
         )
         glass_canvas.drawRect(skia.Rect.MakeWH(glass_rect.width(), glass_rect.height()), overlay)
 
         # 6. Draw border
-        border_paint = skia.Paint(
+        border_paint = styles.paint(
             Color=skia.ColorSetARGB(120, 255, 255, 255),
             Style=skia.Paint.kStroke_Style,
             StrokeWidth=2
@@ -116,6 +110,7 @@ class GlassMorphismWidget(QWidget):
         qp.drawText(350, HEIGHT-70, 'Opacity')
 
         qp.end()
+        styles.end_frame()
 
     def mousePressEvent(self, event):
         x, y = event.x(), event.y()
@@ -143,4 +138,6 @@ if __name__ == '__main__':
     app = QApplication(sys.argv)
     w = GlassMorphismWidget()
     w.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    status = app.exec_()
+    print(get_styles().stats())
+    sys.exit(status)
\ No newline at end of file
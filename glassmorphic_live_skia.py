@@ -6,6 +6,9 @@ from PIL import Image
 from PySide6.QtWidgets import QApplication, QWidget
 from PySide6.QtGui import QImage, QPainter
 from PySide6.QtCore import QTimer, Qt
+from font_registry import get_registry
+from style_cache import get_styles
+from glass_backdrop import GlassPanel
 
 GLASSMORPHIC_SKSL = """
 uniform shader content;
@@ -49,7 +52,7 @@ def pil_noise_to_skimage(size):
     return skia.Image.fromarray(np.array(img))
 
 class GlassmorphicWidget(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, use_sksl=False):
         super().__init__(parent)
         self.setWindowTitle("Glassmorphic Card - Live Skia/SkSL Demo")
         self.W, self.H = 510, 370
@@ -59,7 +62,19 @@ class GlassmorphicWidget(QWidget):
         self.effect = skia.RuntimeEffect.MakeForShader(GLASSMORPHIC_SKSL)
         self.noise_size = max(self.W, self.H)
         self.noise_image = pil_noise_to_skimage(self.noise_size)
+        self.noise_shader = self.noise_image.makeShader(skia.TileMode.kRepeat, skia.TileMode.kRepeat)
+        # Drawn into again every frame, rather than made anew
+        self.content_surface = skia.Surface(self.W, self.H)
+        self.final_surface = skia.Surface(self.W, self.H)
+        self.glass_paint = skia.Paint()
+        self.rect = skia.Rect.MakeLTRB(85, 110, 405, 290)
+        # The card as a backdrop-filtered saveLayer over the content, unless
+        # the GLASSMORPHIC_SKSL path is asked for (to compare with)
+        self.use_sksl = use_sksl
+        self.panel = GlassPanel(self.rect, noise=self.noise_shader)
         self.t = 0
+        # Matched in the background now, rather than in the first paintEvent
+        get_registry().warm_up([('Arial', skia.FontStyle.Bold())])
 
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.animate)
@@ -69,41 +84,43 @@ class GlassmorphicWidget(QWidget):
         self.t += 1
         self.update()
 
-    def generate_content_image(self):
+    def draw_content(self, canvas):
         # Animate one of the circles for some visual effect
         t = self.t / 30.0
         x = 375 + math.sin(t) * 30
         y = 125 + math.cos(t/3) * 10
 
-        surface = skia.Surface(self.W, self.H)
-        canvas = surface.getCanvas()
+        styles = get_styles()
         canvas.clear(skia.ColorSetRGB(3, 8, 13))  # dark bg
 
-        grad1 = skia.GradientShader.MakeLinear(
+        grad1 = styles.linear_gradient(
             points=[skia.Point(450, 60), skia.Point(290, 190)],
             colors=[skia.ColorSetRGB(0x7A, 0x26, 0xD9), skia.ColorSetRGB(0xE4, 0x44, 0xE1)],
         )
-        paint = skia.Paint(Shader=grad1)
+        paint = styles.paint(Shader=grad1)
         canvas.drawCircle(x, y, 100, paint)
 
-        paint = skia.Paint(Color=skia.ColorSetRGB(0xEA, 0x35, 0x7C))
+        paint = styles.paint(Color=skia.ColorSetRGB(0xEA, 0x35, 0x7C))
         canvas.drawCircle(100, 265, 55, paint)
 
-        grad2 = skia.GradientShader.MakeLinear(
+        grad2 = styles.linear_gradient(
             points=[skia.Point(180, 125), skia.Point(230, 125)],
             colors=[skia.ColorSetRGB(0xEA, 0x33, 0x4C), skia.ColorSetRGB(0xEC, 0x60, 0x51)],
         )
-        paint = skia.Paint(Shader=grad2)
+        paint = styles.paint(Shader=grad2)
         canvas.drawCircle(205, 125, 25, paint)
-        return surface.makeImageSnapshot()
 
-    def paintEvent(self, event):
-        # Prepare all Skia surfaces and shaders
+    def generate_content_image(self):
+        self.draw_content(self.content_surface.getCanvas())
+        return self.content_surface.makeImageSnapshot()
+
+    def draw_glass_sksl(self, final_canvas):
+        styles = get_styles()
         content_image = self.generate_content_image()
         blurred_image = content_image.makeWithFilter(
-            skia.ImageFilters.Blur(20.0, 20.0, skia.TileMode.kDecal), None)[0]
+            styles.blur(20.0, 20.0, skia.TileMode.kDecal), None)[0]
 
-        rect = skia.Rect.MakeLTRB(85, 110, 405, 290)
+        rect = self.rect
         uniforms = {
             "rectangle": [rect.left(), rect.top(), rect.right(), rect.bottom()],
             "radius": 20.0,
@@ -112,18 +129,27 @@ class GlassmorphicWidget(QWidget):
         children = {
             "content": content_image.makeShader(skia.TileMode.kClamp, skia.TileMode.kClamp),
             "blur": blurred_image.makeShader(skia.TileMode.kClamp, skia.TileMode.kClamp),
-            "noise": self.noise_image.makeShader(skia.TileMode.kRepeat, skia.TileMode.kRepeat),
+            "noise": self.noise_shader,
         }
         glass_shader = self.effect.makeShaderWithChildren(uniforms, children)
 
-        final_surface = skia.Surface(self.W, self.H)
-        final_canvas = final_surface.getCanvas()
         final_canvas.clear(skia.ColorSetRGB(3, 8, 13))
 
-        paint = skia.Paint(Shader=glass_shader)
-        final_canvas.drawRect(skia.Rect.MakeWH(self.W, self.H), paint)
+        # The glass shader is new every frame (its children are this frame's images)
+        self.glass_paint.setShader(glass_shader)
+        final_canvas.drawRect(skia.Rect.MakeWH(self.W, self.H), self.glass_paint)
 
-        border_grad = skia.GradientShader.MakeLinear(
+    def paintEvent(self, event):
+        styles = get_styles()
+        rect = self.rect
+        final_canvas = self.final_surface.getCanvas()
+        if self.use_sksl:
+            self.draw_glass_sksl(final_canvas)
+        else:
+            self.draw_content(final_canvas)
+            self.panel.draw(final_canvas)
+
+        border_grad = styles.linear_gradient(
             points=[skia.Point(120, 110), skia.Point(405, 290)],
             colors=[
                 skia.Color4f(1, 1, 1, 0.5).toColor(),
@@ -133,12 +159,12 @@ class GlassmorphicWidget(QWidget):
             ],
             positions=[0.0, 0.33, 0.66, 1.0],
         )
-        border_paint = skia.Paint(Shader=border_grad, Style=skia.Paint.kStroke_Style, StrokeWidth=2)
+        border_paint = styles.paint(Shader=border_grad, Style=skia.Paint.kStroke_Style, StrokeWidth=2)
         final_canvas.drawRoundRect(rect, 20, 20, border_paint)
 
         def draw_text(text, y, size):
-            font = skia.Font(skia.Typeface('Arial', skia.FontStyle.Bold()), size)
-            text_paint = skia.Paint(AntiAlias=True, Color=skia.ColorSetARGB(128, 255, 255, 255))
+            font = get_registry().font('Arial', size, skia.FontStyle.Bold())
+            text_paint = styles.paint(AntiAlias=True, Color=skia.ColorSetARGB(128, 255, 255, 255))
             final_canvas.drawString(text, 102, y, font, text_paint)
 
         draw_text("MEMBERSHIP", 150, 14)
@@ -146,15 +172,19 @@ class GlassmorphicWidget(QWidget):
         draw_text("PUSHING-PIXELS", 275, 13)
 
         # Convert Skia image to QImage for display
-        img = final_surface.makeImageSnapshot()
+        img = self.final_surface.makeImageSnapshot()
         arr = np.array(img)
         qimg = QImage(arr.data, self.W, self.H, QImage.Format_RGBA8888)
         painter = QPainter(self)
         painter.drawImage(0, 0, qimg)
         painter.end()
+        styles.end_frame()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    w = GlassmorphicWidget()
+    w = GlassmorphicWidget(use_sksl="--sksl" in sys.argv)
     w.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    status = app.exec()
+    print(get_registry().stats())
+    print(get_styles().stats())
+    sys.exit(status)
\ No newline at end of file
@@ -2,6 +2,8 @@ import skia
 import numpy as np
 from PIL import Image
 import math
+from font_registry import get_registry
+from style_cache import get_styles
 
 # ---- SkSL shader code from your original Kotlin/Compose ----
 GLASSMORPHIC_SKSL = """
@@ -51,29 +53,31 @@ def pil_noise_to_skimage(size):
 
 def create_glass_card(canvas, surface_size):
     W, H = surface_size
+    styles = get_styles()
     # --- Draw the colored background shapes ---
     # Gradient circle 1
-    grad1 = skia.GradientShader.MakeLinear(
+    grad1 = styles.linear_gradient(
         points=[skia.Point(450, 60), skia.Point(290, 190)],
         colors=[skia.ColorSetRGB(0x7A, 0x26, 0xD9), skia.ColorSetRGB(0xE4, 0x44, 0xE1)],
     )
-    paint = skia.Paint(Shader=grad1)
+    paint = styles.paint(Shader=grad1)
     canvas.drawCircle(375, 125, 100, paint)
 
     # Circle 2
-    paint = skia.Paint(Color=skia.ColorSetRGB(0xEA, 0x35, 0x7C))
+    paint = styles.paint(Color=skia.ColorSetRGB(0xEA, 0x35, 0x7C))
     canvas.drawCircle(100, 265, 55, paint)
 
     # Gradient circle 3
-    grad2 = skia.GradientShader.MakeLinear(
+    grad2 = styles.linear_gradient(
         points=[skia.Point(180, 125), skia.Point(230, 125)],
         colors=[skia.ColorSetRGB(0xEA, 0x33, 0x4C), skia.ColorSetRGB(0xEC, 0x60, 0x51)],
     )
-    paint = skia.Paint(Shader=grad2)
+    paint = styles.paint(Shader=grad2)
     canvas.drawCircle(205, 125, 25, paint)
 
 def main():
     W, H = 510, 370
+    styles = get_styles()
 
     # --- Create background (content) image ---
     surface = skia.Surface(W, H)
@@ -84,7 +88,7 @@ def main():
 
     # --- Blur image for shader ---
     blurred_image = content_image.makeWithFilter(
-        skia.ImageFilters.Blur(20.0, 20.0, skia.TileMode.kDecal), None)[0]
+        styles.blur(20.0, 20.0, skia.TileMode.kDecal), None)[0]
 
     # --- Noise image for shader ---
     noise_image = pil_noise_to_skimage(max(W, H))
@@ -111,11 +115,11 @@ def main():
     final_canvas = final_surface.getCanvas()
     final_canvas.clear(skia.ColorSetRGB(3, 8, 13))
     # Draw the glass effect
-    paint = skia.Paint(Shader=glass_shader)
+    paint = styles.paint(Shader=glass_shader)
     final_canvas.drawRect(skia.Rect.MakeWH(W, H), paint)
 
     # Draw the glass border
-    border_grad = skia.GradientShader.MakeLinear(
+    border_grad = styles.linear_gradient(
         points=[skia.Point(120, 110), skia.Point(405, 290)],
         colors=[
             skia.Color4f(1, 1, 1, 0.5).toColor(),
@@ -125,13 +129,13 @@ def main():
         ],
         positions=[0.0, 0.33, 0.66, 1.0],
     )
-    border_paint = skia.Paint(Shader=border_grad, Style=skia.Paint.kStroke_Style, StrokeWidth=2)
+    border_paint = styles.paint(Shader=border_grad, Style=skia.Paint.kStroke_Style, StrokeWidth=2)
     final_canvas.drawRoundRect(rect, 20, 20, border_paint)
 
     # Draw the text
     def draw_text(text, y, size):
-        font = skia.Font(skia.Typeface('Arial', skia.FontStyle.Bold()), size)
-        text_paint = skia.Paint(AntiAlias=True, Color=skia.ColorSetARGB(128, 255, 255, 255))
+        font = get_registry().font('Arial', size, skia.FontStyle.Bold())
+        text_paint = styles.paint(AntiAlias=True, Color=skia.ColorSetARGB(128, 255, 255, 255))
         final_canvas.drawString(text, 102, y, font, text_paint)
 
     draw_text("MEMBERSHIP", 150, 14)
@@ -142,6 +146,7 @@ def main():
     img = final_surface.makeImageSnapshot()
     img.save('glassmorphic_card_skia.png', skia.kPNG)
     print("Glassmorphic card saved as glassmorphic_card_skia.png")
+    print(styles.stats())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
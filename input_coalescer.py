@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Mouse-motion event coalescing, shared by the drag and iMouse handlers.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  A high-polling-rate mouse delivers hundreds of motion events per second;
+#  redrawing (or writing a uniform) for each one is wasted work, as only
+#  one frame per display refresh is ever seen. The toolkit handlers only
+#  record events here; once per frame, take() hands back the button
+#  transitions in order, followed by at most one motion event with the
+#  latest position.
+#
+#  Usage:
+#
+#      mouse = MouseCoalescer()
+#      ... in the toolkit event handlers:
+#      mouse.press(x, y)  /  mouse.motion(x, y)  /  mouse.release(x, y)
+#      ... once per frame:
+#      for kind, button, x, y in mouse.take():
+#          if kind == PRESS: ...
+#      ...
+#      print(mouse.stats())
+
+PRESS = "press"
+RELEASE = "release"
+MOTION = "motion"
+
+class MouseCoalescer:
+    def __init__(self):
+        self.transitions = []
+        self.pending_motion = None
+        self.x = 0
+        self.y = 0
+        self.received = 0
+        self.applied = 0
+
+    def motion(self, x, y):
+        self.received += 1
+        self.pending_motion = (x, y)
+
+    def press(self, x, y, button=1):
+        # A transition carries its own position, which supersedes any
+        # motion before it.
+        self.received += 1
+        self.pending_motion = None
+        self.transitions.append((PRESS, button, x, y))
+
+    def release(self, x, y, button=1):
+        self.received += 1
+        self.pending_motion = None
+        self.transitions.append((RELEASE, button, x, y))
+
+    def has_pending(self):
+        return bool(self.transitions) or self.pending_motion is not None
+
+    def take(self):
+        """Coalesced events since the last call: transitions, then the latest motion."""
+        events = self.transitions
+        self.transitions = []
+        if self.pending_motion is not None:
+            events.append((MOTION, None) + self.pending_motion)
+            self.pending_motion = None
+        if events:
+            self.x, self.y = events[-1][2:]
+        self.applied += len(events)
+        return events
+
+    def stats(self):
+        return "mouse events: %d received, %d applied" % (self.received, self.applied)
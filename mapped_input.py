@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Memory-mapped, read-only file input for SVG documents and images.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  skia.Stream.MakeFromFile() and skia.Image.open() read the whole file
+#  into process memory. skia.Data.MakeFromFileName() maps it instead: the
+#  pages are read in on first touch, are backed by the file (so the kernel
+#  can drop them again under pressure rather than swap them), and are the
+#  same physical pages in every process that maps the same file - viewer
+#  windows and worker processes alike.
+#
+#  Within a process, map_file() hands out one mapping per file, for as long
+#  as its size and mtime are unchanged. Images made by lazy_image() are not
+#  decoded until first drawn. load_svg() does not keep its mapping: an
+#  SVGDOM does not refer back to its source once parsed, so the file is
+#  unmapped as soon as it is - workers going through a whole corpus do not
+#  keep every file they have touched mapped and resident.
+#
+#  A mapped file must not be truncated while mapped; editors and tools that
+#  save by writing a new file and renaming it over the old one are fine.
+#
+#  Run as a script to compare resident memory reading vs mapping files:
+#
+#      python mapped_input.py file.svg image.jpg ...
+
+import os
+import sys
+
+import skia
+
+_mapped = {}
+
+def map_file(path, keep=True):
+    """A skia.Data mapping the file read-only, shared within the process
+    (with keep=False, only shared if already mapped)."""
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    key = (st.st_size, st.st_mtime_ns)
+    entry = _mapped.get(path)
+    if entry is not None and entry[0] == key:
+        return entry[1]
+    data = skia.Data.MakeFromFileName(path)
+    if data is None:
+        raise OSError("cannot map '%s'" % path)
+    if keep:
+        _mapped[path] = (key, data)
+    return data
+
+def release(path=None):
+    """Forget the mapping of one file (or all); it is unmapped once no longer referenced."""
+    if path is None:
+        _mapped.clear()
+    else:
+        _mapped.pop(os.path.abspath(path), None)
+
+def mapped_bytes():
+    return sum(data.size() for key, data in _mapped.values())
+
+def svg_stream(path):
+    """A stream over the mapped file, for skia.SVGDOM.MakeFromStream()."""
+    return skia.MemoryStream(map_file(path))
+
+def load_svg(path):
+    """The parsed SVGDOM; the file is unmapped once parsed, unless mapped elsewhere."""
+    # The stream does not hold on to the Data: it is referenced here until parsed
+    data = map_file(path, keep=False)
+    return skia.SVGDOM.MakeFromStream(skia.MemoryStream(data))
+
+def lazy_image(path):
+    """An image over the mapped encoded file; decoded when first drawn, not now."""
+    image = skia.Image.MakeFromEncoded(map_file(path))
+    if image is None:
+        raise ValueError("cannot decode '%s'" % path)
+    return image
+
+def rss_bytes():
+    """Resident set size of this process, or None where unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # Peak, not current, and in bytes on macOS but KiB elsewhere
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+def rss_string(rss):
+    return "unknown" if rss is None else "%.1f MB" % (rss / (1 << 20))
+
+def report_rss(label, before=None):
+    """Print (and return) the current RSS, with the change since before."""
+    rss = rss_bytes()
+    if before is None or rss is None:
+        print("RSS %s: %s" % (label, rss_string(rss)))
+    else:
+        print("RSS %s: %s (%+.1f MB)" % (label, rss_string(rss), (rss - before) / (1 << 20)))
+    return rss
+
+def main(argv):
+    if len(argv) < 2:
+        print("Usage: %s file.svg image.jpg ..." % argv[0])
+        return 1
+    start = report_rss("at start")
+    held = []
+    for path in argv[1:]:
+        with open(path, "rb") as f:
+            held.append(skia.Data.MakeWithCopy(f.read()))
+    read = report_rss("after reading %d files" % len(held), start)
+    held = []
+    for path in argv[1:]:
+        held.append(map_file(path))
+    report_rss("after mapping them (%.1f MB mapped)" % (mapped_bytes() / (1 << 20)), read)
+    for path in argv[1:]:
+        if path.lower().endswith(".svg"):
+            held.append(load_svg(path))
+        else:
+            held.append(lazy_image(path))
+    report_rss("after parsing SVGs and making lazy images", read)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
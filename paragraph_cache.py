@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Cache of built and laid-out skia.textlayout Paragraphs.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  Building a Paragraph (shaping, font matching, bidi) is by far the most
+#  expensive step, and its result does not depend on the width. So:
+#
+#     - built Paragraphs are kept, keyed by the caller's key (which should
+#       identify the text and its styles) and the font collection;
+#     - when only the width changes, the kept Paragraph is laid out again,
+#       without a rebuild;
+#     - the result of each layout - metrics, and the painting recorded
+#       into a skia.Picture - is kept per width bucket, so going back to a
+#       width seen before (e.g. resizing a window back and forth) needs
+#       neither a build nor a layout.
+#
+#  Widths are quantized to width_step (1 pixel by default, which is exact
+#  for integer widths); layout is done at the quantized width.
+#
+#  Usage:
+#
+#      cache = ParagraphCache()
+#      def build(font_collection):
+#          builder = textlayout.ParagraphBuilder.make(para_style, font_collection, unicodes)
+#          ...
+#          return builder.Build()
+#      laid_out = cache.get(("story", text, "body 30pt"), width, build, font_collection)
+#      laid_out.paint(canvas, x, y)      # and laid_out.height, laid_out.longest_line
+
+import time
+from collections import OrderedDict
+
+import skia
+
+class LaidOutParagraph:
+    """The metrics and recorded painting of one Paragraph at one width."""
+    def __init__(self, paragraph, width):
+        self.width = width
+        self.height = paragraph.Height
+        self.longest_line = paragraph.LongestLine
+        self.max_intrinsic_width = paragraph.MaxIntrinsicWidth
+        recorder = skia.PictureRecorder()
+        # Decorations, glyph overhangs and alignment can reach outside the
+        # laid-out box; be generous with the bounds used for culling.
+        bounds = skia.Rect.MakeWH(max(width, self.longest_line), self.height)
+        bounds.outset(self.height / 2 + 16, self.height / 2 + 16)
+        paragraph.paint(recorder.beginRecording(bounds), 0, 0)
+        self.picture = recorder.finishRecordingAsPicture()
+
+    def paint(self, canvas, x, y):
+        canvas.save()
+        canvas.translate(x, y)
+        canvas.drawPicture(self.picture)
+        canvas.restore()
+
+class ParagraphCache:
+    def __init__(self, max_paragraphs=64, max_widths=16, width_step=1.0):
+        self.max_paragraphs = max_paragraphs
+        self.max_widths = max_widths
+        self.width_step = width_step
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.relayouts = 0
+        self.misses = 0
+        self.build_time = 0.0
+        self.layout_time = 0.0
+        self.paint_time = 0.0
+
+    def get(self, key, width, build, font_collection):
+        """The LaidOutParagraph for key at width; build(font_collection) makes the Paragraph on a miss."""
+        full_key = (key, id(font_collection))
+        bucket = max(1, round(width / self.width_step))
+        entry = self.entries.get(full_key)
+        if entry is None:
+            self.misses += 1
+            start = time.perf_counter()
+            paragraph = build(font_collection)
+            self.build_time += time.perf_counter() - start
+            # Holding the collection keeps its id() from being reused
+            entry = (paragraph, font_collection, OrderedDict())
+            self.entries[full_key] = entry
+            while len(self.entries) > self.max_paragraphs:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(full_key)
+        paragraph, font_collection, layouts = entry
+        laid_out = layouts.get(bucket)
+        if laid_out is not None:
+            self.hits += 1
+            layouts.move_to_end(bucket)
+            return laid_out
+        if len(layouts) > 0:
+            self.relayouts += 1
+        start = time.perf_counter()
+        paragraph.layout(bucket * self.width_step)
+        laid_out_at = time.perf_counter()
+        laid_out = LaidOutParagraph(paragraph, bucket * self.width_step)
+        self.layout_time += laid_out_at - start
+        self.paint_time += time.perf_counter() - laid_out_at
+        layouts[bucket] = laid_out
+        while len(layouts) > self.max_widths:
+            layouts.popitem(last=False)
+        return laid_out
+
+    def invalidate(self, key=None):
+        """Drop the paragraphs for key (in every font collection), or all of them."""
+        for full_key in [k for k in self.entries if key is None or k[0] == key]:
+            del self.entries[full_key]
+
+    def stats(self):
+        return ("paragraphs: %d hits, %d re-layouts, %d builds; "
+                "build %.1f ms, layout %.1f ms, paint %.1f ms" %
+                (self.hits, self.relayouts, self.misses,
+                 1000 * self.build_time, 1000 * self.layout_time, 1000 * self.paint_time))
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Building skia.Paths from NumPy coordinate arrays, in one call.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  The examples build their geometry point by point: a lineTo per sample of
+#  a sine wave (draw_text_on_path.py), mapPoints to rotate each star vertex
+#  (create_star() in most examples), a drawCircle per spiral dot
+#  (SKIA-WX-CPU.py). That is one or more Python-to-Skia calls per point,
+#  and no faster through Path.Make or addPoly, which need a skia.Point
+#  object made for every point first.
+#
+#  Here the points, verbs and conic weights of a path are made as NumPy
+#  arrays, and laid out in the buffer format of Path.writeToMemory(), which
+#  Path.readFromMemory() turns into a Path in one call. That format is not
+#  promised to stay the same across Skia versions, so it is checked once
+#  against writeToMemory(), and Path.Make is used if it does not match.
+#
+#  Usage:
+#
+#      from path_geometry import polyline, star
+#      path = polyline(np.column_stack([x, y]))
+#
+#  Run as a script for a benchmark at 10^5 and 10^6 points:
+#
+#      python path_geometry.py [--points 100000 1000000]
+
+import sys
+import math
+import time
+import argparse
+
+import numpy as np
+import skia
+
+MOVE = int(skia.Path.kMove_Verb)
+LINE = int(skia.Path.kLine_Verb)
+CONIC = int(skia.Path.kConic_Verb)
+CLOSE = int(skia.Path.kClose_Verb)
+
+_SERIAL_VERSION = 5
+_buffers_ok = None
+
+def _serialize(points, verbs, weights, fill_type):
+    header = np.array([_SERIAL_VERSION | int(fill_type) << 8, len(points), len(weights), len(verbs)], dtype="<i4")
+    return b"".join((header.tobytes(), points.tobytes(), weights.tobytes(), verbs.tobytes(), bytes(-len(verbs) % 4)))
+
+def buffers_supported():
+    """Whether this Skia reads paths in the layout _serialize() writes."""
+    global _buffers_ok
+    if _buffers_ok is None:
+        reference = skia.Path()
+        reference.setFillType(skia.PathFillType.kEvenOdd)
+        reference.moveTo(1, 2)
+        reference.lineTo(3, 4)
+        reference.conicTo(5, 6, 7, 8, 0.5)
+        reference.close()
+        points = np.array([[1, 2], [3, 4], [5, 6], [7, 8]], dtype="<f4")
+        verbs = np.array([MOVE, LINE, CONIC, CLOSE], dtype=np.uint8)
+        weights = np.array([0.5], dtype="<f4")
+        _buffers_ok = bytes(reference.writeToMemory()) == _serialize(points, verbs, weights, skia.PathFillType.kEvenOdd)
+    return _buffers_ok
+
+def path_from_buffers(points, verbs, weights=None, fill_type=skia.PathFillType.kWinding):
+    """A Path from an (N, 2) array of points, an array of verbs (MOVE, LINE, ...)
+    and an array of conic weights, as for Path.Make (and like it, empty if they
+    do not fit together)."""
+    points = np.ascontiguousarray(points, dtype="<f4").reshape(-1, 2)
+    verbs = np.ascontiguousarray(verbs, dtype=np.uint8)
+    weights = np.ascontiguousarray([] if weights is None else weights, dtype="<f4")
+    if buffers_supported():
+        path = skia.Path()
+        if path.readFromMemory(_serialize(points, verbs, weights, fill_type)):
+            return path
+    # Point by point, but still in one call
+    return skia.Path.Make(list(map(skia.Point, *points.T.tolist())), verbs.tolist(), weights.tolist(), fill_type)
+
+def polyline(points, close=False, fill_type=skia.PathFillType.kWinding):
+    """One contour through an (N, 2) array of points."""
+    if len(points) == 0:
+        return skia.Path()
+    verbs = np.full(len(points) + close, LINE, dtype=np.uint8)
+    verbs[0] = MOVE
+    if close:
+        verbs[-1] = CLOSE
+    return path_from_buffers(points, verbs, fill_type=fill_type)
+
+def polylines(points, close=False, fill_type=skia.PathFillType.kWinding):
+    """One contour per row of an (M, N, 2) array of points, all in one path."""
+    points = np.asarray(points)
+    contours, count = points.shape[:2]
+    if contours == 0 or count == 0:
+        return skia.Path()
+    verbs = np.full((contours, count + close), LINE, dtype=np.uint8)
+    verbs[:, 0] = MOVE
+    if close:
+        verbs[:, -1] = CLOSE
+    return path_from_buffers(points.reshape(-1, 2), verbs.ravel(), fill_type=fill_type)
+
+def star_points(count=5, radius=50.0, center=(0.0, 0.0), step=2):
+    """The vertices of a star polygon, pointing up, in drawing order: every step-th
+    of count points evenly spaced on a circle, as create_star() does."""
+    angles = 2 * math.pi * ((step * np.arange(count)) % count) / count - math.pi / 2
+    return np.column_stack([center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles)])
+
+def star(count=5, radius=50.0, center=(0.0, 0.0), step=2,
+         fill_type=skia.PathFillType.kEvenOdd, close=True):
+    """The path of create_star() in the examples."""
+    return polyline(star_points(count, radius, center, step), close, fill_type)
+
+def stars(centers, radii, count=5, step=2, fill_type=skia.PathFillType.kEvenOdd):
+    """Stars at an (M, 2) array of centers, with radii (a number or M of them), in one path."""
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 1, 2)
+    radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), centers.shape[:1]).reshape(-1, 1, 1)
+    return polylines(centers + radii * star_points(count, 1.0, (0.0, 0.0), step), True, fill_type)
+
+def spiral_points(count, angle_step=0.1 * math.pi, spacing=3.0, center=(0.0, 0.0)):
+    """Points on an Archimedean spiral: point i at angle i * angle_step and radius i * spacing."""
+    i = np.arange(count)
+    angles = i * angle_step
+    return np.column_stack([center[0] + np.cos(angles) * i * spacing, center[1] + np.sin(angles) * i * spacing])
+
+def spiral(count, angle_step=0.1 * math.pi, spacing=3.0, center=(0.0, 0.0)):
+    return polyline(spiral_points(count, angle_step, spacing, center))
+
+def function_points(f, x):
+    """(x, f(x)) for an array of x; f must take and return arrays (np.sin, not math.sin)."""
+    x = np.asarray(x, dtype=np.float64)
+    return np.column_stack([x, np.broadcast_to(f(x), x.shape)])
+
+def function_path(f, x):
+    """The graph of f sampled at x, as a polyline."""
+    return polyline(function_points(f, x))
+
+# Unit circle as four conics, the way Path.addCircle makes it
+_CIRCLE = np.array([[1, 0], [1, 1], [0, 1], [-1, 1], [-1, 0], [-1, -1], [0, -1], [1, -1], [1, 0]], dtype=np.float64)
+_CIRCLE_VERBS = np.array([MOVE, CONIC, CONIC, CONIC, CONIC, CLOSE], dtype=np.uint8)
+
+def circles(centers, radii):
+    """Circles at an (M, 2) array of centers, with radii (a number or M of them), in one path."""
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 1, 2)
+    radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), centers.shape[:1]).reshape(-1, 1, 1)
+    points = centers + radii * _CIRCLE
+    weights = np.full(4 * len(centers), math.sqrt(0.5))
+    return path_from_buffers(points.reshape(-1, 2), np.tile(_CIRCLE_VERBS, len(centers)), weights)
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Path construction: lineTo loops vs NumPy buffers")
+    parser.add_argument("--points", type=int, nargs="+", default=[100000, 1000000])
+    args = parser.parse_args(argv[1:])
+
+    def timed(make):
+        start = time.perf_counter()
+        path = make()
+        return time.perf_counter() - start, path
+
+    print("path buffers %s" % ("supported" if buffers_supported() else "not supported, using Path.Make"))
+    for n in args.points:
+        x = np.linspace(0, 1000, n)
+        points = function_points(lambda x: 200 + 60 * np.sin(x / 50), x)
+
+        def line_to_loop():
+            path = skia.Path()
+            xs = x.tolist()
+            path.moveTo(xs[0], 200 + 60 * math.sin(xs[0] / 50))
+            for px in xs[1:]:
+                path.lineTo(px, 200 + 60 * math.sin(px / 50))
+            return path
+
+        def add_poly():
+            return skia.Path().addPoly(list(map(skia.Point, *points.T.tolist())), False)
+
+        centers = np.random.default_rng(0).uniform(0, 1000, (n // 5, 2))
+
+        def star_loop():
+            path = skia.Path()
+            path.setFillType(skia.PathFillType.kEvenOdd)
+            vertices = star_points()
+            for cx, cy in centers.tolist():
+                path.moveTo(cx + vertices[0][0], cy + vertices[0][1])
+                for vx, vy in vertices[1:].tolist():
+                    path.lineTo(cx + vx, cy + vy)
+                path.close()
+            return path
+
+        print("%d points:" % n)
+        for name, reference, vectorized in (
+                ("sine", line_to_loop, lambda: function_path(lambda x: 200 + 60 * np.sin(x / 50), x)),
+                ("sine, addPoly", line_to_loop, add_poly),
+                ("stars", star_loop, lambda: stars(centers, 50))):
+            loop_time, loop_path = timed(reference)
+            fast_time, fast_path = timed(vectorized)
+            assert fast_path.countPoints() == loop_path.countPoints()
+            print("  %-14s loop %8.1f ms, vectorized %8.1f ms (%.1fx)" %
+                  (name, 1000 * loop_time, 1000 * fast_time, loop_time / fast_time))
+
+if __name__ == '__main__':
+    main(sys.argv)
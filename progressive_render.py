@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Progressive level-of-detail rendering during interaction.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  While the user drags or wheel-zooms, a full-quality render of a very
+#  large document cannot keep up with the input. Instead:
+#
+#     - while input is active, a cached low-resolution preview (covering
+#       the viewport plus a margin around it) is drawn, transformed by the
+#       current pan/zoom;
+#     - after a short idle period, the full-resolution render is done as a
+#       "refinement" job - a generator, advanced one small chunk per call
+#       to step() from the toolkit's event loop;
+#     - new input cancels a refinement already in progress.
+#
+#  The viewer supplies the chunks of full-quality work (e.g. rendering the
+#  missing tiles, one at a time); preview_steps() supplies the chunks that
+#  re-render the preview for the current view, band by band. Each band
+#  draws the document under a clip, so render should skip what is outside
+#  it: replaying a Picture with a bounding box hierarchy (as RecordedSVG
+#  records) does.
+#
+#  Document space maps to the screen by  screen = scale * doc + (dx, dy).
+#
+#  Usage:
+#
+#      lod = ProgressiveRenderer()
+#      ... on input:
+#      lod.on_input()          and call on_idle() after lod.idle_delay
+#      ... on idle (if not lod.interacting()):
+#      lod.start(my_steps())   and call step() from the event loop until it
+#                              returns False, then repaint at full quality
+
+import time
+
+import skia
+
+class ProgressiveRenderer:
+    def __init__(self, context=None, idle_delay=0.2, preview_scale=0.5,
+                 preview_margin=0.5, band_height=128):
+        self.context = context
+        self.idle_delay = idle_delay
+        self.preview_scale = preview_scale
+        self.preview_margin = preview_margin
+        self.band_height = band_height
+        self.last_input = 0.0
+        self.generation = 0
+        self.job = None
+        self.preview = None
+        self.preview_view = None
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.sampling = skia.SamplingOptions(skia.FilterMode.kLinear)
+
+    def on_input(self):
+        """Input arrived: back to preview mode; cancel any refinement in progress."""
+        self.last_input = time.perf_counter()
+        self.generation += 1
+        if self.job is not None:
+            self.job = None
+            self.cancelled += 1
+
+    def interacting(self):
+        return time.perf_counter() - self.last_input < self.idle_delay
+
+    def idle_remaining(self):
+        return max(0.0, self.last_input + self.idle_delay - time.perf_counter())
+
+    def refining(self):
+        return self.job is not None
+
+    def has_preview(self):
+        return self.preview is not None
+
+    def invalidate(self):
+        """The document changed: the preview is stale."""
+        self.preview = None
+        self.preview_view = None
+        if self.job is not None:
+            self.job = None
+            self.cancelled += 1
+
+    def draw_preview(self, canvas, scale, dx, dy):
+        """Draw the low-resolution preview under the current pan/zoom."""
+        s0, dx0, dy0, mx, my = self.preview_view
+        # preview pixel = ps * (s0 * doc + (dx0, dy0) + margin)
+        r = scale / s0
+        canvas.save()
+        canvas.translate(dx - r * (dx0 + mx), dy - r * (dy0 + my))
+        canvas.scale(r / self.preview_scale, r / self.preview_scale)
+        canvas.drawImage(self.preview, 0, 0, self.sampling)
+        canvas.restore()
+
+    def _make_surface(self, width, height):
+        info = skia.ImageInfo.MakeN32Premul(width, height)
+        if self.context is not None:
+            surface = skia.Surface.MakeRenderTarget(self.context, skia.Budgeted.kYes, info)
+            if surface is not None:
+                return surface
+        return skia.Surface.MakeRaster(info)
+
+    def preview_steps(self, render, scale, dx, dy, w, h):
+        """Chunks re-rendering the preview, one horizontal band per step."""
+        mx, my = w * self.preview_margin, h * self.preview_margin
+        ps = self.preview_scale
+        width = max(1, int((w + 2 * mx) * ps))
+        height = max(1, int((h + 2 * my) * ps))
+        surface = self._make_surface(width, height)
+        canvas = surface.getCanvas()
+        canvas.clear(skia.ColorTRANSPARENT)
+        for top in range(0, height, self.band_height):
+            canvas.save()
+            canvas.clipRect(skia.Rect.MakeXYWH(0, top, width, self.band_height))
+            canvas.scale(ps, ps)
+            canvas.translate(dx + mx, dy + my)
+            canvas.scale(scale, scale)
+            render(canvas)
+            canvas.restore()
+            yield
+        self.preview = surface.makeImageSnapshot()
+        self.preview_view = (scale, dx, dy, mx, my)
+
+    def start(self, steps):
+        """Start (or restart) a refinement job, a generator of chunks of work."""
+        if self.job is not None:
+            self.cancelled += 1
+        self.job = iter(steps)
+        self.started += 1
+
+    def step(self):
+        """Do one chunk of refinement; returns True while there is more to do."""
+        if self.job is None:
+            return False
+        try:
+            next(self.job)
+            return True
+        except StopIteration:
+            self.job = None
+            self.completed += 1
+            return False
+
+    def stats(self):
+        return ("refinements: %d started, %d completed, %d cancelled by input" %
+                (self.started, self.completed, self.cancelled))
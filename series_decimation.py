@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Drawing very long time series as lines, by min/max per pixel column.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  A polyline through every sample (as draw_text_on_path.py does for its
+#  sine wave) costs time and memory in proportion to the number of samples,
+#  though at most a few per pixel column can be told apart. Here a series is
+#  reduced to the minimum and maximum of each pixel column, and one Path is
+#  drawn through those, which looks the same as the full line.
+#
+#  To make that fast for any zoom, TimeSeries keeps min/max summaries of
+#  blocks of 64 samples, and of 8 such blocks, 8 of those, and so on. A view
+#  is reduced from the coarsest summary with at least two blocks per column
+#  (so column boundaries are rounded to less than half a column), in time
+#  proportional to its width rather than to the samples it covers. The
+#  summaries are made in one pass, a chunk at a time, so a series can be a
+#  numpy.memmap of a file far larger than memory (10^8 samples and more),
+#  and are extended as samples are appended.
+#
+#  SeriesView keeps the columns of the last view: panning by whole columns
+#  only reduces the newly exposed ones, and appending only redoes the
+#  columns reaching past the old end. (A zoom changes every column, and
+#  redoes them all, from the summaries.)
+#
+#  Usage:
+#
+#      series = TimeSeries(np.memmap("samples.f32", dtype=np.float32, mode="r"))
+#      view = SeriesView(series)
+#      canvas.drawPath(view.path(first_sample, samples_per_pixel, width, y_of), paint)
+#
+#  Run as a script to make a test file, and time it:
+#
+#      python series_decimation.py --generate 100000000 samples.f32
+#      python series_decimation.py samples.f32
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import skia
+
+from path_geometry import polyline
+
+class _Growable:
+    """A numpy array that grows at the end, with amortized copying."""
+    def __init__(self, dtype, capacity=1024):
+        self.buffer = np.empty(capacity, dtype)
+        self.count = 0
+
+    def extend(self, values):
+        end = self.count + len(values)
+        if end > len(self.buffer):
+            buffer = np.empty(max(end, 2 * len(self.buffer)), self.buffer.dtype)
+            buffer[:self.count] = self.buffer[:self.count]
+            self.buffer = buffer
+        self.buffer[self.count:end] = values
+        self.count = end
+
+    @property
+    def values(self):
+        return self.buffer[:self.count]
+
+class TimeSeries:
+    """Samples (an array or memmap, plus appended samples) with min/max block summaries."""
+    def __init__(self, data=None, dtype=np.float32, block=64, factor=8, chunk=1 << 22):
+        self.base = np.empty(0, dtype) if data is None else data
+        self.appended = _Growable(self.base.dtype)
+        self.block = block
+        self.factor = factor
+        self.chunk = chunk - chunk % block
+        self.levels = [] # (mins, maxs) of blocks of block * factor**level samples
+        self.summary_time = 0.0
+        self._summarize()
+
+    def __len__(self):
+        return len(self.base) + self.appended.count
+
+    def samples(self, start, stop):
+        """Samples start..stop, as a view where they are all in one place."""
+        split = len(self.base)
+        if stop <= split:
+            return self.base[start:stop]
+        if start >= split:
+            return self.appended.values[start - split:stop - split]
+        return np.concatenate([self.base[start:], self.appended.values[:stop - split]])
+
+    def append(self, values):
+        """Add samples at the end (streaming)."""
+        self.appended.extend(np.asarray(values, dtype=self.base.dtype))
+        self._summarize()
+
+    def block_size(self, level):
+        return self.block * self.factor ** level
+
+    def _summarize(self):
+        start = time.perf_counter()
+        if not self.levels:
+            self.levels.append((_Growable(self.base.dtype), _Growable(self.base.dtype)))
+        mins, maxs = self.levels[0]
+        done = mins.count * self.block
+        end = len(self) - len(self) % self.block
+        for a in range(done, end, self.chunk):
+            blocks = self.samples(a, min(a + self.chunk, end)).reshape(-1, self.block)
+            mins.extend(blocks.min(axis=1))
+            maxs.extend(blocks.max(axis=1))
+        level = 0
+        while self.levels[level][0].count >= self.factor:
+            if level + 1 == len(self.levels):
+                self.levels.append((_Growable(self.base.dtype), _Growable(self.base.dtype)))
+            (mins, maxs), (upper_mins, upper_maxs) = self.levels[level], self.levels[level + 1]
+            a = upper_mins.count * self.factor
+            b = mins.count - mins.count % self.factor
+            upper_mins.extend(mins.values[a:b].reshape(-1, self.factor).min(axis=1))
+            upper_maxs.extend(maxs.values[a:b].reshape(-1, self.factor).max(axis=1))
+            level += 1
+        self.summary_time += time.perf_counter() - start
+
+    def range(self):
+        """(min, max) over all samples."""
+        if len(self) == 0:
+            return 0.0, 0.0
+        mins, maxs = self.minmax(np.array([0, len(self)]))
+        return float(mins[0]), float(maxs[0])
+
+    def minmax(self, edges):
+        """The min and max of samples edges[i]..edges[i+1] for each i (NaN where empty),
+        for non-decreasing sample indices edges."""
+        edges = np.clip(np.asarray(edges, dtype=np.int64), 0, len(self))
+        columns = len(edges) - 1
+        mins = np.full(columns, np.nan)
+        maxs = np.full(columns, np.nan)
+        if columns <= 0 or edges[-1] == edges[0]:
+            return mins, maxs
+        per_column = (edges[-1] - edges[0]) / columns
+        level = -1
+        while level + 1 < len(self.levels) and 2 * self.block_size(level + 1) <= per_column:
+            level += 1
+        if level < 0:
+            self._reduce(self.samples(edges[0], edges[-1]), self.samples(edges[0], edges[-1]),
+                         edges - edges[0], mins, maxs)
+            return mins, maxs
+        size = self.block_size(level)
+        level_mins, level_maxs = self.levels[level]
+        blocks = np.minimum(edges // size, level_mins.count)
+        self._reduce(level_mins.values[blocks[0]:blocks[-1]], level_maxs.values[blocks[0]:blocks[-1]],
+                     blocks - blocks[0], mins, maxs)
+        # Past the last whole block of this level: less than half a column, from the finer levels
+        summarized = level_mins.count * size
+        for i in np.nonzero(edges[1:] > summarized)[0].tolist():
+            tail_mins, tail_maxs = self.minmax(np.array([max(edges[i], summarized), edges[i + 1]]))
+            mins[i] = np.fmin(mins[i], tail_mins[0])
+            maxs[i] = np.fmax(maxs[i], tail_maxs[0])
+        return mins, maxs
+
+    @staticmethod
+    def _reduce(lows, highs, offsets, mins, maxs):
+        """mins[i], maxs[i] = min of lows, max of highs in offsets[i]..offsets[i+1], where not empty."""
+        nonempty = offsets[1:] > offsets[:-1]
+        if not nonempty.any():
+            return
+        starts = offsets[:-1][nonempty]
+        mins[nonempty] = np.minimum.reduceat(lows, starts)
+        maxs[nonempty] = np.maximum.reduceat(highs, starts)
+
+    def stats(self):
+        return ("time series: %d samples, %d summary levels, summarized in %.1f ms" %
+                (len(self), len(self.levels), 1000 * self.summary_time))
+
+class SeriesView:
+    """Min/max per pixel column of a TimeSeries; column k covers samples k * spp..(k + 1) * spp."""
+    def __init__(self, series):
+        self.series = series
+        self.spp = None
+        self.first = 0
+        self.mins = np.empty(0)
+        self.maxs = np.empty(0)
+        self.valid_samples = 0
+        self.reduced = 0
+        self.reused = 0
+
+    def _reduce(self, first, stop, spp):
+        edges = np.floor(np.arange(first, stop + 1) * spp).astype(np.int64)
+        self.reduced += stop - first
+        return self.series.minmax(edges)
+
+    def columns(self, first, width, spp):
+        """(mins, maxs) of columns first..first + width, at spp samples per column."""
+        stop = first + width
+        # Cached columns still valid: same zoom, and not reaching samples appended since
+        keep_first = max(first, self.first)
+        keep_stop = min(stop, self.first + len(self.mins))
+        if spp == self.spp:
+            keep_stop = min(keep_stop, int(self.valid_samples // spp))
+        if spp != self.spp or keep_first >= keep_stop:
+            mins, maxs = self._reduce(first, stop, spp)
+        else:
+            kept = slice(keep_first - self.first, keep_stop - self.first)
+            self.reused += keep_stop - keep_first
+            left = self._reduce(first, keep_first, spp)
+            right = self._reduce(keep_stop, stop, spp)
+            mins = np.concatenate([left[0], self.mins[kept], right[0]])
+            maxs = np.concatenate([left[1], self.maxs[kept], right[1]])
+        self.spp, self.first, self.mins, self.maxs = spp, first, mins, maxs
+        self.valid_samples = len(self.series)
+        return mins, maxs
+
+    def path(self, start, spp, width, y_of):
+        """A Path through the columns of a view width pixels wide, showing samples
+        from start (a sample position, may be fractional) at spp samples per pixel;
+        y_of maps an array of sample values to pixel y."""
+        if spp <= 1:
+            # Zoomed in past one sample per pixel: every sample, one past each side
+            a = max(int(np.floor(start)) - 1, 0)
+            b = min(int(np.ceil(start + width * spp)) + 2, len(self.series))
+            values = self.series.samples(a, b)
+            if len(values) == 0:
+                return skia.Path()
+            return polyline(np.column_stack([(np.arange(a, b) - start) / spp, y_of(values)]))
+        first = int(np.floor(start / spp))
+        mins, maxs = self.columns(first, width + 1, spp)
+        x = first + np.arange(len(mins)) + 0.5 - start / spp
+        shown = ~np.isnan(mins)
+        # Down and up each column, min then max
+        points = np.empty((2 * shown.sum(), 2))
+        points[:, 0] = np.repeat(x[shown], 2)
+        points[0::2, 1] = y_of(mins[shown])
+        points[1::2, 1] = y_of(maxs[shown])
+        if len(points) == 0:
+            return skia.Path()
+        return polyline(points)
+
+    def stats(self):
+        return "series view: %d columns reduced, %d reused" % (self.reduced, self.reused)
+
+def open_series(path, dtype=np.float32):
+    """A TimeSeries over the raw samples in a file, memory-mapped."""
+    if os.path.getsize(path) == 0:
+        return TimeSeries(dtype=dtype)
+    return TimeSeries(np.memmap(path, dtype=dtype, mode="r"))
+
+def generate(path, count, dtype=np.float32, chunk=1 << 22):
+    """Write count samples of a noisy, drifting sine wave to path."""
+    rng = np.random.default_rng(0)
+    drift = 0.0
+    with open(path, "wb") as f:
+        for a in range(0, count, chunk):
+            t = np.arange(a, min(a + chunk, count))
+            steps = rng.normal(0, 0.001, len(t)).cumsum() + drift
+            drift = steps[-1]
+            f.write((np.sin(t / 1e5) + 0.2 * rng.normal(0, 1, len(t)) + steps).astype(dtype).tobytes())
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Min/max decimation of long time series")
+    parser.add_argument("file", help="raw float32 samples")
+    parser.add_argument("--generate", type=int, metavar="N", help="first write N test samples to file")
+    parser.add_argument("--width", type=int, default=1600, help="view width in pixels")
+    args = parser.parse_args(argv[1:])
+
+    if args.generate:
+        start = time.perf_counter()
+        generate(args.file, args.generate)
+        print("wrote %d samples in %.1f s" % (args.generate, time.perf_counter() - start))
+
+    series = open_series(args.file)
+    print(series.stats())
+    low, high = series.range()
+    view = SeriesView(series)
+    y_of = lambda values: 400 * (high - values) / (high - low if high > low else 1)
+
+    n = len(series)
+    for zoom in (1, 10, 1000, 100000):
+        spp = n / args.width / zoom
+        if spp < 1:
+            break
+        start = time.perf_counter()
+        path = view.path(n / 3, spp, args.width, y_of)
+        full = time.perf_counter() - start
+        # Pan by 10 pixels: only 10 columns are reduced
+        start = time.perf_counter()
+        view.path(n / 3 + 10 * spp, spp, args.width, y_of)
+        pan = time.perf_counter() - start
+        print("%8.0f samples/pixel: %6.1f ms for the view, %6.2f ms after a pan, %d points" %
+              (spp, 1000 * full, 1000 * pan, path.countPoints()))
+    print(view.stats())
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -39,6 +39,9 @@
 
 from skia import *
 
+from paragraph_cache import ParagraphCache
+import text_services
+
 if __name__ == '__main__':
     from sys import argv
     if len(argv) < 3:
@@ -56,10 +59,8 @@ The ship settled down on the scarred blast shield, beside the same trio of squat
 As soon as the tube was disconnected, the ship screamed off through the murky atmosphere, seemingly glad to get away from Titan and head back to the more comfortable and settled parts of the Solar System.
 '''
 
-    # mgr = FontMgr()
-    mgr = FontMgr.OneFontMgr(input)
-    fontCollection = textlayout.FontCollection()
-    fontCollection.setDefaultFontManager(mgr)
+    # fontCollection = text_services.font_collection()
+    fontCollection = text_services.font_collection(input)
 
     width = 200
     surface = Surfaces.Raster(ImageInfo.MakeN32(width, 200, AlphaType.kOpaque_AlphaType))
@@ -89,19 +90,20 @@ As soon as the tube was disconnected, the ship screamed off through the murky at
     paraStyle.setTextAlign(textlayout.TextAlign.kRight)
 
     # "unicode" is reserved in Python
-    _unicode = Unicodes.ICU.Make()
-
-    if not _unicode:
-        print("Could not load unicode data")
-        sys.exit(1)
-
-    builder = textlayout.ParagraphBuilder.make(paraStyle, fontCollection, _unicode)
-
-    builder.addText(story)
+    try:
+        _unicode = text_services.unicodes()
+    except RuntimeError as e:
+        print(e)
+        exit(1)
 
-    paragraph = builder.Build()
+    def build(font_collection):
+        builder = textlayout.ParagraphBuilder.make(paraStyle, font_collection, _unicode)
+        builder.addText(story)
+        return builder.Build()
 
-    paragraph.layout(width - 20)
+    # Keyed by the text and the font, which is all that varies here
+    paragraphs = ParagraphCache()
+    paragraph = paragraphs.get((story, input), width - 20, build, fontCollection)
     paragraph.paint(canvas, 10, 10)
 
     surface.flushAndSubmit()
@@ -12,19 +12,29 @@
 #      You may want to set LANG to "en_GB.UTF-8" or "en_US.UTF-8", and FC_LANG to "en",
 #      if you have a non-English locale, particularly a zh_* one.
 
+#  Run with --resize to also lay the paragraph out over a sweep of widths, back and forth,
+#  as on window resizes, and see how little of it the paragraph cache has to redo.
+
 from skia import Surfaces, ImageInfo, AlphaType
 from skia import textlayout
-from skia import ColorBLACK, ColorWHITE, FontMgr, FontStyle, Paint, Unicodes, kPNG
+from skia import ColorBLACK, ColorWHITE, FontStyle, Paint, kPNG
 
 from math import ceil
+import sys
 
-if __name__ == '__main__':
-    font_collection = textlayout.FontCollection()
-    font_collection.setDefaultFontManager(FontMgr())
+from paragraph_cache import ParagraphCache
+import text_services
+from font_fallback import get_fallback_cache
+
+# The --resize sweep: 36 distinct widths, down to 300 and back up again
+RESIZE_WIDTHS = list(range(1000, 300, -20)) + list(range(300, 1000, 20))
+
+MIXED_SCRIPTS = " Furthermore, العربية نص جميل. द क्विक ब्राउन फ़ॉक्स jumps over the lazy 🐕."
 
+def build_paragraph(font_collection):
     para_style = textlayout.ParagraphStyle()
     # SK_DISABLE_LEGACY_PARAGRAPH_UNICODE: two-arg ParagraphBuilder constructor used by rust going soon!
-    builder = textlayout.ParagraphBuilder.make(para_style, font_collection, Unicodes.ICU.Make())
+    builder = textlayout.ParagraphBuilder.make(para_style, font_collection, text_services.unicodes())
 
     paint = Paint()
     paint.setAntiAlias(True);
@@ -33,7 +43,9 @@ if __name__ == '__main__':
     style = textlayout.TextStyle()
     style.setFontSize(30.0)
     style.setForegroundPaint(paint)
-    style.setFontFamilies(["times", "georgia", "serif"])
+    # With the fallback fonts for the Arabic, Devanagari and emoji remembered
+    # from earlier runs, rather than found by fontconfig on every start
+    style.setFontFamilies(get_fallback_cache().families_for(MIXED_SCRIPTS, ["times", "georgia", "serif"]))
     builder.pushStyle(style)
 
     style_bold = style.cloneForPlaceholder()
@@ -63,13 +75,20 @@ if __name__ == '__main__':
 
     builder.addText(" when displayed. The arrangement of type involves selecting typefaces, point sizes, line lengths, line-spacing (leading), and letter-spacing (tracking), and adjusting the space between pairs of letters (kerning). The term typography is also applied to the style, arrangement, and appearance of the letters, numbers, and symbols created by the process.")
 
-    builder.addText(" Furthermore, العربية نص جميل. द क्विक ब्राउन फ़ॉक्स jumps over the lazy 🐕.")
+    builder.addText(MIXED_SCRIPTS)
 
-    paragraph = builder.Build()
-    paragraph.layout(1000.0)
+    return builder.Build()
 
-    width = paragraph.LongestLine
-    height = paragraph.Height
+if __name__ == '__main__':
+    font_collection = text_services.font_collection()
+
+    # Built once; laid out again only for widths not seen before, and
+    # keeping every width of the sweep (the default of 16 would not)
+    paragraphs = ParagraphCache(max_widths=len(set(RESIZE_WIDTHS)))
+    paragraph = paragraphs.get("typography", 1000.0, build_paragraph, font_collection)
+
+    width = paragraph.longest_line
+    height = paragraph.height
     surface = Surfaces.Raster(ImageInfo.MakeN32(ceil(width), ceil(height), AlphaType.kOpaque_AlphaType))
 
     canvas = surface.getCanvas()
@@ -79,3 +98,12 @@ if __name__ == '__main__':
     surface.flushAndSubmit()
     image = surface.makeImageSnapshot()
     image.save("test.png", kPNG)
+
+    if "--resize" in sys.argv:
+        # What a UI does on window resizes, back and forth
+        for sweep in range(2):
+            for w in RESIZE_WIDTHS:
+                paragraphs.get("typography", w, build_paragraph, font_collection).paint(canvas, 0, 0)
+        print(paragraphs.stats())
+        print(text_services.stats())
+        print(get_fallback_cache().stats())
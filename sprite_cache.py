@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Sprite asset cache, with GPU texture promotion.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  The examples used to rasterize the rotating star into a CPU surface and
+#  draw that raster image onto the GPU surface every frame (which uploads
+#  it every frame), or rebuild create_star() as a Path every frame. Here
+#  each sprite is built once per scale, and uploaded once per
+#  GrDirectContext with makeTextureImage(). Entries are keyed by
+#  (name, scale, context); context None is the raster image. A texture
+#  whose context has been abandoned (context loss) is rebuilt lazily on
+#  next use.
+#
+#  Usage:
+#
+#      sprites = SpriteCache()
+#      sprites.register("star", lambda scale: rasterize_path(create_star(), 100, scale))
+#      ... every frame:
+#      canvas.drawImage(sprites.get("star", 1.0, grContext), -50, -50)
+#      ...
+#      print(sprites.stats())
+
+import skia
+
+def rasterize_path(path, size, scale=1.0, paint=None):
+    """Rasterize path, centred on the origin, into a size x size (times scale) image."""
+    pixels = int(round(size * scale))
+    surface = skia.Surface.MakeRaster(skia.ImageInfo.MakeN32Premul(pixels, pixels))
+    canvas = surface.getCanvas()
+    canvas.clear(skia.ColorTRANSPARENT)
+    canvas.save()
+    canvas.translate(pixels / 2, pixels / 2)
+    canvas.scale(scale, scale)
+    canvas.drawPath(path, paint if paint is not None else skia.Paint(AntiAlias=True))
+    canvas.restore()
+    return surface.makeImageSnapshot()
+
+class SpriteCache:
+    def __init__(self):
+        self.builders = {}
+        self.entries = {}
+        self.builds = 0
+        self.uploads = 0
+        self.hits = 0
+
+    def register(self, name, builder):
+        """builder(scale) returns a raster skia.Image."""
+        self.builders[name] = builder
+        for key in [key for key in self.entries if key[0] == name]:
+            del self.entries[key]
+
+    def get(self, name, scale=1.0, context=None):
+        """The sprite, as a texture on context, or a raster image if context is None."""
+        key = (name, scale, id(context) if context is not None else None)
+        entry = self.entries.get(key)
+        if entry is not None:
+            image, owner = entry
+            if context is None or (not context.abandoned() and image.isValid(context)):
+                self.hits += 1
+                return image
+        raster = self._raster(name, scale)
+        if context is None:
+            return raster
+        image = raster.makeTextureImage(context)
+        if image is None:
+            # e.g. no GPU memory; drawing the raster image still works.
+            return raster
+        self.uploads += 1
+        # Keep a reference to the context, so that its id() is not reused.
+        self.entries[key] = (image, context)
+        return image
+
+    def _raster(self, name, scale):
+        key = (name, scale, None)
+        entry = self.entries.get(key)
+        if entry is None:
+            image = self.builders[name](scale)
+            self.builds += 1
+            entry = self.entries[key] = (image, None)
+        return entry[0]
+
+    def drop_context(self, context):
+        """Forget the textures on context, e.g. before it is abandoned."""
+        for key in [key for key, (image, owner) in self.entries.items() if owner is context]:
+            del self.entries[key]
+
+    def gpu_bytes(self, context=None):
+        """Approximate GPU memory held by the cached textures (on context, or all)."""
+        total = 0
+        for image, owner in self.entries.values():
+            if owner is None or (context is not None and owner is not context):
+                continue
+            if not owner.abandoned():
+                total += image.imageInfo().computeMinByteSize()
+        return total
+
+    def stats(self):
+        return ("sprites: %d built, %d uploaded, %d hits, %.1f KiB on GPU" %
+                (self.builds, self.uploads, self.hits, self.gpu_bytes() / 1024))
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Interned Paints, Shaders and ImageFilters, made once per set of parameters.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  The glass card demos make the same gradients, blur filters and paints
+#  anew for every frame. Here each is described by its parameters, made the
+#  first time, and handed out again afterwards, so a repeated frame makes no
+#  new Skia style objects. Paints and shaders are immutable in use, so one
+#  object can serve every caller asking for the same thing - interned Paints
+#  must not be changed (setColor() etc.) afterwards.
+#
+#  Parameters are compared by value (numbers, colors, points, enums), except
+#  other Skia objects (a Shader inside a Paint, an input ImageFilter), which
+#  are compared by identity; ask the cache for those too, and they are the
+#  same objects each time.
+#
+#  Objects made are counted, in total and per frame; end_frame() returns the
+#  number made since the last frame, which should be 0 once warm.
+#
+#  Usage:
+#
+#      styles = get_styles()
+#      shader = styles.linear_gradient([(0, 0), (W, H)], [skia.ColorBLUE, skia.ColorWHITE])
+#      canvas.drawRect(rect, styles.paint(Shader=shader))
+#      ...
+#      made = styles.end_frame()
+
+from collections import OrderedDict
+
+import skia
+
+def _key(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_key(v) for v in value)
+    if isinstance(value, skia.Point):
+        return (value.x(), value.y()) # the same as a point given as a tuple
+    if isinstance(value, skia.Color4f):
+        return ("Color4f", value.fR, value.fG, value.fB, value.fA)
+    if isinstance(value, skia.Rect):
+        return ("Rect", value.left(), value.top(), value.right(), value.bottom())
+    if hasattr(value, "__members__"): # a pybind11 enum
+        return (type(value).__name__, int(value))
+    return ("id", id(value))
+
+class StyleCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.created = {}
+        self.hits = 0
+        self.frames = 0
+        self.frame_created = 0
+        self.last_frame_created = 0
+
+    def intern(self, kind, make, *args, **kwargs):
+        """make(*args, **kwargs), or the object it made before for equal arguments."""
+        key = (kind, _key(args), _key(sorted(kwargs.items())))
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0]
+        obj = make(*args, **kwargs)
+        # The arguments are kept with the object, so that the ids in the key stay theirs
+        self.entries[key] = (obj, args, kwargs)
+        self.created[kind] = self.created.get(kind, 0) + 1
+        self.frame_created += 1
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return obj
+
+    def paint(self, **kwargs):
+        """skia.Paint(**kwargs); for example paint(Color=skia.ColorRED, AntiAlias=True)."""
+        return self.intern("Paint", skia.Paint, **kwargs)
+
+    def linear_gradient(self, points, colors, positions=None, mode=skia.TileMode.kClamp):
+        return self.intern("Shader", skia.GradientShader.MakeLinear, points, colors, positions, mode)
+
+    def blur(self, sigma_x, sigma_y=None, tile_mode=skia.TileMode.kDecal, input=None):
+        sigma_y = sigma_x if sigma_y is None else sigma_y
+        return self.intern("ImageFilter", skia.ImageFilters.Blur, sigma_x, sigma_y, tile_mode, input)
+
+    def end_frame(self):
+        """The number of objects made since the last call."""
+        self.frames += 1
+        self.last_frame_created = self.frame_created
+        self.frame_created = 0
+        return self.last_frame_created
+
+    def stats(self):
+        made = ", ".join("%d %s" % (count, kind) for kind, count in sorted(self.created.items()))
+        return ("styles: %s made, %d reused, %d made in the last of %d frames" %
+                (made or "none", self.hits, self.last_frame_created, self.frames))
+
+_styles = None
+
+def get_styles():
+    """The process-wide StyleCache."""
+    global _styles
+    if _styles is None:
+        _styles = StyleCache()
+    return _styles
@@ -38,10 +38,13 @@ context = skia.GrDirectContext.MakeGL()
 assert context is not None
 
 import sys, os
+from mapped_input import load_svg, report_rss
 svg_path = sys.argv[1]
 if os.path.exists(svg_path):
-    svgstream = skia.Stream.MakeFromFile(svg_path)
-    svg_picture = skia.SVGDOM.MakeFromStream(svgstream)
+    # Mapped, rather than read into memory
+    rss = report_rss("before loading")
+    svg_picture = load_svg(svg_path)
+    report_rss("after loading", rss)
 
 (fb_width, fb_height) = glfw.get_framebuffer_size(window)
 backend_render_target = skia.GrBackendRenderTarget(
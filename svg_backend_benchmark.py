@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Headless side-by-side benchmark of the two SVG engines used by the viewers:
+#  wx.svg (nanosvg, through RenderToGC - WX-SVG-Viewer.py) and skia.SVGDOM
+#  (SKIA-WX-GPU-SVG-Viewer.py).
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  For every SVG file and engine, in a fresh process (so that peak memory
+#  is that engine's alone), this measures:
+#
+#     - parse time;
+#     - first render time, at zoom 1;
+#     - steady-state re-render time, at each zoom level, under the same
+#       transform as the viewers (document centred in the viewport);
+#     - peak resident memory.
+#
+#  Pixel agreement is checked at zoom 1, on a white background: the mean
+#  absolute channel difference, and the fraction of pixels differing by
+#  more than a tolerance in any channel.
+#
+#  Usage:
+#
+#      python svg_backend_benchmark.py [--gl] [-z 0.5,1,2,4] [-r 10] [--json out.json] file.svg dir ...
+#
+#  With --gl, skia.SVGDOM renders to a GL surface (hidden GLFW window), as
+#  in the GPU viewer; otherwise to a raster surface.
+
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+
+import numpy as np
+
+WIDTH, HEIGHT = 800, 600
+ENGINES = ("wx.svg", "skia.SVGDOM")
+
+def peak_rss():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+class WxEngine:
+    def __init__(self, gl=False):
+        import wx
+        self.wx = wx
+        self.app = wx.App(False)
+        self.bitmap = wx.Bitmap(WIDTH, HEIGHT, 32)
+
+    def parse(self, path):
+        import wx.svg
+        svg = wx.svg.SVGimage.CreateFromFile(path)
+        return svg, svg.width, svg.height
+
+    def render(self, doc, doc_w, doc_h, zoom):
+        wx = self.wx
+        dc = wx.MemoryDC(self.bitmap)
+        dc.SetBackground(wx.Brush('white'))
+        dc.Clear()
+        ctx = wx.GraphicsContext.Create(dc)
+        ctx.Translate(WIDTH / 2, HEIGHT / 2)
+        ctx.Scale(zoom, zoom)
+        ctx.Translate(- doc_w / 2, - doc_h / 2)
+        doc.RenderToGC(ctx, 1.0)
+        # Rendering may be deferred until the context is gone
+        del ctx
+        dc.SelectObject(wx.NullBitmap)
+
+    def pixels(self):
+        image = self.bitmap.ConvertToImage()
+        return np.frombuffer(bytes(image.GetData()), np.uint8).reshape(HEIGHT, WIDTH, 3)
+
+class SkiaEngine:
+    def __init__(self, gl=False):
+        import skia
+        self.skia = skia
+        info = skia.ImageInfo.MakeN32Premul(WIDTH, HEIGHT)
+        self.surface = None
+        if gl:
+            from particle_atlas import make_gl_context
+            self.window, self.context = make_gl_context()
+            self.surface = skia.Surface.MakeRenderTarget(self.context, skia.Budgeted.kNo, info)
+        if self.surface is None:
+            self.surface = skia.Surface.MakeRaster(info)
+
+    def parse(self, path):
+        from mapped_input import load_svg
+        dom = load_svg(path)
+        if dom is None:
+            raise ValueError("not a valid SVG file")
+        size = dom.containerSize()
+        return dom, size.width(), size.height()
+
+    def render(self, doc, doc_w, doc_h, zoom):
+        skia = self.skia
+        canvas = self.surface.getCanvas()
+        canvas.clear(skia.ColorWHITE)
+        canvas.save()
+        canvas.translate(WIDTH / 2, HEIGHT / 2)
+        canvas.scale(zoom, zoom)
+        canvas.translate(- doc_w / 2, - doc_h / 2)
+        doc.render(canvas)
+        canvas.restore()
+        # Include the GPU work, not just recording it
+        self.surface.flushAndSubmit(skia.GrSyncCpu.kYes)
+
+    def pixels(self):
+        skia = self.skia
+        info = skia.ImageInfo.Make(WIDTH, HEIGHT, skia.kRGBA_8888_ColorType, skia.kUnpremul_AlphaType)
+        rgba = np.zeros((HEIGHT, WIDTH, 4), np.uint8)
+        self.surface.readPixels(info, rgba, WIDTH * 4)
+        return rgba[:, :, :3]
+
+def run_engine(engine, path, zooms, repeats, gl):
+    """In a fresh process: timings, peak memory and the zoom 1 pixels of one engine on one file."""
+    result = {"engine": engine, "file": path, "error": None}
+    try:
+        backend = (WxEngine if engine == "wx.svg" else SkiaEngine)(gl)
+        result["rss_base"] = peak_rss()
+        start = time.perf_counter()
+        doc, doc_w, doc_h = backend.parse(path)
+        result["parse_ms"] = 1000 * (time.perf_counter() - start)
+        result["size"] = [doc_w, doc_h]
+        start = time.perf_counter()
+        backend.render(doc, doc_w, doc_h, 1.0)
+        result["first_render_ms"] = 1000 * (time.perf_counter() - start)
+        pixels = backend.pixels()
+        result["steady_ms"] = {}
+        for zoom in zooms:
+            backend.render(doc, doc_w, doc_h, zoom) # warm-up at this scale
+            start = time.perf_counter()
+            for i in range(repeats):
+                backend.render(doc, doc_w, doc_h, zoom)
+            result["steady_ms"][str(zoom)] = 1000 * (time.perf_counter() - start) / repeats
+        result["peak_rss"] = peak_rss()
+        return result, pixels.tobytes()
+    except Exception as e:
+        result["error"] = "%s: %s" % (type(e).__name__, e)
+        return result, None
+
+def agreement(a, b, tolerance):
+    a = np.frombuffer(a, np.uint8).reshape(HEIGHT, WIDTH, 3).astype(np.int16)
+    b = np.frombuffer(b, np.uint8).reshape(HEIGHT, WIDTH, 3).astype(np.int16)
+    diff = np.abs(a - b)
+    return {
+        "mean_abs_diff": float(diff.mean()),
+        "pixels_differing": float((diff.max(axis=2) > tolerance).mean()),
+    }
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark wx.svg (nanosvg) against skia.SVGDOM")
+    parser.add_argument("inputs", nargs="+", help="SVG files, directories or globs")
+    parser.add_argument("-z", "--zooms", default="0.25,0.5,1,2,4", help="comma-separated zoom levels")
+    parser.add_argument("-r", "--repeats", type=int, default=10, help="re-renders per zoom level")
+    parser.add_argument("-t", "--tolerance", type=int, default=16, help="per-channel pixel tolerance")
+    parser.add_argument("--gl", action="store_true", help="render skia.SVGDOM on a GL surface")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv[1:])
+
+    # Not at module level: the wx.svg worker processes should not pay for importing skia
+    from svg_batch_render import collect_inputs
+    zooms = [float(z) for z in args.zooms.split(",")]
+    files = collect_inputs(args.inputs)
+    if not files:
+        print("No SVG files found.")
+        return 1
+
+    # One process per engine and file, not reused, so peak RSS is per run
+    mp = multiprocessing.get_context("spawn")
+    results = []
+    print("%-28s %-12s %9s %9s %11s %s" %
+          ("file", "engine", "parse ms", "first ms", "peak MB", " ".join("%7sx" % z for z in zooms)))
+    for path in files:
+        pixels = {}
+        for engine in ENGINES:
+            with mp.Pool(1, maxtasksperchild=1) as pool:
+                result, pixels[engine] = pool.apply(run_engine, (engine, path, zooms, args.repeats, args.gl))
+            results.append(result)
+            name = path if len(path) <= 28 else "..." + path[-25:]
+            if result["error"]:
+                print("%-28s %-12s FAILED %s" % (name, engine, result["error"]))
+                continue
+            print("%-28s %-12s %9.1f %9.1f %11.1f %s" %
+                  (name, engine, result["parse_ms"], result["first_render_ms"],
+                   result["peak_rss"] / (1 << 20),
+                   " ".join("%8.2f" % result["steady_ms"][str(z)] for z in zooms)))
+        if all(pixels[engine] is not None for engine in ENGINES):
+            match = agreement(pixels[ENGINES[0]], pixels[ENGINES[1]], args.tolerance)
+            match["file"] = path
+            results.append(match)
+            print("%-28s agreement at zoom 1: mean abs diff %.2f, %.2f%% of pixels differ by more than %d" %
+                  ("", match["mean_abs_diff"], 100 * match["pixels_differing"], args.tolerance))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"zooms": zooms, "repeats": args.repeats, "gl": args.gl,
+                       "viewport": [WIDTH, HEIGHT], "results": results}, f, indent=2)
+    # An engine that cannot render anything is a broken setup, not a result
+    status = 0
+    for engine in ENGINES:
+        runs = [result for result in results if result.get("engine") == engine]
+        if runs and all(result["error"] for result in runs):
+            print("error: %s failed on every file, first with %s" % (engine, runs[0]["error"]), file=sys.stderr)
+            status = 1
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Headless, parallel batch SVG to PNG/WebP rasterizer, built on skia.SVGDOM.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  svg-viewer-glfw.py renders one SVG into a visible window. This renders
+#  any number of them, at several scales, across a process pool, onto
+#  raster Surfaces sized from containerSize(). Each output file is written
+#  by its worker as soon as it is encoded, and a JSON manifest records the
+#  per-file parse/render/encode timings, worker resident memory before and
+#  after parsing, outputs and failures. Input files are memory-mapped.
+#
+#  Usage:
+#
+#      python svg_batch_render.py [-o out] [-s 1,2] [-f png|webp] [-j N] dir 'glob/**/*.svg' file.svg ...
+#
+#  Output files mirror the input directory structure under the output
+#  directory, named <name>@<scale>x.<format>.
+
+import os
+import sys
+import glob
+import json
+import math
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import skia
+
+from mapped_input import load_svg, rss_bytes
+
+FORMATS = {
+    "png": skia.EncodedImageFormat.kPNG,
+    "webp": skia.EncodedImageFormat.kWEBP,
+}
+
+# For documents without an intrinsic size (no width/height attributes)
+DEFAULT_SIZE = 512
+
+def collect_inputs(inputs):
+    """Files from directories (recursively), globs and plain file names, in order, without duplicates."""
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(glob.glob(os.path.join(item, "**", "*.svg"), recursive=True))
+        elif os.path.isfile(item):
+            matches = [item]
+        else:
+            matches = sorted(glob.glob(item, recursive=True))
+        for path in matches:
+            path = os.path.abspath(path)
+            if path not in files:
+                files.append(path)
+    return files
+
+def output_name(path, root, out_dir, scale, fmt):
+    rel = os.path.relpath(path, root)
+    stem = os.path.splitext(rel)[0]
+    return os.path.join(out_dir, "%s@%gx.%s" % (stem, scale, fmt))
+
+def render_file(path, root, out_dir, scales, fmt, quality):
+    """Worker: parse once, then render, encode and write each scale. Returns a manifest record."""
+    record = {"input": path, "outputs": [], "error": None}
+    try:
+        # The file is mapped, not read: see how much the parse itself costs
+        record["rss_before"] = rss_bytes()
+        start = time.perf_counter()
+        dom = load_svg(path)
+        if dom is None:
+            raise ValueError("not a valid SVG file")
+        record["parse_ms"] = 1000 * (time.perf_counter() - start)
+        record["rss_after_parse"] = rss_bytes()
+        size = dom.containerSize()
+        width, height = size.width(), size.height()
+        if width <= 0 or height <= 0:
+            width = height = DEFAULT_SIZE
+            dom.setContainerSize(skia.Size(width, height))
+        record["size"] = [width, height]
+        for scale in scales:
+            out = output_name(path, root, out_dir, scale, fmt)
+            start = time.perf_counter()
+            surface = skia.Surface.MakeRaster(skia.ImageInfo.MakeN32Premul(
+                max(1, math.ceil(width * scale)), max(1, math.ceil(height * scale))))
+            canvas = surface.getCanvas()
+            canvas.clear(skia.ColorTRANSPARENT)
+            canvas.scale(scale, scale)
+            dom.render(canvas)
+            image = surface.makeImageSnapshot()
+            rendered = time.perf_counter()
+            data = image.encodeToData(FORMATS[fmt], quality)
+            if data is None:
+                raise RuntimeError("%s encoding failed" % fmt)
+            encoded = time.perf_counter()
+            os.makedirs(os.path.dirname(out), exist_ok=True)
+            with open(out, "wb") as f:
+                f.write(data.bytes())
+            record["outputs"].append({
+                "scale": scale,
+                "path": out,
+                "width": image.width(),
+                "height": image.height(),
+                "bytes": data.size(),
+                "render_ms": 1000 * (rendered - start),
+                "encode_ms": 1000 * (encoded - rendered),
+            })
+    except Exception as e:
+        record["error"] = "%s: %s" % (type(e).__name__, e)
+    return record
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Rasterize SVG files to PNG/WebP with skia.SVGDOM")
+    parser.add_argument("inputs", nargs="+", help="SVG files, directories or globs")
+    parser.add_argument("-o", "--output", default="svg_output", help="output directory")
+    parser.add_argument("-s", "--scales", default="1", help="comma-separated output scales, e.g. 1,2,0.5")
+    parser.add_argument("-f", "--format", choices=sorted(FORMATS), default="png")
+    parser.add_argument("-q", "--quality", type=int, default=100, help="encoder quality (WebP)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("-m", "--manifest", help="JSON manifest (default: <output>/manifest.json)")
+    args = parser.parse_args(argv[1:])
+
+    scales = [float(s) for s in args.scales.split(",")]
+    files = collect_inputs(args.inputs)
+    if not files:
+        print("No SVG files found.")
+        return 1
+    root = os.path.commonpath([os.path.dirname(f) for f in files])
+    out_dir = os.path.abspath(args.output)
+    manifest_path = args.manifest or os.path.join(out_dir, "manifest.json")
+
+    start = time.perf_counter()
+    records = []
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [pool.submit(render_file, path, root, out_dir, scales, args.format, args.quality)
+                   for path in files]
+        for future in as_completed(futures):
+            record = future.result()
+            records.append(record)
+            if record["error"]:
+                print("FAILED %s: %s" % (record["input"], record["error"]))
+            else:
+                print("%4d/%d %s (parse %.1f ms)" %
+                      (len(records), len(files), record["input"], record["parse_ms"]))
+    elapsed = time.perf_counter() - start
+
+    failures = [r for r in records if r["error"]]
+    manifest = {
+        "format": args.format,
+        "scales": scales,
+        "jobs": args.jobs,
+        "files": len(files),
+        "failures": len(failures),
+        "elapsed_s": elapsed,
+        "records": sorted(records, key=lambda r: r["input"]),
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    print("%d files, %d failed, in %.2f s; manifest: %s" %
+          (len(files), len(failures), elapsed, manifest_path))
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
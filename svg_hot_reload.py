@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Hot reload of SVG files being edited, for the viewers' watch mode.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  FileWatcher polls the file's size and mtime (portable, and cheap at a few
+#  polls per second; no inotify/FSEvents dependency), and reports a change
+#  only once the file has stopped changing, so a save in progress is not
+#  picked up half-written.
+#
+#  reload_svg_file() runs in the viewer's worker process: it parses and
+#  records the new version, like async_loader.record_svg_file(), and also
+#  finds which areas of the document changed, by rendering the old and the
+#  new recording at a reduced resolution and comparing them cell by cell.
+#  The viewer keeps the cached tiles outside those areas (see
+#  SVGTileCache.carry_over()), so only the edited parts are re-rendered.
+#
+#  Changes are detected at the diff resolution (by default, the document
+#  fitted into 2048 pixels): a change too small to alter any pixel there
+#  is missed until the next change nearby, or a re-open.
+#
+#  Usage:
+#
+#      watcher = FileWatcher(path)
+#      ... every interval (e.g. from a toolkit timer):
+#      if watcher.poll():
+#          loader.load(reload_svg_file, path, old_picture_data, ...)
+
+import os
+
+class FileWatcher:
+    def __init__(self, path, interval=0.25):
+        self.path = path
+        self.interval = interval
+        self.current = self._signature()
+        self.pending = self.current
+        self.changes = 0
+
+    def _signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None # e.g. in the middle of a save by rename
+        return st.st_size, st.st_mtime_ns
+
+    def poll(self):
+        """True once per change, after the file has been unchanged for one interval."""
+        signature = self._signature()
+        if signature != self.pending:
+            self.pending = signature
+            return False # still being written; wait for it to settle
+        if signature is None or signature == self.current:
+            return False
+        self.current = signature
+        self.changes += 1
+        return True
+
+def dirty_regions(old_picture, new_picture, doc_w, doc_h, resolution=2048, cell=16):
+    """Document-space rectangles covering everything that renders differently."""
+    import numpy as np
+    import skia
+    scale = min(1.0, resolution / max(doc_w, doc_h, 1))
+    width = max(1, int(doc_w * scale + 0.5))
+    height = max(1, int(doc_h * scale + 0.5))
+    info = skia.ImageInfo.MakeN32Premul(width, height)
+    pixels = []
+    for picture in (old_picture, new_picture):
+        surface = skia.Surface.MakeRaster(info)
+        canvas = surface.getCanvas()
+        canvas.clear(skia.ColorTRANSPARENT)
+        canvas.scale(scale, scale)
+        canvas.drawPicture(picture)
+        array = np.zeros((height, width, 4), np.uint8)
+        surface.readPixels(info, array, width * 4)
+        pixels.append(array)
+    changed = np.any(pixels[0] != pixels[1], axis=2)
+    # Per cell, padded by a cell on each side for antialiasing and blur
+    rows = -(-height // cell)
+    cols = -(-width // cell)
+    padded = np.zeros((rows * cell, cols * cell), bool)
+    padded[:height, :width] = changed
+    cells = padded.reshape(rows, cell, cols, cell).any(axis=(1, 3))
+    rects = []
+    size = cell / scale
+    for row in range(rows):
+        # Runs of dirty cells along each row, as one rectangle each
+        col = 0
+        while col < cols:
+            if not cells[row, col]:
+                col += 1
+                continue
+            start = col
+            while col < cols and cells[row, col]:
+                col += 1
+            rects.append(skia.Rect.MakeLTRB((start - 1) * size, (row - 1) * size,
+                                            (col + 1) * size, (row + 2) * size))
+    return rects
+
+def reload_svg_file(path, old_data, old_size):
+    """Worker side: record_svg_file() of the new version, plus its dirty regions against
+    the old recording (serialized picture bytes), or None if everything changed."""
+    from async_loader import record_svg_file, picture_from_bytes
+    data, size, timings = record_svg_file(path)
+    if old_data is None or tuple(size) != tuple(old_size):
+        return data, size, timings, None
+    dirty = dirty_regions(picture_from_bytes(old_data), picture_from_bytes(data), *size)
+    # skia.Rect does not pickle
+    return data, size, timings, [(r.left(), r.top(), r.right(), r.bottom()) for r in dirty]
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Record SVGDOM output once into a skia.Picture, and replay it.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  SVGDOM.render() walks the whole DOM tree (resolving styles, references,
+#  building paths) on every call. Recording that once into a Picture, and
+#  replaying it with drawPicture() under the pan/zoom matrix, leaves only
+#  the drawing. The recording is redone only when the document or its
+#  container size changes. The Picture is recorded with an R-tree, so that
+#  drawing it under a clip (a tile, a band of a preview) only replays the
+#  drawing inside the clip.
+#
+#  RecordedSVG.render(canvas) has the same signature as SVGDOM.render(canvas),
+#  so it can be used wherever the latter is (e.g. for SVGTileCache).
+#  RecordedSVG.from_picture() wraps a Picture recorded elsewhere (e.g. in a
+#  worker process), without a DOM to re-record from. A serialized Picture
+#  comes back without its R-tree, so it is played back into a new one.
+#
+#  Run as a script to benchmark direct SVGDOM.render against replaying the
+#  Picture, under a series of pan/zoom matrices, for skia-logo.svg, a
+#  generated large SVG, and any SVG files given:
+#
+#      python svg_recorder.py [file.svg ...]
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+import skia
+
+from mapped_input import load_svg
+
+def record_indexed(bounds, draw):
+    """Record draw(canvas) into a Picture with an R-tree of its drawing."""
+    recorder = skia.PictureRecorder()
+    draw(recorder.beginRecording(bounds, skia.RTreeFactory()()))
+    return recorder.finishRecordingAsPicture()
+
+class RecordedSVG:
+    def __init__(self, dom, picture=None, size=None):
+        self.dom = dom
+        self._picture = picture
+        self._size = size
+        self.recordings = 0
+
+    @classmethod
+    def from_picture(cls, picture, width, height):
+        return cls(None, record_indexed(picture.cullRect(), picture.playback), skia.Size(width, height))
+
+    def container_size(self):
+        if self.dom is None:
+            return self._size
+        return self.dom.containerSize()
+
+    def set_container_size(self, size):
+        if self.dom is not None and size != self.dom.containerSize():
+            self.dom.setContainerSize(size)
+            self.invalidate()
+
+    def set_document(self, dom):
+        self.dom = dom
+        self.invalidate()
+
+    def invalidate(self):
+        if self.dom is not None:
+            self._picture = None
+
+    def picture(self):
+        if self._picture is None:
+            size = self.dom.containerSize()
+            self._picture = record_indexed(skia.Rect.MakeWH(size.width(), size.height()), self.dom.render)
+            self.recordings += 1
+        return self._picture
+
+    def render(self, canvas):
+        canvas.drawPicture(self.picture())
+
+def generate_large_svg(path, shapes=20000, width=4000, height=4000, seed=0):
+    """Write an SVG of random curves, circles and text, for benchmarking."""
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%d">\n' % (width, height))
+        for i in range(shapes):
+            x, y = rng.uniform(0, width), rng.uniform(0, height)
+            color = "#%06x" % rng.randrange(1 << 24)
+            kind = i % 3
+            if kind == 0:
+                points = " ".join("%.1f,%.1f" % (x + rng.uniform(-80, 80), y + rng.uniform(-80, 80))
+                                  for j in range(6))
+                f.write('<path d="M%.1f,%.1f C%s" stroke="%s" fill="none" stroke-width="2"/>\n' %
+                        (x, y, points, color))
+            elif kind == 1:
+                f.write('<circle cx="%.1f" cy="%.1f" r="%.1f" fill="%s" fill-opacity="0.5"/>\n' %
+                        (x, y, rng.uniform(2, 40), color))
+            else:
+                f.write('<text x="%.1f" y="%.1f" font-size="%d" fill="%s">label %d</text>\n' %
+                        (x, y, rng.randrange(8, 32), color, i))
+        f.write('</svg>\n')
+
+def pan_zoom_matrices(frames, width, height):
+    """A pan and zoom path, like an interactive session in the viewers."""
+    matrices = []
+    for i in range(frames):
+        zoom = 1.1 ** ((i % 40) - 20)
+        m = skia.Matrix()
+        m.setTranslate(width / 2 + 5 * (i % 50), height / 2 - 3 * (i % 70))
+        m.preScale(zoom, zoom)
+        matrices.append(m)
+    return matrices
+
+def time_render(surface, render, matrices):
+    canvas = surface.getCanvas()
+    start = time.perf_counter()
+    for m in matrices:
+        canvas.clear(skia.ColorWHITE)
+        canvas.save()
+        canvas.concat(m)
+        render(canvas)
+        canvas.restore()
+        surface.flushAndSubmit()
+    return (time.perf_counter() - start) / len(matrices)
+
+def benchmark(name, path, surface, frames=60):
+    start = time.perf_counter()
+    dom = load_svg(path)
+    parse = time.perf_counter() - start
+    if dom is None:
+        print("%-24s failed to parse" % name)
+        return
+    matrices = pan_zoom_matrices(frames, surface.width(), surface.height())
+    direct = time_render(surface, dom.render, matrices)
+    recorded = RecordedSVG(dom)
+    start = time.perf_counter()
+    recorded.picture()
+    record = time.perf_counter() - start
+    replay = time_render(surface, recorded.render, matrices)
+    print("%-24s %9.1f %9.1f %11.2f %11.2f %7.1fx" %
+          (name, 1000 * parse, 1000 * record, 1000 * direct, 1000 * replay,
+           direct / replay if replay > 0 else 0))
+
+def main(argv):
+    surface = skia.Surface.MakeRaster(skia.ImageInfo.MakeN32Premul(800, 600))
+    print("%-24s %9s %9s %11s %11s %8s" %
+          ("document", "parse ms", "record ms", "render ms/f", "replay ms/f", "speedup"))
+    here = os.path.dirname(os.path.abspath(__file__))
+    benchmark("skia-logo.svg", os.path.join(here, "skia-logo.svg"), surface)
+    with tempfile.TemporaryDirectory() as tmp:
+        large = os.path.join(tmp, "large.svg")
+        generate_large_svg(large)
+        benchmark("generated (20000 shapes)", large, surface)
+    for path in argv[1:]:
+        benchmark(os.path.basename(path), path, surface)
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  File browser grid of SVG thumbnails, backed by the on-disk thumbnail cache.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  Thumbnails already in the cache (see thumbnail_cache.py) are shown at
+#  once; the rest are rendered with skia.SVGDOM across a process pool, and
+#  fill in as they complete. A second visit to the same directory - or to
+#  copies of the same files elsewhere - is then instant.
+#
+#  Usage:
+#
+#      python svg_thumbnail_browser.py [-s size] [-j N] dir 'glob/**/*.svg' file.svg ...
+#
+#  Double-click a thumbnail to print its path.
+
+# python imports
+import io
+import os
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+# pip imports
+import wx
+# local imports
+from svg_batch_render import collect_inputs
+from thumbnail_cache import ThumbnailCache, thumbnail_worker
+
+
+class ThumbnailGrid(wx.ScrolledWindow):
+    def __init__(self, parent, size):
+        super().__init__(parent)
+        self.size = size
+        self.SetScrollRate(0, 20)
+        self.sizer = wx.WrapSizer(wx.HORIZONTAL)
+        self.SetSizer(self.sizer)
+        self.cells = {}
+        blank = wx.Image(size, size)
+        blank.InitAlpha()
+        blank.Clear(0)
+        self.blank = wx.Bitmap(blank)
+
+    def add(self, path):
+        cell = wx.Panel(self)
+        column = wx.BoxSizer(wx.VERTICAL)
+        bitmap = wx.StaticBitmap(cell, bitmap=self.blank)
+        bitmap.Bind(wx.EVT_LEFT_DCLICK, lambda event: print(path))
+        column.Add(bitmap, flag=wx.ALIGN_CENTER)
+        label = wx.StaticText(cell, label=os.path.basename(path), size=(self.size, -1),
+                              style=wx.ST_ELLIPSIZE_MIDDLE | wx.ALIGN_CENTER_HORIZONTAL)
+        column.Add(label, flag=wx.ALIGN_CENTER)
+        cell.SetSizer(column)
+        self.sizer.Add(cell, flag=wx.ALL, border=6)
+        self.cells[path] = bitmap
+
+    def set_thumbnail(self, path, data):
+        self.cells[path].SetBitmap(wx.Bitmap(wx.Image(io.BytesIO(data))))
+
+    def set_failed(self, path, error):
+        self.cells[path].SetToolTip(error)
+
+
+class MainFrame(wx.Frame):
+    def __init__(self, files, size, jobs):
+        super().__init__(None, title="SVG Thumbnails", size=(1000, 700))
+        self.size = size
+        self.grid = ThumbnailGrid(self, size)
+        self.CreateStatusBar()
+        self.thumbnails = ThumbnailCache()
+        self.pool = ProcessPoolExecutor(max_workers=jobs)
+        self.total = len(files)
+        self.done = 0
+        self.from_cache = 0
+        self.failed = 0
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+
+        for path in files:
+            self.grid.add(path)
+        self.grid.FitInside()
+        for path in files:
+            # Hits from the index need no hashing, so are shown straight away
+            try:
+                data = self.thumbnails.lookup(path, size, size, compute=False)
+            except OSError:
+                data = None
+            if data is not None:
+                self.from_cache += 1
+                self.on_thumbnail(path, data, None)
+                continue
+            future = self.pool.submit(thumbnail_worker, self.thumbnails.cache_dir,
+                                      self.thumbnails.max_bytes, path, size, size)
+            future.add_done_callback(self.on_done)
+        self.update_status()
+
+    def on_done(self, future):
+        # On a pool thread
+        if not future.cancelled():
+            wx.CallAfter(self.on_thumbnail, *future.result())
+
+    def on_thumbnail(self, path, data, error):
+        if not self:
+            return # window already closed
+        self.done += 1
+        if error is not None:
+            self.failed += 1
+            self.grid.set_failed(path, error)
+        else:
+            self.grid.set_thumbnail(path, data)
+        self.update_status()
+
+    def update_status(self):
+        self.SetStatusText("%d/%d thumbnails, %d from cache, %d failed" %
+                           (self.done, self.total, self.from_cache, self.failed))
+
+    def on_close(self, event):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        print("%d thumbnails (%d from cache, %d rendered, %d failed)" %
+              (self.done, self.from_cache, self.done - self.from_cache - self.failed, self.failed))
+        event.Skip()
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Browse SVG files as a grid of cached thumbnails")
+    parser.add_argument("inputs", nargs="+", help="SVG files, directories or globs")
+    parser.add_argument("-s", "--size", type=int, default=128, help="thumbnail size")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    args = parser.parse_args(argv[1:])
+
+    files = collect_inputs(args.inputs)
+    if not files:
+        print("No SVG files found.")
+        return 1
+    app = wx.App(False)
+    frame = MainFrame(files, args.size, args.jobs)
+    frame.Show()
+    app.MainLoop()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
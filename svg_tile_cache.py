@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Zoom-level tile cache for the Skia SVG viewers.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  Rendering a large SVG (the tiger, maps, schematics) re-walks and
+#  re-tessellates every path, and used to happen on every pan and zoom
+#  event. Here the document is rasterized, on demand, into square tiles at
+#  a quantized zoom level ("bucket", half an octave apart); panning, and
+#  zooming within a bucket, only composites cached tiles. Tiles are GPU
+#  images if a GrDirectContext is given, raster images otherwise. They are
+#  kept in LRU order and evicted by a memory budget, and a few tiles of
+#  the ring just outside the viewport are prefetched each frame.
+#
+#  Document space maps to the screen by  screen = scale * doc + (dx, dy).
+#
+#  Usage:
+#
+#      tiles = SVGTileCache(context=grContext)
+#      ... every frame:
+#      tiles.draw(canvas, key, svg.render, doc_w, doc_h, scale, dx, dy, w, h)
+#      ... when the document (or what it looks like) changes:
+#      tiles.invalidate(key)
+#      ... or, when only some areas of it changed:
+#      tiles.carry_over(key, new_key, dirty_rects)
+
+import math
+from collections import OrderedDict
+
+import skia
+
+class SVGTileCache:
+    def __init__(self, context=None, tile_size=256, budget=64 << 20,
+                 prefetch_per_frame=2, buckets_per_octave=2):
+        self.context = context
+        self.tile_size = tile_size
+        self.budget = budget
+        self.prefetch_per_frame = prefetch_per_frame
+        self.buckets_per_octave = buckets_per_octave
+        self.tiles = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.evictions = 0
+        self.sampling = skia.SamplingOptions(skia.FilterMode.kLinear)
+
+    def bucket(self, scale):
+        """The zoom bucket at or just above scale, so tiles are only ever scaled down."""
+        return math.ceil(math.log2(scale) * self.buckets_per_octave - 1e-6)
+
+    def bucket_scale(self, bucket):
+        return 2.0 ** (bucket / self.buckets_per_octave)
+
+    def _make_surface(self):
+        info = skia.ImageInfo.MakeN32Premul(self.tile_size, self.tile_size)
+        if self.context is not None:
+            surface = skia.Surface.MakeRenderTarget(self.context, skia.Budgeted.kYes, info)
+            if surface is not None:
+                return surface
+        return skia.Surface.MakeRaster(info)
+
+    def render_tile(self, key, render):
+        doc, bucket, tx, ty = key
+        surface = self._make_surface()
+        canvas = surface.getCanvas()
+        canvas.clear(skia.ColorTRANSPARENT)
+        canvas.translate(-tx * self.tile_size, -ty * self.tile_size)
+        s = self.bucket_scale(bucket)
+        canvas.scale(s, s)
+        render(canvas)
+        image = surface.makeImageSnapshot()
+        if key not in self.tiles:
+            self.bytes += self.tile_size * self.tile_size * 4
+        self.tiles[key] = image
+        return image
+
+    def _evict(self, keep):
+        while self.bytes > self.budget and self.tiles:
+            key = next(iter(self.tiles))
+            if key in keep:
+                # Everything left is on screen; go over budget rather than flicker
+                break
+            del self.tiles[key]
+            self.bytes -= self.tile_size * self.tile_size * 4
+            self.evictions += 1
+
+    def _tile_range(self, doc_w, doc_h, bucket, r, dx, dy, w, h, margin):
+        """Tiles covering the viewport (plus margin tiles), clipped to the document."""
+        t = self.tile_size * r
+        s = self.bucket_scale(bucket)
+        last_x = max(0, math.ceil(doc_w * s / self.tile_size) - 1)
+        last_y = max(0, math.ceil(doc_h * s / self.tile_size) - 1)
+        x0 = max(0, math.floor(-dx / t) - margin)
+        y0 = max(0, math.floor(-dy / t) - margin)
+        x1 = min(last_x, math.floor((w - dx) / t) + margin)
+        y1 = min(last_y, math.floor((h - dy) / t) + margin)
+        return x0, y0, x1, y1
+
+    def missing(self, doc, doc_w, doc_h, scale, dx, dy, w, h):
+        """Keys of the visible tiles not yet cached, for rendering them one at a time."""
+        bucket = self.bucket(scale)
+        r = scale / self.bucket_scale(bucket)
+        x0, y0, x1, y1 = self._tile_range(doc_w, doc_h, bucket, r, dx, dy, w, h, 0)
+        return [(doc, bucket, tx, ty)
+                for ty in range(y0, y1 + 1) for tx in range(x0, x1 + 1)
+                if (doc, bucket, tx, ty) not in self.tiles]
+
+    def draw(self, canvas, doc, render, doc_w, doc_h, scale, dx, dy, w, h):
+        """Composite the visible tiles of document doc, rendering any that are missing."""
+        bucket = self.bucket(scale)
+        r = scale / self.bucket_scale(bucket)
+        x0, y0, x1, y1 = self._tile_range(doc_w, doc_h, bucket, r, dx, dy, w, h, 0)
+        visible = set()
+        canvas.save()
+        canvas.translate(dx, dy)
+        canvas.scale(r, r)
+        for ty in range(y0, y1 + 1):
+            for tx in range(x0, x1 + 1):
+                key = (doc, bucket, tx, ty)
+                visible.add(key)
+                image = self.tiles.get(key)
+                if image is None:
+                    self.misses += 1
+                    image = self.render_tile(key, render)
+                else:
+                    self.hits += 1
+                    self.tiles.move_to_end(key)
+                canvas.drawImage(image, tx * self.tile_size, ty * self.tile_size, self.sampling)
+        canvas.restore()
+
+        # Prefetch a few of the ring of tiles just outside the viewport
+        px0, py0, px1, py1 = self._tile_range(doc_w, doc_h, bucket, r, dx, dy, w, h, 1)
+        budget = self.prefetch_per_frame
+        for ty in range(py0, py1 + 1):
+            for tx in range(px0, px1 + 1):
+                if budget <= 0:
+                    break
+                key = (doc, bucket, tx, ty)
+                if key not in visible and key not in self.tiles:
+                    self.render_tile(key, render)
+                    self.tiles.move_to_end(key, last=False) # first to go
+                    self.prefetched += 1
+                    budget -= 1
+        self._evict(visible)
+
+    def invalidate(self, doc=None):
+        """Drop the tiles of doc, or all tiles."""
+        for key in [key for key in self.tiles if doc is None or key[0] == doc]:
+            del self.tiles[key]
+            self.bytes -= self.tile_size * self.tile_size * 4
+
+    def carry_over(self, old_doc, new_doc, dirty):
+        """A new version of a document: keep the tiles of old_doc that intersect none of
+        the dirty rectangles (in document coordinates) as tiles of new_doc, drop the rest."""
+        kept = dropped = 0
+        for key in [key for key in self.tiles if key[0] == old_doc]:
+            doc, bucket, tx, ty = key
+            t = self.tile_size / self.bucket_scale(bucket)
+            bounds = skia.Rect.MakeXYWH(tx * t, ty * t, t, t)
+            image = self.tiles.pop(key)
+            if any(bounds.intersects(rect) for rect in dirty):
+                self.bytes -= self.tile_size * self.tile_size * 4
+                dropped += 1
+            else:
+                # Appended, so the carried-over tiles keep their relative LRU order
+                self.tiles[(new_doc, bucket, tx, ty)] = image
+                kept += 1
+        return kept, dropped
+
+    def stats(self):
+        return ("tiles: %d hits, %d misses, %d prefetched, %d evicted, %d cached (%.1f MiB)" %
+                (self.hits, self.misses, self.prefetched, self.evictions,
+                 len(self.tiles), self.bytes / (1 << 20)))
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Text on a path, with glyph placements computed in bulk and cached.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  canvas.drawTextOnPath() (see draw_text_on_path.py) measures the path and
+#  places every glyph again on every call. Here the path is sampled once
+#  along its contours, the glyph positions and rotations are interpolated
+#  from the samples with NumPy, and the result is one RSXform TextBlob,
+#  kept while the text, font and path are unchanged and drawn with a single
+#  drawTextBlob(). LabelBatch goes one step further, and puts many labels
+#  into one blob.
+#
+#  For labels on a moving path, move the canvas (translate/rotate) rather
+#  than rebuilding the path, and the placements stay cached.
+#
+#  Run as a script to benchmark against repeated drawTextOnPath:
+#
+#      python text_on_path.py [--labels 1000] [--frames 20]
+
+import sys
+import math
+import time
+import argparse
+
+import numpy as np
+import skia
+
+def font_key(font):
+    """Compares fonts by value: the typeface, size, and the other settings
+    that change glyphs or positions."""
+    typeface = font.getTypeface()
+    return (typeface.uniqueID() if typeface is not None else 0,
+            font.getSize(), font.getScaleX(), font.getSkewX(),
+            int(font.getEdging()), int(font.getHinting()),
+            font.isEmbolden(), font.isSubpixel(), font.isLinearMetrics(),
+            font.isForceAutoHinting(), font.isEmbeddedBitmaps(), font.isBaselineSnap())
+
+class PathSampler:
+    """Positions and tangent angles along a path, every step units of length."""
+    def __init__(self, path, step=2.0):
+        points = []
+        angles = []
+        distances = []
+        start = 0.0
+        measure = skia.PathMeasure(path, False)
+        while True:
+            length = measure.getLength()
+            if length > 0:
+                for d in np.append(np.arange(0.0, length, step), length).tolist():
+                    position, tangent = measure.getPosTan(d)
+                    points.append((position.x(), position.y()))
+                    angles.append(math.atan2(tangent.y(), tangent.x()))
+                    distances.append(start + d)
+                start += length
+            if not measure.nextContour():
+                break
+        self.length = start
+        self.distances = np.array(distances)
+        self.points = np.array(points).reshape(-1, 2)
+        # Unwrapped, so interpolating between samples never goes the long way round
+        self.angles = np.unwrap(np.array(angles))
+
+    def sample(self, distances):
+        """(x, y, angle) arrays at the given distances along the path."""
+        x = np.interp(distances, self.distances, self.points[:, 0])
+        y = np.interp(distances, self.distances, self.points[:, 1])
+        angle = np.interp(distances, self.distances, self.angles)
+        return x, y, angle
+
+def glyph_placements(sampler, glyphs, widths, offset=0.0):
+    """Glyph ids and RSXform arrays (scos, ssin, tx, ty) of glyphs along the path,
+    leaving out those whose middle falls outside it, as drawTextOnPath does."""
+    widths = np.asarray(widths, dtype=np.float64)
+    middles = offset + np.cumsum(widths) - widths / 2
+    keep = (middles >= 0) & (middles <= sampler.length)
+    if sampler.length == 0 or not keep.any():
+        # Nothing on the path (empty, or only moveTo): drawTextOnPath draws nothing
+        return np.empty(0, dtype=np.uint16), np.empty((0, 4))
+    middles = middles[keep]
+    half = widths[keep] / 2
+    x, y, angle = sampler.sample(middles)
+    scos, ssin = np.cos(angle), np.sin(angle)
+    # The glyph origin is half its advance back along the tangent from its middle
+    xforms = np.stack([scos, ssin, x - scos * half, y - ssin * half], axis=1)
+    return np.asarray(glyphs, dtype=np.uint16)[keep], xforms
+
+def make_blob(glyphs, xforms, font):
+    if len(glyphs) == 0:
+        return None
+    builder = skia.TextBlobBuilder()
+    builder.allocRunRSXform(font, glyphs.tolist(), list(map(skia.RSXform, *xforms.T.tolist())))
+    return builder.make()
+
+class TextOnPath:
+    """Caches the placement of texts along paths, keyed by text, font and path."""
+    def __init__(self, max_entries=4096, step=2.0):
+        self.max_entries = max_entries
+        self.step = step
+        self.samplers = {}
+        self.blobs = {}
+        self.hits = 0
+        self.misses = 0
+
+    def sampler(self, path):
+        key = path.getGenerationID()
+        sampler = self.samplers.get(key)
+        if sampler is None:
+            if len(self.samplers) >= self.max_entries:
+                self.samplers.clear()
+            sampler = self.samplers[key] = PathSampler(path, self.step)
+        return sampler
+
+    def placements(self, text, path, font, offset=0.0):
+        glyphs = font.textToGlyphs(text)
+        return glyph_placements(self.sampler(path), glyphs, font.getWidths(glyphs), offset)
+
+    def blob(self, text, path, font, offset=0.0):
+        key = (text, path.getGenerationID(), font_key(font), offset)
+        blob = self.blobs.get(key, False)
+        if blob is not False:
+            self.hits += 1
+            return blob
+        self.misses += 1
+        if len(self.blobs) >= self.max_entries:
+            self.blobs.clear()
+        blob = self.blobs[key] = make_blob(*self.placements(text, path, font, offset), font)
+        return blob
+
+    def draw(self, canvas, text, path, font, paint, offset=0.0):
+        """Like canvas.drawTextOnPath(text, path, None, font, paint), from the cache."""
+        blob = self.blob(text, path, font, offset)
+        if blob is not None:
+            canvas.drawTextBlob(blob, 0, 0, paint)
+
+    def stats(self):
+        return "text on path: %d hits, %d misses, %d paths sampled" % (self.hits, self.misses, len(self.samplers))
+
+class LabelBatch:
+    """Many labels on paths in one font, drawn with one drawTextBlob()."""
+    def __init__(self, font, text_on_path=None):
+        self.font = font
+        self.text_on_path = text_on_path if text_on_path is not None else TextOnPath()
+        self.labels = []
+        self._blob = None
+
+    def add(self, text, path, offset=0.0):
+        self.labels.append((text, path, offset))
+        self._blob = None
+
+    def clear(self):
+        self.labels = []
+        self._blob = None
+
+    def blob(self):
+        if self._blob is None and self.labels:
+            placed = [self.text_on_path.placements(text, path, self.font, offset)
+                      for text, path, offset in self.labels]
+            self._blob = make_blob(np.concatenate([glyphs for glyphs, xforms in placed]),
+                                   np.concatenate([xforms for glyphs, xforms in placed]), self.font)
+        return self._blob
+
+    def draw(self, canvas, paint):
+        blob = self.blob()
+        if blob is not None:
+            canvas.drawTextBlob(blob, 0, 0, paint)
+
+def sine_path(x0, y0, length, amplitude, wavelength):
+    path = skia.Path()
+    path.moveTo(x0, y0)
+    for x in range(0, int(length) + 1, 10):
+        path.lineTo(x0 + x, y0 + amplitude * math.sin(2 * math.pi * x / wavelength))
+    return path
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="drawTextOnPath vs cached RSXform text blobs")
+    parser.add_argument("--labels", type=int, default=1000, help="labels per frame")
+    parser.add_argument("--frames", type=int, default=20)
+    args = parser.parse_args(argv[1:])
+
+    surface = skia.Surface.MakeRaster(skia.ImageInfo.MakeN32Premul(1024, 768))
+    canvas = surface.getCanvas()
+    font = skia.Font(skia.Typeface(""), 12)
+    paint = skia.Paint(AntiAlias=True, Color=skia.ColorBLACK)
+    labels = [("label %d along a wave" % i,
+               sine_path((i * 37) % 800, 20 + (i * 53) % 730, 200, 10 + i % 20, 80 + i % 100))
+              for i in range(args.labels)]
+    text_on_path = TextOnPath()
+    batch = LabelBatch(font, text_on_path)
+    for text, path in labels:
+        batch.add(text, path)
+
+    def each_on_path():
+        for text, path in labels:
+            canvas.drawTextOnPath(text, path, None, font, paint)
+
+    def each_cached():
+        for text, path in labels:
+            text_on_path.draw(canvas, text, path, font, paint)
+
+    def one_batch():
+        batch.draw(canvas, paint)
+
+    print("%d labels per frame, %d frames" % (args.labels, args.frames))
+    results = {}
+    for name, frame in (("drawTextOnPath", each_on_path), ("TextOnPath", each_cached), ("LabelBatch", one_batch)):
+        start = time.perf_counter()
+        frame() # the first frame fills the caches
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(args.frames):
+            canvas.clear(skia.ColorWHITE)
+            frame()
+            surface.flushAndSubmit()
+        results[name] = (time.perf_counter() - start) / args.frames
+        print("%-15s first frame %8.2f ms, then %8.2f ms/frame (%.1fx)" %
+              (name, 1000 * first, 1000 * results[name], results["drawTextOnPath"] / results[name]))
+    print(text_on_path.stats())
+
+if __name__ == '__main__':
+    main(sys.argv)
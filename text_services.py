@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Shared, lazily created ICU and FontCollection instances for skia.textlayout.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  Unicodes.ICU.Make() loads the ICU data, and the first FontCollection on a
+#  platform font manager initializes fontconfig (on Linux), which reads its
+#  configuration and caches. Both are expensive, and used to be done by
+#  every script at startup. Here they are made once per process, on first
+#  use, and shared.
+#
+#  Font fallback for the scripts an application uses (by default those in
+#  skparagraph-example.py: Arabic, Devanagari, emoji) can be pre-warmed:
+#
+#     - in the background, with prewarm(): this lays out sample text on a
+#       private FontCollection over the same FontMgr (FontCollection is not
+#       thread-safe), so the font manager's and fontconfig's matching
+#       state is warm by the time the shared collection needs it;
+#     - or synchronously, on the shared collection itself, by
+#       worker_pool(), just before it forks worker processes, which then
+#       inherit the warm state instead of redoing it. (Where processes are
+#       spawned rather than forked, workers start cold.)
+#
+#  fontconfig reads LANG and FC_LANG when it initializes, and its choices
+#  (particularly for CJK) depend on them; configure() sets them before
+#  first use, if that is wanted.
+#
+#  Usage:
+#
+#      import text_services
+#      text_services.prewarm()
+#      builder = textlayout.ParagraphBuilder.make(style, text_services.font_collection(),
+#                                                 text_services.unicodes())
+
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import skia
+from skia import textlayout
+
+# Sample text per script, as in skparagraph-example.py
+WARM_UP_SCRIPTS = {
+    "Latin": "Typography",
+    "Arabic": "العربية نص جميل",
+    "Devanagari": "द क्विक ब्राउन फ़ॉक्स",
+    "Emoji": "🐕",
+}
+
+_lock = threading.Lock()
+_unicodes = None
+_font_mgr = None
+_collections = {}
+_warm_up = None
+_timings = {}
+
+def configure(lang=None, fc_lang=None):
+    """Set LANG / FC_LANG for fontconfig; only effective before first use."""
+    if lang is not None:
+        os.environ["LANG"] = lang
+    if fc_lang is not None:
+        os.environ["FC_LANG"] = fc_lang
+
+def _timed(name, make):
+    start = time.perf_counter()
+    result = make()
+    _timings[name] = _timings.get(name, 0.0) + time.perf_counter() - start
+    return result
+
+def unicodes():
+    """The process's ICU Unicodes instance."""
+    global _unicodes
+    with _lock:
+        if _unicodes is None:
+            _unicodes = _timed("ICU", skia.Unicodes.ICU.Make)
+            if _unicodes is None:
+                raise RuntimeError("Could not load unicode data")
+        return _unicodes
+
+def font_mgr():
+    """The process's platform font manager."""
+    global _font_mgr
+    with _lock:
+        if _font_mgr is None:
+            _font_mgr = _timed("FontMgr", skia.FontMgr)
+        return _font_mgr
+
+def _make_collection(font_file):
+    collection = textlayout.FontCollection()
+    if font_file is None:
+        collection.setDefaultFontManager(font_mgr())
+    else:
+        # A font manager knowing only this one font; see shape_text.py
+        collection.setDefaultFontManager(skia.FontMgr.OneFontMgr(font_file))
+    return collection
+
+def font_collection(font_file=None):
+    """The shared FontCollection on the platform fonts, or on one font file."""
+    collection = _collections.get(font_file)
+    if collection is None:
+        if font_file is None:
+            font_mgr() # timed on its own
+        collection = _timed("FontCollection", lambda: _make_collection(font_file))
+        _collections[font_file] = collection
+    return collection
+
+def _lay_out_samples(collection, scripts):
+    style = textlayout.ParagraphStyle()
+    for name, text in scripts.items():
+        start = time.perf_counter()
+        builder = textlayout.ParagraphBuilder.make(style, collection, unicodes())
+        builder.addText(text)
+        builder.Build().layout(1000)
+        _timings["warm up " + name] = time.perf_counter() - start
+
+def prewarm(scripts=WARM_UP_SCRIPTS):
+    """Warm font fallback for scripts on a background thread; returns the thread."""
+    global _warm_up
+    if _warm_up is None:
+        _warm_up = threading.Thread(target=lambda: _lay_out_samples(_make_collection(None), scripts),
+                                    name="text services warm-up", daemon=True)
+        _warm_up.start()
+    return _warm_up
+
+def worker_pool(max_workers=None, initializer=None, initargs=(), scripts=WARM_UP_SCRIPTS):
+    """A process pool whose workers inherit warm text services, where fork is available."""
+    # Never fork while another thread may hold a lock (fontconfig's, ours)
+    if _warm_up is not None:
+        _warm_up.join()
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(max_workers, initializer=initializer, initargs=initargs)
+    _lay_out_samples(font_collection(), scripts)
+    return ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("fork"),
+                               initializer=initializer, initargs=initargs)
+
+def stats():
+    return "text services: " + ", ".join("%s %.1f ms" % (name, 1000 * t) for name, t in _timings.items())
@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Content-addressed, size-bounded on-disk thumbnail cache for SVG files.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  Thumbnails are stored as encoded images named by the SHA-256 of the
+#  file's content, the thumbnail size and the engine that rendered it (a
+#  viewer rasterizing with nanosvg does not share skia's thumbnails), so a
+#  renamed or copied file still hits, and an edited one misses. To avoid
+#  re-hashing large files on every open, the digest is remembered per
+#  (path, size, mtime) in a small index. The index is written out every
+#  flush_every new digests, and by flush(); call that when done.
+#  When the cache directory grows past its budget, the least recently used
+#  thumbnails are deleted.
+#
+#  Several processes may share one cache directory: files are written
+#  atomically, and a thumbnail vanishing under a concurrent eviction is
+#  just a miss.
+#
+#  Thumbnails are width x height, transparent, with the document fitted
+#  and centred.
+#
+#  Usage:
+#
+#      thumbnails = ThumbnailCache()
+#      data = thumbnails.lookup(path, 256, 256)      # encoded bytes, or None
+#      data = thumbnails.get(path, 256, 256)         # rendered with skia.SVGDOM on a miss
+#      thumbnails.flush()                            # on exit
+#
+#  thumbnail_worker() and picture_thumbnail_worker() do the same in worker
+#  processes, for a file browser grid or after a viewer has loaded a file.
+
+import os
+import json
+import hashlib
+import multiprocessing.util
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "skia-python-examples", "thumbnails")
+
+def fit_transform(doc_w, doc_h, width, height):
+    """Scale and offset fitting a doc_w x doc_h document, centred, into width x height."""
+    if doc_w <= 0 or doc_h <= 0:
+        return 1.0, 0.0, 0.0
+    scale = min(width / doc_w, height / doc_h)
+    return scale, (width - doc_w * scale) / 2, (height - doc_h * scale) / 2
+
+def render_thumbnail(render, doc_w, doc_h, width, height, fmt="png"):
+    """Encoded thumbnail of anything with a render(canvas) (SVGDOM, RecordedSVG...)."""
+    import skia
+    surface = skia.Surface.MakeRaster(skia.ImageInfo.MakeN32Premul(width, height))
+    canvas = surface.getCanvas()
+    canvas.clear(skia.ColorTRANSPARENT)
+    scale, dx, dy = fit_transform(doc_w, doc_h, width, height)
+    canvas.translate(dx, dy)
+    canvas.scale(scale, scale)
+    render(canvas)
+    formats = {"png": skia.EncodedImageFormat.kPNG, "webp": skia.EncodedImageFormat.kWEBP}
+    return surface.makeImageSnapshot().encodeToData(formats[fmt], 90).bytes()
+
+def render_svg_thumbnail(path, width, height, fmt="png"):
+    from mapped_input import load_svg
+    dom = load_svg(path)
+    if dom is None:
+        raise ValueError("not a valid SVG file")
+    size = dom.containerSize()
+    return render_thumbnail(dom.render, size.width(), size.height(), width, height, fmt)
+
+def hash_file(path):
+    """(size, mtime_ns, SHA-256) of a file; touches no cache state, so any thread may call it."""
+    st = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return st.st_size, st.st_mtime_ns, digest.hexdigest()
+
+class ThumbnailCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=128 << 20, fmt="png",
+                 engine="skia", flush_every=64):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.fmt = fmt
+        self.engine = engine
+        self.flush_every = flush_every
+        self.index_path = os.path.join(cache_dir, "index.json")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self._load_index()
+        self.pending = {} # digests not written to the index file yet
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _load_index(self):
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_atomically(self, path, data, mode="wb"):
+        tmp = "%s.%d.tmp" % (path, os.getpid())
+        with open(tmp, mode) as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def file_digest(self, path, compute=True):
+        """SHA-256 of the file content, remembered while its size and mtime are unchanged.
+
+        With compute=False, None unless already known (e.g. from another process)."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        entry = self.index.get(path)
+        if entry is None and not compute:
+            self.index = self._load_index()
+            self.index.update(self.pending)
+            entry = self.index.get(path)
+        if entry is not None and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+        if not compute:
+            return None
+        stamp = hash_file(path)
+        self.remember_digest(path, stamp)
+        return stamp[2]
+
+    def remember_digest(self, path, stamp):
+        """Record hash_file(path), made elsewhere (e.g. on a worker thread), in the index."""
+        path = os.path.abspath(path)
+        self.index[path] = self.pending[path] = list(stamp)
+        if len(self.pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Write the digests remembered since the last flush to the index file."""
+        if not self.pending:
+            return
+        # Merge with what other processes have added meanwhile
+        index = self._load_index()
+        index.update(self.pending)
+        self.index = index
+        self._write_atomically(self.index_path, json.dumps(self.index), "w")
+        self.pending = {}
+
+    def thumbnail_path(self, digest, width, height):
+        # Two-level fan-out, so no single directory gets huge
+        return os.path.join(self.cache_dir, digest[:2],
+                            "%s-%dx%d-%s.%s" % (digest, width, height, self.engine, self.fmt))
+
+    def lookup(self, path, width, height, compute=True):
+        """The cached encoded thumbnail, or None.
+
+        With compute=False, never hashes the file, for instant lookups from a UI thread."""
+        digest = self.file_digest(path, compute)
+        if digest is None:
+            self.misses += 1
+            return None
+        thumb = self.thumbnail_path(digest, width, height)
+        try:
+            with open(thumb, "rb") as f:
+                data = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        # Recently used, for eviction
+        os.utime(thumb)
+        self.hits += 1
+        return data
+
+    def store(self, path, width, height, data):
+        thumb = self.thumbnail_path(self.file_digest(path), width, height)
+        os.makedirs(os.path.dirname(thumb), exist_ok=True)
+        self._write_atomically(thumb, data)
+        # Scanning the cache directory is not free; check the budget every so often
+        if self.stores % 16 == 0:
+            self.evict()
+        self.stores += 1
+
+    def get(self, path, width, height, render=render_svg_thumbnail):
+        """The encoded thumbnail, rendered with render(path, width, height, fmt) on a miss."""
+        data = self.lookup(path, width, height)
+        if data is None:
+            data = render(path, width, height, self.fmt)
+            self.store(path, width, height, data)
+        return data
+
+    def evict(self):
+        """Delete least recently used thumbnails until the cache is within budget."""
+        entries = []
+        total = 0
+        for dirpath, dirnames, filenames in os.walk(self.cache_dir):
+            for name in filenames:
+                if not name.endswith("." + self.fmt):
+                    continue
+                full = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(full)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, full))
+                total += st.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for mtime, size, full in entries:
+            try:
+                os.remove(full)
+                self.evictions += 1
+            except OSError:
+                pass # evicted concurrently
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        return ("thumbnails: %d hits, %d misses, %d evicted" %
+                (self.hits, self.misses, self.evictions))
+
+_worker_cache = None
+
+def _cache_in_worker(cache_dir, max_bytes):
+    global _worker_cache
+    if _worker_cache is None or _worker_cache.cache_dir != cache_dir:
+        if _worker_cache is not None:
+            _worker_cache.flush()
+        _worker_cache = ThumbnailCache(cache_dir, max_bytes)
+        # Digests still pending are written out when the worker process exits
+        multiprocessing.util.Finalize(_worker_cache, _worker_cache.flush, exitpriority=0)
+    return _worker_cache
+
+def thumbnail_worker(cache_dir, max_bytes, path, width, height):
+    """For process pools: (path, encoded thumbnail or None, error or None)."""
+    try:
+        return path, _cache_in_worker(cache_dir, max_bytes).get(path, width, height), None
+    except Exception as e:
+        return path, None, "%s: %s" % (type(e).__name__, e)
+
+def picture_thumbnail_worker(cache_dir, max_bytes, path, picture_data, doc_w, doc_h, width, height):
+    """For process pools: store the thumbnail of an already recorded (serialized) Picture,
+    without parsing the file again."""
+    import skia
+    picture = skia.Picture.MakeFromData(skia.Data.MakeWithCopy(picture_data))
+    cache = _cache_in_worker(cache_dir, max_bytes)
+    data = render_thumbnail(lambda canvas: canvas.drawPicture(picture),
+                            doc_w, doc_h, width, height, cache.fmt)
+    cache.store(path, width, height, data)
+    # One file at a time, as the viewer opens them: let its next lookup find the digest
+    cache.flush()
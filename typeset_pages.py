@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  Typeset a long document into pages, rasterizing the pages in parallel.
+#
+#  Copyright 2025 Hin-Tak Leung
+#  Distributed under the terms of the new BSD license.
+#
+#  shape_text.py lays out one short story into one image. This streams a
+#  document of any length through skia.textlayout:
+#
+#     - paragraphs are read one at a time, built and laid out at the
+#       column width in this process, measured by their Height, and
+#       dropped again;
+#     - pages are filled from the measurements; a paragraph taller than
+#       the space left is split at a line boundary and continues on the
+#       next page;
+#     - each full page (just its paragraphs' text and offsets) is handed
+#       to a pool of worker processes, which build the paragraphs again
+#       with their own FontCollection and Unicodes.ICU (forked already
+#       warm, see text_services.py), paint them, and write the page as a
+#       PNG file straight away.
+#
+#  Only a bounded number of pages is in flight at any time, so memory use
+#  does not grow with the length of the document.
+#
+#  Line boundaries for splitting are taken from the body line height
+#  (measured once), which is exact for single-style text; lines with
+#  taller fallback glyphs (emoji, some scripts) may be cut at a page break.
+#
+#  Usage:
+#
+#      python typeset_pages.py [-o pages] [-j N] [--font-size 11] document.txt
+#      python typeset_pages.py [-o pages] --generate 20000
+#
+#  Paragraphs in the document are separated by blank lines.
+
+import os
+import sys
+import math
+import time
+import argparse
+import itertools
+from collections import deque
+
+import skia
+from skia import textlayout
+
+import text_services
+from font_fallback import get_fallback_cache
+
+SAMPLE_PARAGRAPHS = [
+    "The landing port at Titan had not changed much in five years. The ship settled down on the scarred blast shield, "
+    "beside the same trio of squat square buildings, and quickly disgorged its scanty quota of cargo and a lone passenger "
+    "into the flexible tube that linked the loading hatch with the main building.",
+    "As soon as the tube was disconnected, the ship screamed off through the murky atmosphere, seemingly glad to get away "
+    "from Titan and head back to the more comfortable and settled parts of the Solar System.",
+    "Typography is the art and technique of arranging type to make written language legible, readable, and appealing "
+    "when displayed. Furthermore, العربية نص جميل. द क्विक ब्राउन फ़ॉक्स jumps over the lazy 🐕.",
+]
+
+class PageSetup:
+    def __init__(self, width=595, height=842, margin=56, font_size=11.0, families=("serif",)):
+        self.width = width
+        self.height = height
+        self.margin = margin
+        self.font_size = font_size
+        self.families = list(families)
+
+    @property
+    def column_width(self):
+        return self.width - 2 * self.margin
+
+    @property
+    def column_height(self):
+        return self.height - 2 * self.margin
+
+class Typesetter:
+    """Builds body paragraphs, on the process's FontCollection and ICU."""
+    def __init__(self, setup):
+        self.setup = setup
+        self.font_collection = text_services.font_collection()
+        self.unicodes = text_services.unicodes()
+        self.para_style = textlayout.ParagraphStyle()
+        self.text_style = textlayout.TextStyle()
+        self.text_style.setFontSize(setup.font_size)
+        self.text_style.setFontFamilies(setup.families)
+        self.text_style.setForegroundPaint(skia.Paint(AntiAlias=True, Color=skia.ColorBLACK))
+        self.para_style.setTextStyle(self.text_style)
+        self.fallback = get_fallback_cache()
+
+    def paragraph(self, text):
+        builder = textlayout.ParagraphBuilder.make(self.para_style, self.font_collection, self.unicodes)
+        # Fallback fonts for the paragraph's scripts by name, from the persistent cache
+        style = self.text_style.cloneForPlaceholder()
+        style.setFontFamilies(self.fallback.families_for(text, self.setup.families))
+        builder.pushStyle(style)
+        builder.addText(text)
+        paragraph = builder.Build()
+        paragraph.layout(self.setup.column_width)
+        return paragraph
+
+    def line_height(self):
+        return self.paragraph("Xg").Height
+
+def paginate(paragraphs, typesetter, spacing=None):
+    """Pages, each a list of (text, y, bottom): the paragraph at y (negative for the rest
+    of a split paragraph), showing only down to bottom."""
+    setup = typesetter.setup
+    line = typesetter.line_height()
+    spacing = line / 2 if spacing is None else spacing
+    page = []
+    y = 0.0
+    for text in paragraphs:
+        height = typesetter.paragraph(text).Height
+        offset = 0.0 # how much of this paragraph is already on earlier pages
+        while True:
+            if y + height - offset <= setup.column_height:
+                page.append((text, y - offset, setup.column_height))
+                y += height - offset + spacing
+                break
+            # Split at the last whole line that fits (none, if spacing already reached the bottom)
+            fits = max(0.0, math.floor((setup.column_height - y) / line) * line)
+            if fits <= 0 and not page:
+                fits = setup.column_height # a line taller than the page: cut it
+            if fits > 0:
+                page.append((text, y - offset, y + fits))
+            yield page
+            page = []
+            y = 0.0
+            offset += fits
+    if page:
+        yield page
+
+_typesetter = None
+
+def init_worker(setup):
+    global _typesetter
+    _typesetter = Typesetter(setup)
+
+def render_page(number, page, out_dir):
+    """Worker: paint one page, write it, and return (number, path, seconds)."""
+    start = time.perf_counter()
+    setup = _typesetter.setup
+    surface = skia.Surface.MakeRaster(skia.ImageInfo.MakeN32(setup.width, setup.height, skia.kOpaque_AlphaType))
+    canvas = surface.getCanvas()
+    canvas.clear(skia.ColorWHITE)
+    for text, y, bottom in page:
+        canvas.save()
+        # Glyphs may overhang the column sideways, but not past a page break
+        canvas.clipRect(skia.Rect.MakeLTRB(0, setup.margin + max(0, y), setup.width, setup.margin + bottom))
+        _typesetter.paragraph(text).paint(canvas, setup.margin, setup.margin + y)
+        canvas.restore()
+    path = os.path.join(out_dir, "page-%05d.png" % number)
+    surface.makeImageSnapshot().save(path, skia.kPNG)
+    return number, path, time.perf_counter() - start
+
+def read_paragraphs(path):
+    """Paragraphs of a text file, separated by blank lines, one at a time."""
+    lines = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                lines.append(line.strip())
+            elif lines:
+                yield " ".join(lines)
+                lines = []
+    if lines:
+        yield " ".join(lines)
+
+def generate_paragraphs(count):
+    return itertools.islice(itertools.cycle(SAMPLE_PARAGRAPHS), count)
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Typeset a document into pages with skia.textlayout")
+    parser.add_argument("input", nargs="?", help="UTF-8 text file, paragraphs separated by blank lines")
+    parser.add_argument("--generate", type=int, help="typeset this many sample paragraphs instead")
+    parser.add_argument("-o", "--output", default="pages", help="output directory")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--font-size", type=float, default=11.0)
+    args = parser.parse_args(argv[1:])
+    if (args.input is None) == (args.generate is None):
+        parser.error("give either an input file or --generate N")
+
+    setup = PageSetup(font_size=args.font_size)
+    paragraphs = read_paragraphs(args.input) if args.input else generate_paragraphs(args.generate)
+    os.makedirs(args.output, exist_ok=True)
+
+    start = time.perf_counter()
+    typesetter = Typesetter(setup)
+    in_flight = deque()
+    pages = 0
+    render_time = 0.0
+    with text_services.worker_pool(args.jobs, initializer=init_worker, initargs=(setup,)) as pool:
+        for page in paginate(paragraphs, typesetter):
+            pages += 1
+            in_flight.append(pool.submit(render_page, pages, page, args.output))
+            # Bounded: wait for the oldest page before measuring further ahead
+            while len(in_flight) > 2 * args.jobs:
+                render_time += in_flight.popleft().result()[2]
+            if pages % 100 == 0:
+                print("%d pages typeset" % pages)
+        while in_flight:
+            render_time += in_flight.popleft().result()[2]
+    elapsed = time.perf_counter() - start
+    print("%d pages in %.2f s (%.1f pages/s), %.1f ms per page in the workers; output in %s" %
+          (pages, elapsed, pages / elapsed if elapsed > 0 else 0, 1000 * render_time / max(1, pages), args.output))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))